@@ -0,0 +1,438 @@
+"""GhostFracture concurrent-session load test.
+
+Simulates engineers using the dashboard at the same time and reports
+rerun latency, server CPU and server memory so servers can be sized and
+changes validated:
+
+    python benchmarks/loadtest.py                               # 1, 4 and 16 sessions, 60 s each
+    python benchmarks/loadtest.py --sessions 8 --duration 30 --think 0.5
+    python benchmarks/loadtest.py --compare benchmarks/results/loadtest-baseline.json
+
+Each concurrency level starts a fresh ``streamlit run app.py`` server and
+connects N headless clients over the Streamlit websocket protocol, as
+browsers would. Widgets inside fragments rerun only their fragment, as in
+the browser. A client loads the app and then repeats weighted interactions
+until ``--duration`` has elapsed, waiting an exponentially distributed
+think time between them:
+
+* well switches
+* slider drags (several reruns at neighbouring values)
+* log and visualization tab changes
+* the simulation/analysis button
+
+Latency is measured per rerun, from sending the request to the server's
+script-finished message. Server CPU and resident memory are read from the
+dashboard's own metrics endpoint (``ghostfracture.metrics``) before and
+after the sessions. Per level the report gives:
+
+* p50/p95/p99/max latency, overall and per interaction
+* reruns per second
+* CPU cores busy, CPU seconds per session and per rerun
+* memory per connected session over a warmed-up server
+
+Across levels, memory is fitted as ``base + per-session x N``. Timers of
+``run_every`` fragments are not simulated.
+
+With ``--compare``, the exit status is 1 when any level's p95 is slower
+than the baseline by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+from run import RESULTS_DIR, ROOT, environment
+
+APP = os.path.join(ROOT, "app.py")
+DEFAULT_SESSIONS = (1, 4, 16)
+SLIDERS = ["Stage Number", "Pump Rate (BPM)", "Proppant Concentration (lb/ft²)", "Cluster Spacing (ft)",
+           "Fluid Viscosity (cP)"]
+TABS = {
+    'log_tabs': [" Basic Logs", " Petrophysics", " Geomechanics", " Crossplots"],
+    'viz_tabs': ["📐 Fracture Geometry", "📈 Pressure Diagnostics", "🌍 Microseismic Monitoring",
+                 "🔬 3D Fracture Network"],
+}
+INTERACTIONS = {}
+
+
+def interaction(name, weight):
+    """Register ``async func(client, rng)``; every ``client.rerun`` inside is timed under ``name``"""
+    def register(func):
+        INTERACTIONS[name] = (func, weight)
+        return func
+    return register
+
+
+# ==================== CLIENT ====================
+class Client:
+    """Headless browser session speaking the Streamlit websocket protocol"""
+
+    def __init__(self, url, timeout):
+        self.url = url.replace("http", "ws", 1).rstrip('/') + "/_stcore/stream"
+        self.timeout = timeout
+        self.widgets = {}  # label or tabs key -> (element type, proto, fragment id)
+        self.states = {}  # widget id -> WidgetState the user has set
+        self.latencies = []  # (interaction, seconds)
+        self.errors = []
+        self._ws = None
+
+    async def connect(self):
+        import websockets
+        self._ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self._ws.close()
+
+    def widget(self, label):
+        try:
+            return self.widgets[label]
+        except KeyError:
+            raise LookupError(f"no widget {label!r} on the page") from None
+
+    def value(self, label):
+        """Current value of a slider (float) or selectbox/tabs (str)"""
+        kind, proto, _ = self.widget(label)
+        state = self.states.get(proto.id)
+        if kind == 'slider':
+            return state.double_array_value.data[0] if state else proto.default[0]
+        if kind == 'selectbox':
+            return state.string_value if state else proto.options[proto.default]
+        return state.string_value if state else TABS[label][proto.default_tab_index]
+
+    async def set(self, label, name, value=None):
+        """Set a widget like a user would and rerun (only its fragment, if it is in one)"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        kind, proto, fragment_id = self.widget(label)
+        state = WidgetState(id=proto.id)
+        if kind == 'button':
+            state.trigger_value = True
+            trigger = state
+        else:
+            if kind == 'slider':
+                state.double_array_value.data[:] = [value]
+            else:
+                state.string_value = value
+            self.states[proto.id] = state
+            trigger = None
+        await self.rerun(name, fragment_id, trigger)
+
+    async def rerun(self, name, fragment_id="", trigger=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(list(self.states.values()) + ([trigger] if trigger else []))
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        start = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._receive_until_finished(), self.timeout)
+        self.latencies.append((name, time.perf_counter() - start))
+
+    async def _receive_until_finished(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        while True:
+            msg = ForwardMsg.FromString(await self._ws.recv())
+            kind = msg.WhichOneof('type')
+            if kind == 'delta':
+                self._collect(msg.delta)
+            elif kind == 'script_finished' and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def _collect(self, delta):
+        kind = delta.WhichOneof('type')
+        if kind == 'new_element':
+            element_type = delta.new_element.WhichOneof('type')
+            if element_type in ('slider', 'selectbox', 'button'):
+                proto = getattr(delta.new_element, element_type)
+                self.widgets[proto.label.strip("* ")] = (element_type, proto, delta.fragment_id)
+            elif element_type == 'exception':
+                self.errors.append(delta.new_element.exception.message.splitlines()[0])
+        elif kind == 'add_block' and delta.add_block.WhichOneof('type') == 'tab_container':
+            proto = delta.add_block.tab_container
+            key = proto.id.rpartition('-')[2]
+            if key in TABS:
+                self.widgets[key] = ('tabs', proto, delta.fragment_id)
+
+
+# ==================== INTERACTIONS ====================
+@interaction("well_switch", 0.2)
+async def switch_well(client, rng):
+    options = list(client.widget("Well ID")[1].options)
+    current = client.value("Well ID")
+    await client.set("Well ID", "well_switch", rng.choice([option for option in options if option != current]))
+
+
+@interaction("slider_drag", 0.45)
+async def drag_slider(client, rng):
+    label = rng.choice(SLIDERS)
+    direction = rng.choice([-1, 1])
+    for _ in range(rng.randint(2, 5)):
+        proto = client.widget(label)[1]
+        value = min(max(client.value(label) + direction * (proto.step or 1), proto.min), proto.max)
+        await client.set(label, "slider_drag", value)
+
+
+@interaction("tab_change", 0.3)
+async def change_tab(client, rng):
+    key = rng.choice(list(TABS))
+    current = client.value(key)
+    await client.set(key, "tab_change", rng.choice([label for label in TABS[key] if label != current]))
+
+
+@interaction("run_analysis", 0.05)
+async def run_analysis(client, rng):
+    await client.set("Generate Simulation & Analysis", "run_analysis")
+
+
+async def session(url, deadline, think, seed, timeout):
+    """One simulated engineer: load the app, then interact until ``deadline``"""
+    client = Client(url, timeout)
+    rng = random.Random(seed)
+    names = list(INTERACTIONS)
+    weights = [INTERACTIONS[name][1] for name in names]
+    try:
+        await client.connect()
+        await client.rerun("load")
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(rng.expovariate(1 / think) if think else 0,
+                                    max(deadline - time.monotonic(), 0)))
+            if time.monotonic() >= deadline:
+                break
+            await INTERACTIONS[rng.choices(names, weights)[0]][0](client, rng)
+    except Exception as exc:
+        client.errors.append(f"{type(exc).__name__}: {exc}")
+    return client
+
+
+# ==================== SERVER ====================
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def scrape(metrics_url):
+    """Unlabelled samples of a Prometheus text endpoint"""
+    with urllib.request.urlopen(metrics_url, timeout=5) as response:
+        lines = response.read().decode().splitlines()
+    samples = {}
+    for line in lines:
+        if line and not line.startswith('#') and '{' not in line:
+            name, _, value = line.partition(' ')
+            samples[name] = float(value)
+    return samples
+
+
+def start_server(port, metrics_port):
+    """``streamlit run app.py`` on ``port``, waiting until it answers its health check"""
+    env = dict(os.environ, GHOSTFRACTURE_METRICS_PORT=str(metrics_port))
+    command = [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+               "--server.port", str(port), "--server.fileWatcherType", "none",
+               "--browser.gatherUsageStats", "false"]
+    log = tempfile.TemporaryFile()  # a pipe nobody reads would block the server once full
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    server.log = log
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"server exited: {log.read().decode(errors='replace').strip()[-500:]}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.25)
+    server.kill()
+    raise RuntimeError("server did not become healthy within 60 s")
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+
+    def rank(q):
+        position = q * (len(values) - 1)
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    return {'count': len(values), 'p50_s': rank(0.5), 'p95_s': rank(0.95), 'p99_s': rank(0.99),
+            'max_s': values[-1]}
+
+
+async def run_sessions(url, metrics_url, n_sessions, duration, think, seed, timeout):
+    """Warm the server up with one load, then run ``n_sessions`` concurrent sessions"""
+    warmup = await session(url, time.monotonic(), 0, seed, timeout)
+    await warmup.close()
+    if warmup.errors:
+        raise RuntimeError(f"warm-up failed: {warmup.errors[0]}")
+
+    before = scrape(metrics_url)
+    peak = [before['process_resident_memory_bytes']]
+
+    async def sample_memory():
+        while True:
+            await asyncio.sleep(1.0)
+            sample = await asyncio.to_thread(scrape, metrics_url)
+            peak.append(sample['process_resident_memory_bytes'])
+
+    sampler = asyncio.create_task(sample_memory())
+    start = time.perf_counter()
+    deadline = time.monotonic() + duration
+    clients = await asyncio.gather(*(session(url, deadline, think, seed + 1 + i, timeout)
+                                     for i in range(n_sessions)))
+    wall = time.perf_counter() - start
+    after = scrape(metrics_url)  # sessions still connected
+    sampler.cancel()
+    for client in clients:
+        if client._ws is not None:
+            await client.close()
+    return clients, wall, before, after, max(peak + [after['process_resident_memory_bytes']])
+
+
+def measure(args, n_sessions):
+    """Run one concurrency level against a fresh server"""
+    port, metrics_port = free_port(), free_port()
+    server = start_server(port, metrics_port)
+    try:
+        clients, wall, before, after, peak = asyncio.run(run_sessions(
+            f"http://127.0.0.1:{port}", f"http://127.0.0.1:{metrics_port}/metrics",
+            n_sessions, args.duration, args.think, args.seed, args.timeout))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        server.log.close()
+
+    latencies = [entry for client in clients for entry in client.latencies]
+    by_interaction = {}
+    for name, seconds in latencies:
+        by_interaction.setdefault(name, []).append(seconds)
+    cpu = after['process_cpu_seconds_total'] - before['process_cpu_seconds_total']
+    mb = 2 ** 20
+    return {
+        'sessions': n_sessions, 'duration_s': round(wall, 2),
+        'reruns': len(latencies), 'reruns_per_s': round(len(latencies) / wall, 2),
+        'latency': percentiles([seconds for _, seconds in latencies]),
+        'by_interaction': {name: percentiles(values) for name, values in sorted(by_interaction.items())},
+        'cpu_s': round(cpu, 2), 'cpu_cores': round(cpu / wall, 2),
+        'cpu_s_per_session': round(cpu / n_sessions, 2),
+        'cpu_ms_per_rerun': round(cpu / len(latencies) * 1000, 1) if latencies else None,
+        'rss_warm_mb': round(before['process_resident_memory_bytes'] / mb, 1),
+        'rss_end_mb': round(after['process_resident_memory_bytes'] / mb, 1),
+        'rss_peak_mb': round(peak / mb, 1),
+        'mb_per_session': round((after['process_resident_memory_bytes']
+                                 - before['process_resident_memory_bytes']) / mb / n_sessions, 2),
+        'errors': sorted({error for client in clients for error in client.errors})[:20],
+    }
+
+
+# ==================== REPORT ====================
+def memory_fit(rows):
+    """Least-squares fit of end RSS (MB, sessions connected) = base + per_session * sessions"""
+    points = [(row['sessions'], row['rss_end_mb']) for row in rows if 'rss_end_mb' in row]
+    if len({n for n, _ in points}) < 2:
+        return None
+    mean_n = sum(n for n, _ in points) / len(points)
+    mean_rss = sum(rss for _, rss in points) / len(points)
+    slope = (sum((n - mean_n) * (rss - mean_rss) for n, rss in points)
+             / sum((n - mean_n) ** 2 for n, _ in points))
+    return {'base_mb': round(mean_rss - slope * mean_n, 1), 'per_session_mb': round(slope, 2)}
+
+
+def print_level(row):
+    if 'error' in row:
+        print(f"{row['sessions']:>4} sessions  ERROR: {row['error']}", flush=True)
+        return
+    lat = row['latency']
+    nan = float('nan')
+    print(f"{row['sessions']:>4} sessions  {row['reruns']:>6,} reruns  {row['reruns_per_s']:7.2f}/s  "
+          f"p50 {lat.get('p50_s', nan) * 1000:7.0f} ms  p95 {lat.get('p95_s', nan) * 1000:7.0f} ms  "
+          f"p99 {lat.get('p99_s', nan) * 1000:7.0f} ms  CPU {row['cpu_cores']:.2f} cores "
+          f"({row['cpu_s_per_session']:.1f} s/session, {row['cpu_ms_per_rerun'] or nan:.0f} ms/rerun)  "
+          f"RSS {row['rss_warm_mb']:,.0f} -> {row['rss_end_mb']:,.0f} MB "
+          f"({row['mb_per_session']:+.1f} MB/session)", flush=True)
+    for name, stats in row['by_interaction'].items():
+        print(f"      {name:<14} {stats['count']:>6,}  p50 {stats['p50_s'] * 1000:7.0f} ms  "
+              f"p95 {stats['p95_s'] * 1000:7.0f} ms  p99 {stats['p99_s'] * 1000:7.0f} ms")
+    for error in row['errors']:
+        print(f"      error: {error}")
+
+
+def compare(results, baseline, tolerance):
+    """Print per-level p95 ratios against a baseline; return the regressed levels"""
+    previous = {row['sessions']: row for row in baseline['results'] if row.get('latency', {}).get('count')}
+    regressions = []
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline.get('created', '?')}):")
+    for row in results:
+        base = previous.get(row['sessions'])
+        if base is None or not row.get('latency', {}).get('count'):
+            continue
+        ratio = row['latency']['p95_s'] / base['latency']['p95_s']
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"  {row['sessions']:>4} sessions  p95 {ratio:6.2f}x {flag}")
+        if flag:
+            regressions.append(row)
+    return regressions
+
+
+def parse_sessions(text):
+    return [int(part) for part in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=parse_sessions, default=list(DEFAULT_SESSIONS),
+                        help="comma-separated concurrency levels (default: 1,4,16)")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds per level (default: 60)")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="mean think time between interactions in seconds (default: 1.0; 0 = none)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the first session")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a rerun counts as hung")
+    parser.add_argument("-o", "--output", help="result file (default: benchmarks/results/loadtest-<time>-<commit>.json)")
+    parser.add_argument("--compare", help="baseline result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 slowdown vs the baseline (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_sessions in args.sessions:
+        try:
+            row = measure(args, n_sessions)
+        except RuntimeError as exc:
+            row = {'sessions': n_sessions, 'error': str(exc)}
+        results.append(row)
+        print_level(row)
+    fit = memory_fit(results)
+    if fit:
+        print(f"\nMemory: {fit['base_mb']:,.0f} MB + {fit['per_session_mb']:,.1f} MB per session (end RSS fit)")
+
+    report = dict(environment(), duration_s=args.duration, think_s=args.think, memory_fit=fit, results=results)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"loadtest-{datetime.now():%Y%m%d-%H%M%S}-{report['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""GhostFracture benchmark suite.
+
+Times every hot path at several data scales and writes the results as
+JSON so runs can be compared before deploying:
+
+    python benchmarks/run.py                              # all, at 1e3, 1e5, 1e7
+    python benchmarks/run.py --scales 1e3,1e5 -k figures  # subset
+    python benchmarks/run.py --compare benchmarks/results/baseline.json
+
+Each (benchmark, scale) runs in its own interpreter, so peak memory is
+measured per case and an out-of-memory kill at 1e7 is recorded instead of
+stopping the suite. A case is timed repeatedly until ``--min-time`` has
+elapsed (at most ``--max-repeats`` runs), after one untimed warm-up run that
+fills lazy imports and caches. ``n`` is the number of samples: log depth points,
+treatment time steps, stages, b-value windows, natural fractures, proppant
+particles or microseismic events.
+
+With ``--compare``, the median of every case is checked against the baseline
+file. The exit status is 1 when any case is slower by more than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SCALES = (1_000, 100_000, 10_000_000)
+BENCHMARKS = {}
+
+
+def benchmark(name, max_n=None):
+    """Register ``setup(n)``, which prepares inputs of size n and returns the callable to time"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, max_n)
+        return setup
+    return register
+
+
+# ==================== SHARED INPUTS ====================
+def _raw_logs(n):
+    import numpy as np
+    from ghostfracture.welllogs import process_well_log_data
+    return process_well_log_data("Berkine-12", n_points=n, rng=np.random.default_rng(0))
+
+
+def _processed_logs(n):
+    from ghostfracture.welllogs import calculate_geomechanical_properties, calculate_petrophysical_properties
+    return calculate_geomechanical_properties(calculate_petrophysical_properties(_raw_logs(n)))
+
+
+def _treatment(n):
+    import numpy as np
+    from ghostfracture.simulation import DEFAULT_STAGE_PARAMETERS, simulate_treatment
+    params = {k: v for k, v in DEFAULT_STAGE_PARAMETERS.items() if k not in ('stage_num', 'proppant_type')}
+    return simulate_treatment(**params, n_steps=n, rng=np.random.default_rng(0))
+
+
+def _events(n):
+    from ghostfracture.microseismic import generate_event_catalog
+    sim = _treatment(1_000)
+    return generate_event_catalog(sim['time'], sim['microseismic_rate'], sim['frac_half_length'],
+                                  sim['frac_height'], sim['stress_shadow_index'], n_events=n, seed=0)
+
+
+def _proppant_map(sim, n):
+    from ghostfracture.proppant import proppant_distribution, simulate_proppant_transport
+    particles = simulate_proppant_transport(
+        sim['frac_half_length'], sim['frac_height'], sim['frac_width'], 80, sim['time'][-1],
+        "100-mesh Sand", "Slickwater", 5.0, sim['proppant_loading'], n_particles=n, seed=0
+    )
+    return proppant_distribution(particles, sim['frac_half_length'], sim['frac_height'],
+                                 proppant_mass=2.0 * sim['frac_half_length'] * sim['frac_height'])
+
+
+def _stage_scores(n):
+    import numpy as np
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 100, n), rng.uniform(0, 100, n), rng.uniform(0, 100, n), rng.uniform(30, 95, n)
+
+
+# ==================== WELL LOGS ====================
+@benchmark("welllogs.process_well_log_data")
+def bench_process_well_log_data(n):
+    import numpy as np
+    from ghostfracture.welllogs import process_well_log_data
+    return lambda: process_well_log_data("Berkine-12", n_points=n, rng=np.random.default_rng(0))
+
+
+@benchmark("welllogs.generate_well_log+properties")
+def bench_well_log_pipeline(n):
+    import numpy as np
+    from ghostfracture.welllogs import (
+        calculate_geomechanical_properties, calculate_petrophysical_properties, generate_well_log
+    )
+
+    def run():
+        log = generate_well_log("Berkine-12", n_points=n, rng=np.random.default_rng(0))
+        calculate_petrophysical_properties(log)
+        return calculate_geomechanical_properties(log)
+    return run
+
+
+@benchmark("welllogs.calculate_petrophysical_properties")
+def bench_petrophysics(n):
+    from ghostfracture.welllogs import calculate_petrophysical_properties
+    df = _raw_logs(n)
+    return lambda: calculate_petrophysical_properties(df)
+
+
+@benchmark("welllogs.calculate_geomechanical_properties")
+def bench_geomechanics(n):
+    from ghostfracture.welllogs import calculate_geomechanical_properties
+    df = _raw_logs(n)
+    return lambda: calculate_geomechanical_properties(df)
+
+
+@benchmark("splicing.splice")
+def bench_splice(n):
+    import numpy as np
+    from ghostfracture.splicing import logging_runs, splice
+    from ghostfracture.wells import WELL_PROFILES
+    top, base = WELL_PROFILES["Berkine-12"]['depth']
+    fine = (base - top) * 0.45 / n  # three runs (5x, 1x, 5x this step) of about n samples in total
+    runs = logging_runs("Berkine-12", steps=(5 * fine, fine, 5 * fine), rng=np.random.default_rng(0))
+    return lambda: splice(runs, step=1.5 * fine)
+
+
+@benchmark("depthmatch.estimate_shift")
+def bench_depth_shift(n):
+    import numpy as np
+    from ghostfracture.depthmatch import estimate_shift
+    rng = np.random.default_rng(0)
+    depth = 1000 + 0.1 * np.arange(max(n, 2000))
+    reference = np.convolve(rng.normal(size=len(depth)), np.ones(9) / 9, 'same')
+    target = np.interp(depth - 1.5 - np.sin(depth / 300), depth, reference)
+    return lambda: estimate_shift(depth, reference, target, window=100.0, max_shift=5.0)
+
+
+@benchmark("correlation.correlate_wells", max_n=100_000)
+def bench_correlate_wells(n):
+    import numpy as np
+    from ghostfracture.correlation import correlate_wells
+    from ghostfracture.welllogs import generate_well_log
+    rng = np.random.default_rng(0)
+    type_log = generate_well_log("Berkine-12", rng=rng)
+    n_wells = max(n // 1000, 1)  # n = wells x 1000 resampled samples
+    targets = {f"W{i}": generate_well_log("Berkine-12", rng=rng) for i in range(n_wells)}
+    return lambda: correlate_wells(type_log, targets)
+
+
+# ==================== SIMULATION & RISK ====================
+@benchmark("simulation.simulate_treatment")
+def bench_simulate_treatment(n):
+    return lambda: _treatment(n)
+
+
+@benchmark("risk.risk_timeline+risk_triggers")
+def bench_risk_engine(n):
+    from ghostfracture.risk import risk_timeline, risk_triggers
+    sim = _treatment(n)
+
+    def run():
+        scores = risk_timeline(sim['net_pressure'], sim['microseismic_rate'], sim['pressure_slope'],
+                               4742, 2433, sim['proppant_loading'])
+        return risk_triggers(sim['time'], scores)
+    return run
+
+
+@benchmark("advisor.risk_state+stages_with_actions")
+def bench_advisor(n):
+    from ghostfracture.advisor import risk_state, stages_with_actions
+    scores = _stage_scores(n)
+    return lambda: stages_with_actions(risk_state(*scores), priority="🚨 CRITICAL")
+
+
+# ==================== FRACTURE NETWORK & MICROSEISMIC ====================
+@benchmark("dfn.generate_dfn+connectivity_analysis", max_n=100_000)
+def bench_dfn_connectivity(n):
+    from ghostfracture.dfn import connectivity_analysis, generate_dfn
+    sim = _treatment(1_000)
+    xf, h = sim['frac_half_length'], sim['frac_height']
+
+    def run():
+        dfn = generate_dfn(n, xf, h, seed=0, reference_count=20)
+        return connectivity_analysis(dfn, xf, h)
+    return run
+
+
+@benchmark("proppant.transport+distribution")
+def bench_proppant(n):
+    sim = _treatment(1_000)
+    return lambda: _proppant_map(sim, n)
+
+
+@benchmark("srv.VoxelSRV.add_catalog+volume")
+def bench_srv(n):
+    from ghostfracture.simulation import SRV_VOXEL_SIZE
+    from ghostfracture.srv import VoxelSRV
+    catalog = _events(n)
+
+    def run():
+        srv = VoxelSRV(voxel_size=SRV_VOXEL_SIZE)
+        srv.add_catalog(catalog)
+        return srv.volume()
+    return run
+
+
+@benchmark("seismicity.GutenbergRichterTracker", max_n=1_000_000)
+def bench_gr_tracker(n):
+    from ghostfracture.seismicity import GutenbergRichterTracker
+    catalog = _events(n)
+
+    def run():
+        tracker = GutenbergRichterTracker(window=200)
+        tracker.add_catalog(catalog)
+        return [(tracker.catalog_estimate(stage), tracker.history(stage)) for stage in tracker.stages()]
+    return run
+
+
+# ==================== TABLES ====================
+@benchmark("tables.risk_summary_frame+render_risk_table", max_n=100_000)
+def bench_risk_tables(n):
+    from ghostfracture.tables import render_risk_table, risk_summary_frame
+    scores = _stage_scores(n)
+    return lambda: render_risk_table(risk_summary_frame(*scores))
+
+
+# ==================== FIGURES ====================
+@benchmark("figures.fracture_geometry_figure")
+def bench_fracture_geometry_figure(n):
+    from ghostfracture.figures import fracture_geometry_figure
+    sim = _treatment(1_000)
+    return lambda: fracture_geometry_figure(sim['frac_half_length'], sim['frac_width'], 2.0, n_points=n)
+
+
+@benchmark("figures.fracture_network_figure", max_n=100_000)
+def bench_fracture_network_figure(n):
+    from ghostfracture.dfn import connectivity_analysis, generate_dfn
+    from ghostfracture.figures import fracture_network_figure
+    sim = _treatment(1_000)
+    xf, h = sim['frac_half_length'], sim['frac_height']
+    dfn = generate_dfn(n, xf, h, seed=0, reference_count=20)  # n natural fractures
+    connected = connectivity_analysis(dfn, xf, h)['connected']
+    proppant_map = _proppant_map(sim, 100_000)
+    return lambda: fracture_network_figure(xf, h, sim['frac_width'], dfn=dfn, connected=connected,
+                                           proppant_map=proppant_map)
+
+
+@benchmark("figures.triple_combo_figure")
+def bench_triple_combo(n):
+    from ghostfracture.figures import triple_combo_figure
+    df = _processed_logs(n)
+    return lambda: triple_combo_figure(df)
+
+
+@benchmark("figures.petrophysics_figures")
+def bench_petrophysics_figures(n):
+    from ghostfracture.figures import petrophysics_figures
+    df = _processed_logs(n)
+    return lambda: petrophysics_figures(df)
+
+
+@benchmark("figures.geomechanics_figures")
+def bench_geomechanics_figures(n):
+    from ghostfracture.figures import geomechanics_figures
+    df = _processed_logs(n)
+    return lambda: geomechanics_figures(df)
+
+
+@benchmark("figures.crossplot_figure")
+def bench_crossplot(n):
+    from ghostfracture.figures import crossplot_figure
+    df = _processed_logs(n)
+    return lambda: crossplot_figure(df, 'GR', 'NPHI', 'Depth')
+
+
+@benchmark("figures.pressure_diagnostics_figure")
+def bench_pressure_figure(n):
+    from ghostfracture.figures import pressure_diagnostics_figure
+    sim = _treatment(n)
+    return lambda: pressure_diagnostics_figure(sim['time'], sim['net_pressure'], sim['pressure_slope'])
+
+
+@benchmark("figures.microseismic_rate_figure")
+def bench_microseismic_figure(n):
+    from ghostfracture.figures import microseismic_rate_figure
+    sim = _treatment(n)
+    return lambda: microseismic_rate_figure(sim['time'], sim['microseismic_rate'])
+
+
+@benchmark("figures.b_value_figure")
+def bench_b_value_figure(n):
+    import numpy as np
+    import pandas as pd
+    from ghostfracture.figures import b_value_figure
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({'Time (min)': np.linspace(0, 60, n), 'b-value': rng.normal(1.2, 0.2, n),
+                            'Mc': rng.normal(-1.5, 0.1, n)})
+    return lambda: b_value_figure(history)
+
+
+@benchmark("figures.risk_timeline_figure")
+def bench_risk_timeline_figure(n):
+    from ghostfracture.figures import risk_timeline_figure
+    from ghostfracture.risk import risk_timeline, risk_triggers
+    sim = _treatment(n)
+    scores = risk_timeline(sim['net_pressure'], sim['microseismic_rate'], sim['pressure_slope'],
+                           4742, 2433, sim['proppant_loading'])
+    triggers = risk_triggers(sim['time'], scores)
+    return lambda: risk_timeline_figure(sim['time'], scores, triggers)
+
+
+# ==================== RUNNER ====================
+def measure(name, n, min_time, max_repeats):
+    """Timings of one case in this process"""
+    import resource
+    setup, _ = BENCHMARKS[name]
+    run = setup(n)
+    run()  # warm-up, not timed
+    times = []
+    while not times or (sum(times) < min_time and len(times) < max_repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'min_s': times[0], 'median_s': times[len(times) // 2], 'mean_s': sum(times) / len(times),
+        'repeats': len(times), 'peak_rss_mb': round(peak_kb / 1024, 1)
+    }
+
+
+def run_case(name, n, min_time, max_repeats):
+    """Run one case in a fresh interpreter and return its result row"""
+    row = {'name': name, 'n': n}
+    _, max_n = BENCHMARKS[name]
+    if max_n is not None and n > max_n:
+        return dict(row, skipped=f"n > {max_n:,}")
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name, str(n),
+               "--min-time", str(min_time), "--max-repeats", str(max_repeats)]
+    proc = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode != 0:
+        reason = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""
+        if proc.returncode < 0:
+            reason = f"killed by signal {-proc.returncode} (out of memory?)"
+        return dict(row, error=reason or f"exit status {proc.returncode}")
+    return dict(row, **json.loads(proc.stdout.strip().splitlines()[-1]))
+
+
+def environment():
+    import numpy
+    import pandas
+    import plotly
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=ROOT).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+        'python': platform.python_version(), 'numpy': numpy.__version__, 'pandas': pandas.__version__,
+        'plotly': plotly.__version__, 'machine': platform.machine(), 'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print per-case speed ratios against a baseline; return the regressed cases"""
+    previous = {(row['name'], row['n']): row for row in baseline['results'] if 'median_s' in row}
+    regressions = []
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline.get('created', '?')}):")
+    for row in results:
+        base = previous.get((row['name'], row['n']))
+        if base is None or 'median_s' not in row:
+            continue
+        ratio = row['median_s'] / base['median_s']
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"  {row['name']:<45} n={row['n']:<10,} {ratio:6.2f}x {flag}")
+        if flag:
+            regressions.append(row)
+    return regressions
+
+
+def parse_scales(text):
+    return [int(float(part)) for part in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=parse_scales, default=list(DEFAULT_SCALES),
+                        help="comma-separated sample counts (default: 1e3,1e5,1e7)")
+    parser.add_argument("-k", "--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="baseline result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs the baseline median (default: 0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds of timed runs per case")
+    parser.add_argument("--max-repeats", type=int, default=50)
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--worker", nargs=2, metavar=("NAME", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.worker:
+        name, n = args.worker
+        print(json.dumps(measure(name, int(n), args.min_time, args.max_repeats)))
+        return 0
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = []
+    for name in names:
+        for n in args.scales:
+            row = run_case(name, n, args.min_time, args.max_repeats)
+            results.append(row)
+            status = (f"{row['median_s'] * 1000:10.2f} ms  ({row['repeats']} runs, {row['peak_rss_mb']:,.0f} MB peak)"
+                      if 'median_s' in row else row.get('skipped') or f"ERROR: {row['error']}")
+            print(f"{name:<45} n={n:<10,} {status}", flush=True)
+
+    report = dict(environment(), scales=args.scales, results=results)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""GhostFracture computation engines used by the Streamlit dashboard (app.py)."""
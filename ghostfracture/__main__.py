@@ -0,0 +1,5 @@
+import sys
+
+from ghostfracture.cli import main
+
+sys.exit(main())
@@ -0,0 +1,272 @@
+"""Background risk alerting.
+
+``AlertMonitor`` runs an asyncio loop on a daemon thread, re-evaluates the
+FracGuard rules for every watched stream at a fixed interval and pushes
+confirmed alarms to pluggable sinks. An alarm is confirmed once the rule's
+trigger holds for the last ``debounce`` samples. Streams may share a
+``group`` (e.g. every session watching one well and stage); each (group,
+risk) pair notifies once until the alarm clears in all of the group's
+streams or ``cooldown`` seconds pass.
+Streams that have not been updated for ``stream_ttl`` seconds (closed
+sessions) are dropped with their alarm state. Detection-to-notification
+latency is recorded for every alert that reached at least one sink, and
+each evaluation records the ingest lag of every stream (how old its latest
+data window was when the rules ran).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ghostfracture.rules import load_rules
+
+logger = logging.getLogger(__name__)
+_monotonic = time.monotonic  # update() shadows the module name with its argument
+
+
+# ==================== SINKS ====================
+class MemorySink:
+    """Keeps delivered alerts in memory (dashboard history, tests)"""
+
+    def __init__(self, maxlen=500):
+        self.alerts = deque(maxlen=maxlen)
+
+    async def send(self, alert):
+        self.alerts.append(alert)
+
+
+class CallbackSink:
+    """Calls ``func(alert)`` for every alert; sync callables run in a thread"""
+
+    def __init__(self, func):
+        self.func = func
+
+    async def send(self, alert):
+        if asyncio.iscoroutinefunction(self.func):
+            await self.func(alert)
+        else:
+            await asyncio.to_thread(self.func, alert)
+
+
+class WebhookSink:
+    """POSTs every alert as JSON to ``url``"""
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, alert):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alert).encode(),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    async def send(self, alert):
+        await asyncio.to_thread(self._post, alert)
+
+
+class LocalWebhookReceiver:
+    """Minimal local HTTP endpoint standing in for a real webhook target"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.received = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                receiver.received.append(json.loads(body or b'{}'))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/alerts"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ==================== MONITOR ====================
+class AlertMonitor:
+    """Continuously evaluates risk rules on watched streams and notifies sinks"""
+
+    def __init__(self, sinks, rules_path=None, interval=1.0, debounce=3, cooldown=300.0, stream_ttl=600.0):
+        self.sinks = list(sinks)
+        self.rules_path = rules_path
+        self.interval = interval
+        self.debounce = debounce
+        self.cooldown = cooldown
+        self.stream_ttl = stream_ttl
+        self.latencies = deque(maxlen=1000)
+        self.delivered = 0
+        self.failures = 0
+        self.ingest_lag = {}
+        self._streams = {}
+        self._armed = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._task = None
+        self._ready = threading.Event()
+
+    # ---- inputs (thread-safe, called from Streamlit sessions) ----
+    def update(self, key, time, series, parameters, group=None):
+        """Replace the latest data window of a stream, e.g. (session, well, stage).
+
+        A stream is one treatment series: 1-D arrays over ``time`` and
+        scalar parameters, as passed to ``RuleSet.evaluate``. Alerts are
+        deduplicated per ``group`` (default: the stream itself), e.g.
+        (well, stage) across sessions.
+        """
+        with self._lock:
+            self._streams[key] = {'time': np.asarray(time, dtype=float), 'series': series,
+                                  'parameters': parameters, 'updated': _monotonic(),
+                                  'group': key if group is None else group}
+
+    def raise_alert(self, alert):
+        """Queue a manual alert (e.g. the dashboard's Emergency Alert button)"""
+        alert = dict(alert, detected_at=datetime.now().isoformat(timespec='seconds'))
+        self._enqueue(alert, time.monotonic())
+
+    def _enqueue(self, alert, detected):
+        if self._loop is None:
+            raise RuntimeError("AlertMonitor is not running; call start() first")
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (alert, detected))
+
+    # ---- evaluation ----
+    def evaluate(self, now=None):
+        """Evaluate every stream once and return the newly confirmed alerts"""
+        now = time.monotonic() if now is None else now
+        rules = load_rules(self.rules_path) if self.rules_path else load_rules()
+        labels = {risk['name']: risk['label'] for risk in rules.risks}
+        with self._lock:
+            expired = [key for key, stream in self._streams.items() if now - stream['updated'] > self.stream_ttl]
+            for key in expired:
+                del self._streams[key]
+            streams = dict(self._streams)
+        groups = {stream['group'] for stream in streams.values()}
+        if expired:
+            self._armed = {armed: state for armed, state in self._armed.items() if armed[0] in groups}
+        self.ingest_lag = {key: now - stream['updated'] for key, stream in streams.items()}
+
+        # Confirmed alarms per (group, risk); the first confirming stream describes the alert
+        confirmed = {}
+        for key, stream in streams.items():
+            scores = rules.evaluate(stream['series'], stream['parameters'])
+            for name, alarm in rules.triggered(scores).items():
+                pair = (stream['group'], name)
+                confirmed.setdefault(pair, None)
+                if confirmed[pair] is None and len(alarm) >= self.debounce and bool(alarm[-self.debounce:].all()):
+                    cleared = np.nonzero(~alarm)[0]
+                    confirmed[pair] = (float(scores[name][-1]), stream['time'][cleared[-1] + 1 if len(cleared) else 0])
+
+        alerts = []
+        for (group, name), hit in confirmed.items():
+            state = self._armed.setdefault((group, name), {'fired': False, 'at': -np.inf})
+            if hit is None:
+                state['fired'] = False
+                continue
+            if state['fired'] and now - state['at'] < self.cooldown:
+                continue
+            state.update(fired=True, at=now)
+            score, onset = hit
+            alerts.append({
+                'stream': list(group) if isinstance(group, tuple) else group,
+                'risk': name,
+                'label': labels[name],
+                'score': score,
+                'onset_time': float(onset),
+                'detected_at': datetime.now().isoformat(timespec='seconds')
+            })
+        return alerts, now
+
+    async def _deliver(self, alert, detected):
+        sent = False
+        for sink in self.sinks:
+            try:
+                await sink.send(alert)
+                sent = True
+            except Exception:
+                self.failures += 1
+                logger.exception("Alert sink %r failed", sink)
+        if sent:
+            self.delivered += 1
+            self.latencies.append(time.monotonic() - detected)
+
+    async def _dispatcher(self):
+        while True:
+            alert, detected = await self._queue.get()
+            await self._deliver(alert, detected)
+
+    async def run(self):
+        """Evaluation loop; runs until cancelled"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.current_task()
+        self._ready.set()
+        dispatcher = asyncio.create_task(self._dispatcher())
+        try:
+            while True:
+                try:
+                    alerts, detected = self.evaluate()
+                    for alert in alerts:
+                        self._queue.put_nowait((alert, detected))
+                except Exception:
+                    logger.exception("Alert evaluation failed")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            dispatcher.cancel()
+
+    def start(self):
+        """Run the monitor on a background daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=asyncio.run, args=(self.run(),),
+                                            name="ghostfracture-alerts", daemon=True)
+            self._thread.start()
+            self._ready.wait(timeout=5)
+        return self
+
+    def stop(self):
+        """Cancel the evaluation loop and wait for the thread to exit"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout=5)
+            self._thread = None
+            self._loop = None
+
+    def queue_depth(self):
+        """Alerts waiting for delivery"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def latency_stats(self):
+        """Detection-to-notification latency percentiles in seconds"""
+        if not self.latencies:
+            return {'count': 0, 'p50': np.nan, 'p95': np.nan, 'max': np.nan}
+        values = np.asarray(self.latencies)
+        return {'count': len(values), 'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)), 'max': float(values.max())}
@@ -0,0 +1,278 @@
+"""``ghostfracture`` command line: batch well-log processing and stage simulation.
+
+Heavy modules (NumPy, pandas, the simulation models) are imported inside
+the commands so that ``--help`` and argument errors return immediately.
+
+    ghostfracture wells
+    ghostfracture logs Berkine-12 Ahnet-01 -o logs/
+    ghostfracture logs --all-wells --memory
+    ghostfracture splice run1.csv run2.csv --step 0.5 -o spliced.csv
+    ghostfracture depthmatch density.csv resistivity.csv --curve GR -o matched.csv
+    ghostfracture tops --type-well Berkine-12 --all-wells -o tops.csv
+    ghostfracture simulate --well Berkine-12 --stages 1-40 -o stages.csv
+    ghostfracture simulate -p design.toml --all-wells --full --jobs 4 -o runs.json
+    ghostfracture serve --port 8765
+
+A parameter file (JSON or TOML) holds stage inputs as top-level keys,
+optionally with a ``runs`` list whose entries override them, e.g.
+
+    pump_rate = 90
+    [[runs]]
+    fluid_type = "Gel"
+    [[runs]]
+    fluid_type = "Slickwater"
+    proppant_conc = 4.0
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+
+def parse_stages(text):
+    """'1-5,8,10-12' -> [1, 2, 3, 4, 5, 8, 10, 11, 12]"""
+    stages = []
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        stages.extend(range(int(first), int(last or first) + 1))
+    return stages
+
+
+def load_parameter_file(path):
+    """Runs described by a JSON or TOML parameter file"""
+    with open(path, 'rb') as fh:
+        if path.endswith('.toml'):
+            try:
+                import tomllib
+            except ImportError:  # Python < 3.11
+                import tomli as tomllib
+            spec = tomllib.load(fh)
+        else:
+            spec = json.load(fh)
+    runs = spec.pop('runs', None) or [{}]
+    return [dict(spec, **run) for run in runs]
+
+
+def expand_runs(base_runs, wells, stages):
+    """Every base run for every requested well and stage"""
+    from ghostfracture.simulation import DEFAULT_STAGE_PARAMETERS
+    runs = []
+    for base in base_runs:
+        for well_id in wells or [base.get('well_id', "Berkine-12")]:
+            for stage in stages or [base.get('stage_num', DEFAULT_STAGE_PARAMETERS['stage_num'])]:
+                runs.append({**DEFAULT_STAGE_PARAMETERS, **base, 'well_id': well_id, 'stage_num': stage})
+    return runs
+
+
+def _run_stage(params, full):
+    from ghostfracture.simulation import analyze_stage, flatten_summary, stage_summary
+    return flatten_summary((analyze_stage if full else stage_summary)(**params))
+
+
+def write_rows(rows, output):
+    """Rows as CSV (stdout, .csv) or JSON (.json)"""
+    if output and output.endswith('.json'):
+        rows = [{k: None if isinstance(v, float) and v != v else v for k, v in row.items()} for row in rows]
+        with open(output, 'w') as fh:
+            json.dump(rows, fh, indent=2, default=float)
+        return
+    fh = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if output:
+            fh.close()
+
+
+# ==================== COMMANDS ====================
+def cmd_wells(args):
+    from ghostfracture.wells import WELL_PROFILES
+    for well_id, profile in WELL_PROFILES.items():
+        top, bottom = profile['depth']
+        print(f"{well_id:<20} {top:>8.1f} - {bottom:.1f} ft")
+    return 0
+
+
+def cmd_logs(args):
+    import numpy as np
+    from ghostfracture.welllogs import load_well
+    from ghostfracture.wells import WELLS
+    from ghostfracture.wellstore import WellStore
+
+    wells = WELLS if args.all_wells else args.wells
+    if not wells:
+        print("error: give well IDs or --all-wells", file=sys.stderr)
+        return 2
+    if args.memory:
+        from ghostfracture.welllogs import memory_report
+        write_rows(memory_report(wells), None)
+        return 0
+    os.makedirs(args.output, exist_ok=True)
+    store = WellStore() if args.seed is None else None
+    rows = []
+    for well_id in wells:
+        if store is not None:  # default seed: map the wells shared with the dashboard
+            df = store.frame(well_id)
+        else:
+            df = load_well(well_id, rng=np.random.default_rng(args.seed))
+        path = os.path.join(args.output, f"{well_id}.csv")
+        df.to_csv(path, index=False)
+        reservoir = (df['GR'] < 60) & (df['PHIND'] > 0.1)
+        rows.append({
+            'Well': well_id, 'File': path, 'Points': len(df),
+            'Total Depth (ft)': round(float(df['Depth'].max()), 1),
+            'Avg Porosity': round(float(df['PHIND'].mean()), 4),
+            'Net Pay (ft)': round(float(df.loc[reservoir, 'Depth'].diff().abs().sum()), 1)
+        })
+    write_rows(rows, None)
+    return 0
+
+
+def cmd_splice(args):
+    from ghostfracture.splicing import splice_csv
+
+    priorities = {}
+    for item in args.priority or []:
+        name, _, value = item.partition('=')
+        priorities[name] = float(value)
+    splicer = splice_csv(args.runs, args.step, args.top, args.base, priorities, args.chunk_size)
+    log, _ = splicer.result()
+    log.to_frame().to_csv(args.output, index=False, na_rep=args.null)
+    write_rows(splicer.summary(), None)
+    return 0
+
+
+def cmd_depthmatch(args):
+    from ghostfracture.depthmatch import match_log
+    from ghostfracture.splicing import splice_csv
+
+    reference, _ = splice_csv([args.reference], args.step).result()
+    depth = reference['Depth']
+    target, _ = splice_csv([args.target], args.step, float(depth[0]), float(depth[-1])).result()
+    matched, shift = match_log(reference, target, args.curve, window=args.window, max_shift=args.max_shift,
+                               min_corr=args.min_corr)
+    matched.to_frame().to_csv(args.output, index=False, na_rep=args.null)
+    write_rows(shift.table(), None)
+    return 0
+
+
+def cmd_tops(args):
+    from ghostfracture.correlation import correlate_wells, tops_table
+    from ghostfracture.wells import WELLS
+    from ghostfracture.wellstore import WellStore
+
+    wells = [well for well in (WELLS if args.all_wells else args.wells) if well != args.type_well]
+    if not wells:
+        print("error: give well IDs or --all-wells", file=sys.stderr)
+        return 2
+    store = WellStore()
+    results = correlate_wells(store.get(args.type_well), {well: store.get(well) for well in wells},
+                              n_samples=args.samples, band=args.band)
+    write_rows(tops_table(results), args.output)
+    return 0
+
+
+def cmd_simulate(args):
+    from ghostfracture.wells import WELLS
+
+    base_runs = load_parameter_file(args.params) if args.params else [{}]
+    wells = WELLS if args.all_wells else args.well
+    runs = expand_runs(base_runs, wells, parse_stages(args.stages) if args.stages else None)
+    if args.jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(_run_stage, runs, [args.full] * len(runs)))
+    else:
+        results = [_run_stage(params, args.full) for params in runs]
+    write_rows([dict(params, **result) for params, result in zip(runs, results)], args.output)
+    return 0
+
+
+def cmd_serve(args):
+    from ghostfracture.service import serve
+    serve(args.host, args.port, workers=args.workers, chunk_size=args.chunk_size, verbose=args.verbose)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ghostfracture", description="GhostFracture batch runs without the dashboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    wells = commands.add_parser("wells", help="list available wells")
+    wells.set_defaults(func=cmd_wells)
+
+    logs = commands.add_parser("logs", help="process well logs (petrophysics + geomechanics) to CSV")
+    logs.add_argument("wells", nargs="*", help="well IDs")
+    logs.add_argument("--all-wells", action="store_true", help="process every known well")
+    logs.add_argument("-o", "--output", default=".", help="output directory (default: .)")
+    logs.add_argument("--seed", type=int, help="random seed (default: the well's own seed, read from the shared well store)")
+    logs.add_argument("--memory", action="store_true",
+                      help="report per-well memory (float64 DataFrame vs. float32 WellLog) instead of writing CSVs")
+    logs.set_defaults(func=cmd_logs)
+
+    splice = commands.add_parser("splice", help="resample overlapping logging runs (CSV) onto one depth grid")
+    splice.add_argument("runs", nargs="+", help="run CSV files with a Depth column")
+    splice.add_argument("--step", type=float, default=0.5, help="output sample step in ft (default: 0.5)")
+    splice.add_argument("--top", type=float, help="top of the output grid (default: shallowest run)")
+    splice.add_argument("--base", type=float, help="base of the output grid (default: deepest run)")
+    splice.add_argument("--priority", action="append", metavar="RUN=VALUE",
+                        help="run priority, lower wins (default: the run's sample step; repeatable)")
+    splice.add_argument("--chunk-size", type=int, default=1_000_000, help="rows read per chunk (default: 1000000)")
+    splice.add_argument("--null", default="-999.25", help="value written for missing samples (default: -999.25)")
+    splice.add_argument("-o", "--output", default="spliced.csv", help="output CSV (default: spliced.csv)")
+    splice.set_defaults(func=cmd_splice)
+
+    depthmatch = commands.add_parser("depthmatch", help="depth-shift a logging run (CSV) onto a reference run")
+    depthmatch.add_argument("reference", help="reference run CSV with a Depth column")
+    depthmatch.add_argument("target", help="run CSV to shift")
+    depthmatch.add_argument("--curve", default="GR", help="curve logged on both runs (default: GR)")
+    depthmatch.add_argument("--step", type=float, default=0.5, help="common sample step in ft (default: 0.5)")
+    depthmatch.add_argument("--window", type=float, default=100.0, help="correlation window in ft (default: 100)")
+    depthmatch.add_argument("--max-shift", type=float, default=10.0, help="largest shift searched in ft (default: 10)")
+    depthmatch.add_argument("--min-corr", type=float, default=0.5,
+                            help="windows correlating less are not used (default: 0.5)")
+    depthmatch.add_argument("--null", default="-999.25", help="value written for missing samples (default: -999.25)")
+    depthmatch.add_argument("-o", "--output", default="matched.csv", help="output CSV (default: matched.csv)")
+    depthmatch.set_defaults(func=cmd_depthmatch)
+
+    tops = commands.add_parser("tops", help="propagate formation tops from a type well by banded DTW correlation")
+    tops.add_argument("wells", nargs="*", help="target well IDs")
+    tops.add_argument("--all-wells", action="store_true", help="correlate every other known well")
+    tops.add_argument("--type-well", default="Berkine-12", help="well whose tops are propagated (default: Berkine-12)")
+    tops.add_argument("--band", type=float, default=0.1,
+                      help="Sakoe-Chiba band as a fraction of the curve length (default: 0.1)")
+    tops.add_argument("--samples", type=int, default=1000, help="samples per well interval (default: 1000)")
+    tops.add_argument("-o", "--output", help="output .csv or .json (default: CSV on stdout)")
+    tops.set_defaults(func=cmd_tops)
+
+    simulate = commands.add_parser("simulate", help="simulate stages and evaluate risk")
+    simulate.add_argument("-p", "--params", help="JSON or TOML parameter file")
+    simulate.add_argument("--well", action="append", help="well ID (repeatable)")
+    simulate.add_argument("--all-wells", action="store_true", help="run every known well")
+    simulate.add_argument("--stages", help="stage list, e.g. 1-40 or 3,5,7")
+    simulate.add_argument("--full", action="store_true",
+                          help="full-resolution analysis (proppant particles, events, SRV, DFN)")
+    simulate.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default: 1)")
+    simulate.add_argument("-o", "--output", help="output .csv or .json (default: CSV on stdout)")
+    simulate.set_defaults(func=cmd_simulate)
+
+    serve = commands.add_parser("serve", help="run the local HTTP batch service (see ghostfracture.service)")
+    serve.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="port (default: 8765)")
+    serve.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    serve.add_argument("--chunk-size", type=int, default=256, help="items per worker task (default: 256)")
+    serve.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
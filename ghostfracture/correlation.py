@@ -0,0 +1,136 @@
+"""Well-to-well correlation and formation top propagation by banded DTW.
+
+Formation tops picked on a type well are carried to target wells by
+aligning their GR and resistivity curves with dynamic time warping (DTW).
+The alignment is restricted to a Sakoe-Chiba band of ``band`` x the curve
+length around the diagonal.
+
+Each well's logged interval is resampled to the same number of samples, and
+the curves are smoothed and z-scored (resistivity as log10). The DTW runs
+as a wavefront over anti-diagonals, vectorized across the band and across
+a batch of target wells. Instead of keeping a full cost matrix for
+backtracking, every band cell carries the target sample at which its best
+path entered each top's row. Memory is therefore linear in the band width,
+not in the curve length squared.
+"""
+import numpy as np
+
+from ghostfracture.welllogs import formation_intervals
+
+FEATURES = ('GR', 'ILD')
+RESISTIVITY_CURVES = ('ILD', 'LLD', 'LLS', 'MSFL')
+
+
+def correlation_features(log, curves=FEATURES, n_samples=1000, smooth=5):
+    """(curves x n_samples) z-scored features over the logged interval, and its (top, base) depths.
+
+    ``log`` is a WellLog or DataFrame with a ``Depth`` curve. Resistivity
+    curves are taken as log10; each curve is smoothed by a ``smooth``-sample
+    moving average and nulls become the mean (zero).
+    """
+    depth = np.asarray(log['Depth'], dtype=np.float64)
+    grid = np.linspace(depth[0], depth[-1], n_samples)
+    features = np.empty((len(curves), n_samples))
+    for row, curve in enumerate(curves):
+        values = np.asarray(log[curve], dtype=np.float64)
+        if curve in RESISTIVITY_CURVES:
+            values = np.log10(np.where(values > 0, values, np.nan))
+        valid = ~np.isnan(values)
+        features[row] = np.interp(grid, depth[valid], values[valid])
+    if smooth > 1:
+        padded = np.pad(features, ((0, 0), (smooth // 2, smooth - 1 - smooth // 2)), mode='edge')
+        cumsum = np.pad(np.cumsum(padded, axis=1), ((0, 0), (1, 0)))
+        features = (cumsum[:, smooth:] - cumsum[:, :-smooth]) / smooth
+    features -= features.mean(axis=1, keepdims=True)
+    features /= np.where(features.std(axis=1) > 0, features.std(axis=1), 1.0)[:, None]
+    return features, (depth[0], depth[-1])
+
+
+def banded_dtw(reference, targets, rows, band=0.1):
+    """Banded DTW of ``reference`` (curves x n) against ``targets`` (wells x curves x n).
+
+    ``rows`` are reference sample indices (e.g. formation tops). Returns
+    the target sample index where each well's optimal path enters every
+    row (wells x rows), and each path's cost per reference sample.
+    """
+    n = reference.shape[1]
+    if targets.shape[1:] != reference.shape:
+        raise ValueError(f"targets must be (wells x {reference.shape[0]} x {n}), got {targets.shape}")
+    width = max(int(np.ceil(band * n)), 1)
+    rows = np.asarray(rows)
+    n_wells = len(targets)
+
+    # Cells i + j = k of one anti-diagonal all have offsets o = i - j of k's parity, so each parity gets
+    # its own offsets. A predecessor missing from the band points at an extra trailing column (inf cost).
+    offsets = [np.arange(-(width // 2 * 2), width // 2 * 2 + 1, 2),
+               np.arange(-((width - 1) // 2 * 2 + 1), (width - 1) // 2 * 2 + 2, 2)]
+    layouts = []
+    for parity in (0, 1):
+        cells, previous = offsets[parity], offsets[1 - parity]
+
+        def position(o):
+            return np.where((o >= previous[0]) & (o <= previous[-1]), (o - previous[0]) // 2, len(previous))
+
+        layouts.append((cells, position(cells - 1), position(cells + 1)))  # (i-1, j) and (i, j-1)
+
+    # Per parity: path cost and carried entry points of the latest anti-diagonal
+    costs = [np.full((n_wells, len(cells) + 1), np.inf) for cells in offsets]
+    entries = [np.full((n_wells, len(cells) + 1, len(rows)), -1, dtype=np.int32) for cells in offsets]
+
+    for k in range(2 * n - 1):
+        parity = k % 2
+        cells, up, left = layouts[parity]
+        i, j = (k + cells) // 2, (k - cells) // 2
+        valid = (i >= 0) & (j >= 0) & (i < n) & (j < n)
+        i_clip, j_clip = np.clip(i, 0, n - 1), np.clip(j, 0, n - 1)
+        cost = ((targets[:, :, j_clip] - reference[:, i_clip]) ** 2).sum(axis=1)
+
+        # Predecessors: (i-1, j) and (i, j-1) on diagonal k-1, (i-1, j-1) on diagonal k-2
+        previous_cost, previous_entry = costs[1 - parity], entries[1 - parity]
+        steps = np.stack([previous_cost[:, up], previous_cost[:, left], costs[parity][:, :-1]])
+        choice = steps.argmin(axis=0)
+        best = np.zeros_like(cost) if k == 0 else steps.min(axis=0)
+        current = costs[parity]
+        current[:, :-1] = np.where(valid, cost + best, np.inf)
+
+        entry = np.where((choice == 0)[..., None], previous_entry[:, up],
+                         np.where((choice == 1)[..., None], previous_entry[:, left], entries[parity][:, :-1]))
+        entered = (choice != 1) | (k == 0)  # arrived from the row above (or the start)
+        record = entered[..., None] & (i[None, :, None] == rows[None, None, :]) & valid[None, :, None]
+        entries[parity][:, :-1] = np.where(record, j[None, :, None], entry)
+
+    centre = width // 2  # offset 0 on the last (even) diagonal
+    return entries[0][:, centre], costs[0][:, centre] / n
+
+
+def correlate_wells(type_log, target_logs, tops=None, curves=FEATURES, n_samples=1000, band=0.1, smooth=5,
+                    batch=64):
+    """Propagate the type well's formation tops to every target well.
+
+    ``target_logs`` maps well names to logs (WellLog or DataFrame);
+    ``tops`` maps formation names to type-well depths (default: the
+    synthetic formation tops). Returns ``{well: {'tops': {formation: depth},
+    'cost': path cost}}``.
+    """
+    reference, (top, base) = correlation_features(type_log, curves, n_samples, smooth)
+    if tops is None:
+        tops = {formation: interval[0] for formation, interval in formation_intervals(top, base).items()}
+    rows = np.clip(np.round((np.array(list(tops.values())) - top) / (base - top) * (n_samples - 1)),
+                   0, n_samples - 1).astype(int)
+
+    names = list(target_logs)
+    results = {}
+    for start in range(0, len(names), batch):
+        chunk = names[start:start + batch]
+        prepared = [correlation_features(target_logs[name], curves, n_samples, smooth) for name in chunk]
+        entries, costs = banded_dtw(reference, np.stack([features for features, _ in prepared]), rows, band)
+        for name, (_, (well_top, well_base)), entry, cost in zip(chunk, prepared, entries, costs):
+            depths = well_top + entry * (well_base - well_top) / (n_samples - 1)
+            results[name] = {'tops': dict(zip(tops, depths.tolist())), 'cost': float(cost)}
+    return results
+
+
+def tops_table(results):
+    """Rows of well, formation, top depth and path cost"""
+    return [{'Well': well, 'Formation': formation, 'Top (ft)': round(depth, 1), 'Cost': round(result['cost'], 3)}
+            for well, result in results.items() for formation, depth in result['tops'].items()]
@@ -0,0 +1,145 @@
+"""Automatic depth matching of log runs by windowed FFT cross-correlation.
+
+Curves from different logging runs (e.g. GR on the density run and on the
+resistivity run) are often a few feet off in depth. The curves must be
+aligned before ``calculate_petrophysical_properties`` mixes RHOB, NPHI, LLD
+and GR. ``estimate_shift`` cuts a correlating curve into overlapping
+windows and cross-correlates every window against the other run's curve in
+one batch of FFTs. Each window's best lag is refined to sub-sample accuracy.
+The window results become a piecewise-linear ``DepthShift``, which
+``match_log`` applies to every curve of a run.
+
+Both curves must be sampled on the same regular depth grid, e.g. two runs
+resampled with ``ghostfracture.splicing``. A shift ``s`` at depth ``d``
+means the target reads at ``d + s`` what the reference reads at ``d``.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ghostfracture.welllogs import WellLog
+
+
+class DepthShift:
+    """Piecewise-linear depth shift through the accepted window centres"""
+
+    def __init__(self, centres, shifts, correlation, accepted):
+        self.centres = centres
+        self.shifts = shifts
+        self.correlation = correlation
+        self.accepted = accepted
+
+    def __call__(self, depth):
+        """Shift at ``depth`` (ft), constant beyond the first and last accepted window"""
+        if not self.accepted.any():
+            return np.zeros_like(np.asarray(depth, dtype=np.float64))
+        return np.interp(depth, self.centres[self.accepted], self.shifts[self.accepted])
+
+    def table(self):
+        """Rows of window centre, shift and correlation"""
+        return [{'Depth (ft)': round(float(centre), 2), 'Shift (ft)': round(float(shift), 3),
+                 'Correlation': round(float(corr), 3), 'Used': bool(used)}
+                for centre, shift, corr, used in zip(self.centres, self.shifts, self.correlation, self.accepted)]
+
+
+def _normalized(windows, min_valid):
+    """Zero-mean, unit-norm windows with nulls set to zero, and a mask of windows with enough data"""
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=1)
+    windows = np.where(valid, windows, 0.0)
+    mean = windows.sum(axis=1) / np.maximum(count, 1)
+    windows = np.where(valid, windows - mean[:, None], 0.0)
+    norm = np.sqrt((windows ** 2).sum(axis=1))
+    usable = (count >= min_valid * windows.shape[1]) & (norm > 0)
+    return windows / np.where(norm > 0, norm, 1.0)[:, None], usable
+
+
+def estimate_shift(depth, reference, target, window=100.0, hop=None, max_shift=10.0, min_corr=0.5,
+                   min_valid=0.8):
+    """Depth shift of ``target`` relative to ``reference`` (both on the regular grid ``depth``).
+
+    ``window`` and ``max_shift`` are in ft; windows advance by ``hop``
+    (default: half a window). Windows whose best normalized correlation is
+    below ``min_corr``, or with less than ``min_valid`` non-null samples,
+    are not used. The piecewise-linear shift is kept monotonic, so the
+    corrected depths never reverse.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    step = (depth[-1] - depth[0]) / (len(depth) - 1)
+    size = max(int(round(window / step)), 3)
+    lags = max(int(round(max_shift / step)), 1)
+    stride = max(int(round((hop or window / 2) / step)), 1)
+    if len(depth) < size:
+        raise ValueError(f"curve of {len(depth)} samples is shorter than one {window} ft window")
+
+    # Reference windows (K x size) and the target around each, padded by the largest lag on both sides
+    starts = np.arange(0, len(depth) - size + 1, stride)
+    ref, usable = _normalized(sliding_window_view(np.asarray(reference, dtype=np.float64), size)[starts],
+                              min_valid)
+    padded = np.pad(np.asarray(target, dtype=np.float64), lags, constant_values=np.nan)
+    tgt = sliding_window_view(padded, size + 2 * lags)[starts]
+    tgt_valid = ~np.isnan(tgt)
+    mean = np.where(tgt_valid, tgt, 0.0).sum(axis=1) / np.maximum(tgt_valid.sum(axis=1), 1)
+    tgt = np.where(tgt_valid, tgt - mean[:, None], 0.0)  # nulls and padding read as the mean
+
+    # c[k] = sum_i ref[i] * tgt[i + k] for every window and lag k = 0..2*lags, in one batch of FFTs
+    n_fft = 1 << int(np.ceil(np.log2(size + 2 * lags)))
+    def correlate(a, b):
+        spectrum = np.conj(np.fft.rfft(a, n_fft, axis=1)) * np.fft.rfft(b, n_fft, axis=1)
+        return np.fft.irfft(spectrum, n_fft, axis=1)[:, :2 * lags + 1]
+
+    cross = correlate(ref, tgt)
+    ref_energy = correlate(ref ** 2, tgt_valid.astype(np.float64))  # reference energy where the target has data
+
+    # Normalize by both energies over the overlap (target sliding sums from cumulative sums)
+    cumsum = np.pad(np.cumsum(tgt, axis=1), ((0, 0), (1, 0)))
+    cumsq = np.pad(np.cumsum(tgt ** 2, axis=1), ((0, 0), (1, 0)))
+    cumvalid = np.pad(np.cumsum(tgt_valid, axis=1), ((0, 0), (1, 0)))
+    total = cumsum[:, size:] - cumsum[:, :-size]
+    energy = cumsq[:, size:] - cumsq[:, :-size] - total ** 2 / size
+    valid_share = (cumvalid[:, size:] - cumvalid[:, :-size]) / size
+    ncc = cross / np.sqrt(np.maximum(energy, 1e-12) * np.maximum(ref_energy, 1e-12))
+    ncc[valid_share < min_valid] = -np.inf
+
+    # Best lag per window, refined by a parabola through the peak and its neighbours
+    rows = np.arange(len(starts))
+    best = np.argmax(ncc, axis=1)
+    peak = ncc[rows, best]
+    inner = (best > 0) & (best < 2 * lags)
+    before = ncc[rows, np.maximum(best - 1, 0)]
+    after = ncc[rows, np.minimum(best + 1, 2 * lags)]
+    with np.errstate(invalid='ignore', divide='ignore'):  # windows without data peak at -inf
+        curvature = before - 2 * peak + after
+        offset = np.where(inner & np.isfinite(curvature) & (curvature < 0), 0.5 * (before - after) / curvature, 0.0)
+    shifts = (best - lags + np.clip(offset, -0.5, 0.5)) * step
+    centres = depth[starts + size // 2]
+    accepted = usable & np.isfinite(peak) & (peak >= min_corr) & (np.abs(shifts) < max_shift)
+
+    # Keep depth + shift increasing through the accepted control points
+    if accepted.any():
+        mapped = np.maximum.accumulate(centres[accepted] + shifts[accepted])
+        shifts[accepted] = mapped - centres[accepted]
+    return DepthShift(centres, shifts, np.where(np.isfinite(peak), peak, np.nan), accepted)
+
+
+def apply_shift(depth, values, shift):
+    """Curves (rows of ``values``) resampled so that they read on the reference depths"""
+    depth = np.asarray(depth, dtype=np.float64)
+    source = depth + shift(depth)
+    values = np.atleast_2d(values)
+    return np.array([np.interp(source, depth, row, left=np.nan, right=np.nan) for row in values])
+
+
+def match_log(reference, target, curve='GR', **options):
+    """Depth-match a whole run: ``target`` (WellLog on the same grid as ``reference``) shifted by ``curve``.
+
+    Returns the shifted WellLog and the ``DepthShift``; options go to
+    ``estimate_shift``.
+    """
+    depth = reference['Depth']
+    shift = estimate_shift(depth, reference[curve], target[curve], **options)
+    curves = [name for name in target.columns if name != 'Depth']
+    shifted = apply_shift(depth, np.array([target[name] for name in curves]), shift)
+    matched = WellLog(len(target), ['Depth'] + curves)
+    matched['Depth'] = depth
+    matched.values[1:] = shifted
+    return matched, shift
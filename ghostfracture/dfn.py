@@ -0,0 +1,216 @@
+"""Discrete fracture network (DFN) generation and batched mesh building.
+
+Natural fractures are vertical rectangles described by a centre, a strike
+angle in plan view and half extents along strike and in depth. Everything
+is generated and triangulated with array operations, so a 10,000-fracture
+network becomes one vertex/triangle buffer instead of one trace per fracture.
+"""
+import numpy as np
+import pandas as pd
+
+DFN_COLUMNS = ['X', 'Y', 'Z', 'Strike', 'Half Length', 'Half Height']
+
+
+def generate_dfn(n_fractures, frac_half_length, frac_height, seed=None, reference_count=None):
+    """Random natural fracture set around the main hydraulic fracture.
+
+    Centres fall within the stimulated region (±0.7 xf along the fracture,
+    ±0.3 xf normal to it, ±0.3 h in depth), strikes are uniform over 0-π and
+    sizes follow the original dashboard ranges. With ``reference_count`` the
+    plan-view region grows by sqrt(n / reference_count) so that larger
+    networks keep the areal fracture density of the reference network.
+    """
+    rng = np.random.default_rng(seed)
+    spread = 1.0
+    if reference_count:
+        spread = max(1.0, np.sqrt(n_fractures / reference_count))
+    return pd.DataFrame({
+        'X': rng.uniform(-frac_half_length * 0.7, frac_half_length * 0.7, n_fractures) * spread,
+        'Y': rng.uniform(-frac_half_length * 0.3, frac_half_length * 0.3, n_fractures) * spread,
+        'Z': rng.uniform(-frac_height * 0.3, frac_height * 0.3, n_fractures),
+        'Strike': rng.uniform(0, np.pi, n_fractures),
+        'Half Length': rng.uniform(20, max(20.0, frac_half_length * 0.3), n_fractures),
+        'Half Height': rng.uniform(10, max(10.0, frac_height * 0.4), n_fractures)
+    })
+
+
+def fracture_corners(dfn):
+    """Corner coordinates of every fracture as an (n, 4, 3) array"""
+    strike = dfn['Strike'].to_numpy()
+    along = np.column_stack([np.cos(strike), np.sin(strike), np.zeros_like(strike)])
+    along *= dfn['Half Length'].to_numpy()[:, None]
+    up = np.zeros_like(along)
+    up[:, 2] = dfn['Half Height'].to_numpy()
+    center = dfn[['X', 'Y', 'Z']].to_numpy()
+
+    # Counter-clockwise corner order: (-l,-h), (+l,-h), (+l,+h), (-l,+h)
+    signs = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=float)
+    return (center[:, None, :]
+            + signs[None, :, 0, None] * along[:, None, :]
+            + signs[None, :, 1, None] * up[:, None, :])
+
+
+def dfn_mesh(dfn, values=None):
+    """Merge all fractures into one triangle mesh for a single Mesh3d trace.
+
+    Returns a dict with vertex coordinates ``x, y, z``, triangle indices
+    ``i, j, k`` (two per fracture) and a per-vertex ``intensity`` taken from
+    ``values`` (one value per fracture, default: strike angle).
+    """
+    corners = fracture_corners(dfn).reshape(-1, 3)
+    base = 4 * np.arange(len(dfn))
+    if values is None:
+        values = dfn['Strike'].to_numpy()
+    return {
+        'x': corners[:, 0],
+        'y': corners[:, 1],
+        'z': corners[:, 2],
+        'i': np.concatenate([base, base]),
+        'j': np.concatenate([base + 1, base + 2]),
+        'k': np.concatenate([base + 2, base + 3]),
+        'intensity': np.repeat(np.asarray(values, dtype=float), 4)
+    }
+
+
+# ==================== CONNECTIVITY ANALYSIS ====================
+def plan_segments(dfn):
+    """Plan-view end points (n, 2) and (n, 2) of every vertical fracture"""
+    strike = dfn['Strike'].to_numpy()
+    half = dfn['Half Length'].to_numpy()[:, None] * np.column_stack([np.cos(strike), np.sin(strike)])
+    center = dfn[['X', 'Y']].to_numpy()
+    return center - half, center + half
+
+
+def _cross(o, a, b):
+    return (a[:, 0] - o[:, 0]) * (b[:, 1] - o[:, 1]) - (a[:, 1] - o[:, 1]) * (b[:, 0] - o[:, 0])
+
+
+def segments_intersect(p1, p2, q1, q2):
+    """Element-wise test whether segments p1-p2 and q1-q2 intersect"""
+    d1 = _cross(q1, q2, p1)
+    d2 = _cross(q1, q2, p2)
+    d3 = _cross(p1, p2, q1)
+    d4 = _cross(p1, p2, q2)
+    return (d1 * d2 <= 0) & (d3 * d4 <= 0)
+
+
+def candidate_pairs(start, end, cell_size=None):
+    """Fracture pairs sharing a spatial-hash cell, as (i, j) with i < j.
+
+    Each segment is hashed into every grid cell its bounding box covers and
+    pairs are formed only within cells, so the candidate count follows the
+    local fracture density instead of n². The cell size defaults to the
+    median bounding-box extent. A pair sharing several cells is reported
+    once, from the lower-left cell of the overlap of the two boxes.
+    """
+    n = len(start)
+    empty = np.empty(0, dtype=np.int64)
+    if n < 2:
+        return empty, empty
+    lo = np.minimum(start, end)
+    hi = np.maximum(start, end)
+    if cell_size is None:
+        cell_size = max(float(np.median((hi - lo).max(axis=1))), 1e-6)
+    origin = lo.min(axis=0)
+    c0 = np.floor((lo - origin) / cell_size).astype(np.int64)
+    c1 = np.floor((hi - origin) / cell_size).astype(np.int64)
+    stride = int(c1[:, 1].max()) + 1
+
+    # One (cell, fracture) entry per covered cell
+    nx = c1[:, 0] - c0[:, 0] + 1
+    ny = c1[:, 1] - c0[:, 1] + 1
+    per_seg = nx * ny
+    ids = np.repeat(np.arange(n), per_seg)
+    local = np.arange(len(ids)) - np.repeat(np.cumsum(per_seg) - per_seg, per_seg)
+    cells = (c0[ids, 0] + local // ny[ids]) * stride + c0[ids, 1] + local % ny[ids]
+    order = np.lexsort((ids, cells))
+    cells, ids = cells[order], ids[order]
+
+    # All pairs within each cell: entry p pairs with p+1 .. end of its cell
+    _, group_start, group_size = np.unique(cells, return_index=True, return_counts=True)
+    group_end = np.repeat(group_start + group_size, group_size)
+    partners = group_end - np.arange(len(cells)) - 1
+    first = np.repeat(np.arange(len(cells)), partners)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+    i, j, cell = ids[first], ids[second], cells[first]
+
+    # Keep each pair only in the lower-left cell of the shared bounding box
+    home = np.maximum(c0[i, 0], c0[j, 0]) * stride + np.maximum(c0[i, 1], c0[j, 1])
+    keep = cell == home
+    return i[keep], j[keep]
+
+
+def dfn_intersections(dfn, cell_size=None):
+    """Index pairs (i, j) of natural fractures that intersect each other"""
+    start, end = plan_segments(dfn)
+    i, j = candidate_pairs(start, end, cell_size)
+    z = dfn['Z'].to_numpy()
+    h = dfn['Half Height'].to_numpy()
+    hit = (np.abs(z[i] - z[j]) <= h[i] + h[j]) & segments_intersect(start[i], end[i], start[j], end[j])
+    return i[hit], j[hit]
+
+
+def connected_components(n, i, j):
+    """Component label of each of n nodes given edges (i, j).
+
+    Array-based union-find: every round hooks the larger root of each
+    cross-component edge onto the smaller one, then compresses paths by
+    pointer jumping until every node points at its root. Labels are the
+    smallest node index in each component.
+    """
+    parent = np.arange(n)
+    i = np.asarray(i, dtype=np.int64)
+    j = np.asarray(j, dtype=np.int64)
+    while True:
+        ri, rj = parent[i], parent[j]
+        cross = ri != rj
+        if not cross.any():
+            return parent
+        np.minimum.at(parent, np.maximum(ri[cross], rj[cross]), np.minimum(ri[cross], rj[cross]))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+def connectivity_analysis(dfn, frac_half_length, frac_height, cell_size=None):
+    """Intersection, clustering and hydraulic-fracture connectivity statistics.
+
+    The hydraulic fracture is the plan-view segment (-xf, 0)-(xf, 0) spanning
+    ±h/2 in depth and is added as node n. Returns a dict with per-fracture
+    cluster ``labels``, the ``connected`` mask (linked to the hydraulic
+    fracture), ``connectivity`` (fraction connected), ``connected_area`` and
+    ``total_area`` (ft², both fracture faces counted once), ``cluster_sizes``
+    (descending), ``n_intersections`` and ``complexity`` (intersections per
+    fracture).
+    """
+    n = len(dfn)
+    i, j = dfn_intersections(dfn, cell_size)
+
+    # Hydraulic fracture against every natural fracture in one vectorized test
+    start, end = plan_segments(dfn)
+    hf_start = np.tile([-frac_half_length, 0.0], (n, 1))
+    hf_end = np.tile([frac_half_length, 0.0], (n, 1))
+    z_overlap = np.abs(dfn['Z'].to_numpy()) <= dfn['Half Height'].to_numpy() + frac_height / 2
+    hf_hits = np.nonzero(z_overlap & segments_intersect(start, end, hf_start, hf_end))[0]
+
+    labels = connected_components(
+        n + 1,
+        np.concatenate([i, hf_hits]),
+        np.concatenate([j, np.full(len(hf_hits), n)])
+    )
+    connected = labels[:n] == labels[n]
+    area = 4 * dfn['Half Length'].to_numpy() * dfn['Half Height'].to_numpy()
+    natural_sizes = np.bincount(labels[:n], minlength=n + 1)
+
+    return {
+        'labels': labels[:n],
+        'connected': connected,
+        'connectivity': float(connected.mean()) if n else 0.0,
+        'connected_area': float(area[connected].sum()),
+        'total_area': float(area.sum()),
+        'cluster_sizes': np.sort(natural_sizes[natural_sizes > 0])[::-1],
+        'n_intersections': int(len(i) + len(hf_hits)),
+        'complexity': 2 * len(i) / n if n else 0.0
+    }
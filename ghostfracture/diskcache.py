@@ -0,0 +1,209 @@
+"""Persistent, content-addressed result cache.
+
+Entries are pickled to ``<directory>/<aa>/<sha256>.pkl`` where the hash
+covers the function name, its arguments and a code version (the source of
+the file defining the function plus the ghostfracture package), so a code
+change never serves stale results. Rule files (``*.toml``) are hot-reloaded
+by ``ghostfracture.rules``, so their part of the version is re-checked on
+every call rather than once per process. The total size is capped; when a write
+goes over the cap the least recently used entries (by file mtime, touched
+on every hit) are deleted. Writes are atomic, so several server processes
+can share one directory.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIRECTORY = os.environ.get(
+    "GHOSTFRACTURE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ghostfracture")
+)
+DEFAULT_MAX_BYTES = int(float(os.environ.get("GHOSTFRACTURE_CACHE_MAX_MB", 512)) * 1024 * 1024)
+STALE_TMP_SECONDS = 3600  # older temp files are left over from crashed writers
+
+_MISSING = object()
+
+
+def _file_digest(paths):
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        with open(path, 'rb') as fh:
+            digest.update(path.encode())
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def package_version():
+    """Digest of every source file in the ghostfracture package"""
+    return _file_digest(
+        os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith('.py')
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _stamped_digest(stamps):
+    return _file_digest(path for path, _, _ in stamps)
+
+
+def rules_version():
+    """Digest of the package's rule files, re-read only when one's mtime or size changes"""
+    paths = [os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith('.toml')]
+    stamps = []
+    for path in sorted(paths):
+        stat = os.stat(path)
+        stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return _stamped_digest(tuple(stamps))
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(func):
+    return _file_digest([inspect.getsourcefile(inspect.unwrap(func))])
+
+
+def code_version(func):
+    """Digest of the file that defines ``func``, the package sources and the current rule files"""
+    return hashlib.sha256((_source_digest(func) + package_version() + rules_version()).encode()).hexdigest()
+
+
+class DiskCache:
+    """Size-bounded on-disk cache with LRU eviction"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.swept = self._sweep_tmp()
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _entries(self):
+        """(path, mtime, size) of every stored entry"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:  # evicted by another process
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _sweep_tmp(self, now=None):
+        """Delete temp files of writes that never finished; recent ones may still be in flight"""
+        now = time.time() if now is None else now
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    path = os.path.join(root, name)
+                    try:
+                        if now - os.stat(path).st_mtime > STALE_TMP_SECONDS:
+                            os.remove(path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+        return removed
+
+    @staticmethod
+    def make_key(*parts):
+        """Stable hash of picklable key parts"""
+        return hashlib.sha256(pickle.dumps(parts, protocol=4)).hexdigest()
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                value = pickle.load(fh)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        size = os.path.getsize(tmp)
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its cap"""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                os.remove(path)
+            self._size = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    def stats(self):
+        return {'entries': sum(1 for _ in self._entries()), 'bytes': self._size,
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def memoize(self, func=None, *, ignore=()):
+        """Decorator caching ``func`` results on disk, keyed by arguments and code version.
+
+        Arguments named in ``ignore`` (e.g. progress callbacks) are passed
+        through but left out of the key.
+        """
+        if func is None:
+            return functools.partial(self.memoize, ignore=ignore)
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = sorted((k, v) for k, v in bound.arguments.items() if k not in ignore)
+            key = self.make_key(name, code_version(func), arguments)
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                self.set(key, value)
+            return value
+
+        return wrapper
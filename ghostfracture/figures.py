@@ -0,0 +1,668 @@
+"""Plotly figures for the dashboard tabs, built from plain arrays and frames.
+
+Kept free of Streamlit so they can be cached, served and benchmarked
+outside the app.
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from ghostfracture.dfn import dfn_mesh
+
+
+# ==================== WELL LOG FIGURES ====================
+def triple_combo_figure(df):
+    """Triple combo log display"""
+    fig = go.Figure()
+
+    # Track 1: Gamma Ray
+    fig.add_trace(go.Scatter(
+        x=df['GR'],
+        y=df['Depth'],
+        name='GR',
+        line=dict(color='green', width=1),
+        mode='lines'
+    ))
+
+    # Track 2: Deep Resistivity (log scale)
+    fig.add_trace(go.Scatter(
+        x=df['LLD'],
+        y=df['Depth'],
+        name='LLD',
+        line=dict(color='red', width=1),
+        mode='lines',
+        xaxis='x2'
+    ))
+
+    # Track 3: Density
+    fig.add_trace(go.Scatter(
+        x=df['RHOB'],
+        y=df['Depth'],
+        name='RHOB',
+        line=dict(color='blue', width=1),
+        mode='lines',
+        xaxis='x3'
+    ))
+
+    # Track 4: Neutron Porosity
+    fig.add_trace(go.Scatter(
+        x=df['NPHI'],
+        y=df['Depth'],
+        name='NPHI',
+        line=dict(color='orange', width=1),
+        mode='lines',
+        xaxis='x4'
+    ))
+
+    # Track 5: Sonic
+    fig.add_trace(go.Scatter(
+        x=df['DT'],
+        y=df['Depth'],
+        name='DT',
+        line=dict(color='purple', width=1),
+        mode='lines',
+        xaxis='x5'
+    ))
+
+    fig.update_layout(
+        title="Triple Combo Log Display",
+        yaxis=dict(
+            title="Depth (ft)",
+            autorange="reversed",
+            range=[df['Depth'].max(), df['Depth'].min()]
+        ),
+        xaxis=dict(title="GR (API)", domain=[0, 0.16]),
+        xaxis2=dict(title="LLD (Ω.m)", domain=[0.2, 0.36], type="log"),
+        xaxis3=dict(title="RHOB (g/cc)", domain=[0.4, 0.56]),
+        xaxis4=dict(title="NPHI (v/v)", domain=[0.6, 0.76]),
+        xaxis5=dict(title="DT (μs/ft)", domain=[0.8, 0.96]),
+        height=600,
+        showlegend=True
+    )
+    return fig
+
+
+def petrophysics_figures(df):
+    """Porosity/saturation and shale volume/permeability tracks"""
+    fig_phi = go.Figure()
+
+    fig_phi.add_trace(go.Scatter(
+        x=df['PHIND'],
+        y=df['Depth'],
+        name='Total Porosity',
+        line=dict(color='blue', width=1.5),
+        mode='lines'
+    ))
+
+    fig_phi.add_trace(go.Scatter(
+        x=df['PHIE'],
+        y=df['Depth'],
+        name='Effective Porosity',
+        line=dict(color='green', width=1.5),
+        mode='lines',
+        xaxis='x2'
+    ))
+
+    fig_phi.add_trace(go.Scatter(
+        x=df['SW'],
+        y=df['Depth'],
+        name='Water Saturation',
+        line=dict(color='red', width=1.5),
+        mode='lines',
+        xaxis='x3'
+    ))
+
+    fig_phi.update_layout(
+        title="Porosity & Saturation Analysis",
+        yaxis=dict(
+            autorange="reversed",
+            range=[df['Depth'].max(), df['Depth'].min()]
+        ),
+        xaxis=dict(title="PHIT (v/v)", domain=[0, 0.3]),
+        xaxis2=dict(title="PHIE (v/v)", domain=[0.35, 0.65]),
+        xaxis3=dict(title="Sw (v/v)", domain=[0.7, 1]),
+        height=500
+    )
+
+    fig_perm = go.Figure()
+
+    fig_perm.add_trace(go.Scatter(
+        x=df['VSH'],
+        y=df['Depth'],
+        name='Vshale',
+        line=dict(color='brown', width=1.5),
+        mode='lines'
+    ))
+
+    fig_perm.add_trace(go.Scatter(
+        x=np.log10(df['PERM'] + 1),
+        y=df['Depth'],
+        name='Perm (log10)',
+        line=dict(color='purple', width=1.5),
+        mode='lines',
+        xaxis='x2'
+    ))
+
+    # Highlight pay zones
+    pay_mask = (df['VSH'] < 0.3) & (df['PHIE'] > 0.1) & (df['SW'] < 0.6)
+    if pay_mask.any():
+        pay_depths = df.loc[pay_mask, 'Depth']
+        if len(pay_depths) > 0:
+            fig_perm.add_trace(go.Scatter(
+                x=[0.5] * len(pay_depths),
+                y=pay_depths,
+                name='Pay Zone',
+                mode='markers',
+                marker=dict(color='yellow', size=4, symbol='square'),
+                xaxis='x'
+            ))
+
+    fig_perm.update_layout(
+        title="Shale Volume & Permeability",
+        yaxis=dict(
+            autorange="reversed",
+            range=[df['Depth'].max(), df['Depth'].min()]
+        ),
+        xaxis=dict(title="Vshale (v/v)", domain=[0, 0.45]),
+        xaxis2=dict(title="log10(Perm) (mD)", domain=[0.55, 1]),
+        height=500
+    )
+    return fig_phi, fig_perm
+
+
+def geomechanics_figures(df):
+    """Elastic property and pressure gradient tracks"""
+    fig_elastic = go.Figure()
+
+    fig_elastic.add_trace(go.Scatter(
+        x=df['EDYN'],
+        y=df['Depth'],
+        name='Young\'s Modulus',
+        line=dict(color='red', width=1.5),
+        mode='lines'
+    ))
+
+    fig_elastic.add_trace(go.Scatter(
+        x=df['PRDYN'],
+        y=df['Depth'],
+        name='Poisson\'s Ratio',
+        line=dict(color='blue', width=1.5),
+        mode='lines',
+        xaxis='x2'
+    ))
+
+    fig_elastic.add_trace(go.Scatter(
+        x=df['BI'],
+        y=df['Depth'],
+        name='Brittleness Index',
+        line=dict(color='green', width=1.5),
+        mode='lines',
+        xaxis='x3'
+    ))
+
+    fig_elastic.update_layout(
+        title="Elastic Properties",
+        yaxis=dict(
+            autorange="reversed",
+            range=[df['Depth'].max(), df['Depth'].min()]
+        ),
+        xaxis=dict(title="E (Mpsi)", domain=[0, 0.3]),
+        xaxis2=dict(title="ν", domain=[0.35, 0.65]),
+        xaxis3=dict(title="BI", domain=[0.7, 1]),
+        height=500
+    )
+
+    fig_pressure = go.Figure()
+
+    fig_pressure.add_trace(go.Scatter(
+        x=df['OBG'],
+        y=df['Depth'],
+        name='Overburden',
+        line=dict(color='black', width=2),
+        mode='lines'
+    ))
+
+    fig_pressure.add_trace(go.Scatter(
+        x=df['PPG'],
+        y=df['Depth'],
+        name='Pore Pressure',
+        line=dict(color='blue', width=2),
+        mode='lines',
+        fill='tonexty'
+    ))
+
+    fig_pressure.add_trace(go.Scatter(
+        x=df['FG'],
+        y=df['Depth'],
+        name='Fracture Gradient',
+        line=dict(color='red', width=2),
+        mode='lines',
+        fill='tonexty'
+    ))
+
+    fig_pressure.update_layout(
+        title="Pressure Gradient Profile",
+        yaxis=dict(
+            autorange="reversed",
+            range=[df['Depth'].max(), df['Depth'].min()]
+        ),
+        xaxis=dict(title="Pressure (psi/ft)", range=[0.4, 1.2]),
+        height=500
+    )
+    return fig_elastic, fig_pressure
+
+
+def crossplot_figure(df, x_var, y_var, color_var):
+    """Scatter of two log curves colored by a third"""
+    return px.scatter(
+        df,
+        x=x_var,
+        y=y_var,
+        color=color_var,
+        title=f"{y_var} vs {x_var}",
+        labels={x_var: x_var, y_var: y_var, color_var: color_var},
+        height=500
+    )
+
+
+# ==================== FRACSCOPE FIGURES ====================
+def pressure_diagnostics_figure(time, net_pressure, pressure_slope):
+    """Net pressure and derivative with treatment regimes"""
+    fig_pressure = go.Figure()
+
+    # Main pressure curve with gradient fill
+    fig_pressure.add_trace(go.Scatter(
+        x=time,
+        y=net_pressure,
+        name='Net Pressure',
+        line=dict(color='#0066CC', width=4),
+        fill='tozeroy',
+        fillcolor='rgba(0, 102, 204, 0.1)',
+        mode='lines',
+        hovertemplate='<b>Time:</b> %{x:.1f} min<br><b>Pressure:</b> %{y:.0f} psi<extra></extra>'
+    ))
+
+    # Derivative curve
+    fig_pressure.add_trace(go.Scatter(
+        x=time,
+        y=pressure_slope,
+        name='Pressure Derivative',
+        line=dict(color='#FF4500', width=3, dash='dash'),
+        mode='lines',
+        yaxis='y2'
+    ))
+
+    # Add pressure regimes
+    pressure_regimes = [
+        (0, 15, 'Near-Wellbore', '#00CC00'),
+        (15, 40, 'Propagation', '#FFA500'),
+        (40, 60, 'Closure', '#FF4D4D')
+    ]
+
+    for start, end, label, color in pressure_regimes:
+        fig_pressure.add_vrect(
+            x0=start, x1=end,
+            fillcolor=color,
+            opacity=0.1,
+            layer="below",
+            line_width=0,
+        )
+        fig_pressure.add_annotation(
+            x=(start + end)/2,
+            y=net_pressure.max() * 0.9,
+            text=label,
+            showarrow=False,
+            font=dict(size=10, color=color)
+        )
+
+    fig_pressure.update_layout(
+        title={
+            'text': "REAL-TIME PRESSURE DIAGNOSTICS - Fracturing Treatment",
+            'font': {'size': 16, 'color': '#2C3E50'}
+        },
+        xaxis_title="Treatment Time (minutes)",
+        yaxis=dict(
+            title="Net Pressure (psi)",
+            gridcolor='rgba(200,200,200,0.3)'
+        ),
+        yaxis2=dict(
+            title="Pressure Derivative (psi/min)",
+            overlaying='y',
+            side='right',
+            gridcolor='rgba(200,200,200,0.2)'
+        ),
+        height=450,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig_pressure
+
+
+def microseismic_rate_figure(time, microseismic_rate):
+    """Event rate and cumulative events"""
+    fig_micro = go.Figure()
+    fig_micro.add_trace(go.Scatter(
+        x=time,
+        y=microseismic_rate,
+        name='Event Rate',
+        line=dict(color='#1f77b4', width=2),
+        mode='lines'
+    ))
+
+    fig_micro.add_trace(go.Scatter(
+        x=time,
+        y=np.cumsum(microseismic_rate) / 10,
+        name='Cumulative Events',
+        line=dict(color='#2ca02c', width=2),
+        mode='lines',
+        yaxis='y2'
+    ))
+
+    fig_micro.update_layout(
+        title="Microseismic Monitoring",
+        yaxis=dict(title="Event Rate (events/min)"),
+        yaxis2=dict(
+            title="Cumulative Events",
+            overlaying='y',
+            side='right'
+        ),
+        height=400
+    )
+    return fig_micro
+
+
+def b_value_figure(history):
+    """Rolling Gutenberg-Richter b-value and Mc"""
+    fig_bvalue = go.Figure()
+    fig_bvalue.add_trace(go.Scatter(
+        x=history['Time (min)'],
+        y=history['b-value'],
+        name='Rolling b-value',
+        line=dict(color='#8B0000', width=2),
+        mode='lines'
+    ))
+
+    fig_bvalue.add_trace(go.Scatter(
+        x=history['Time (min)'],
+        y=history['Mc'],
+        name='Mc',
+        line=dict(color='#6c757d', width=1, dash='dot'),
+        mode='lines',
+        yaxis='y2'
+    ))
+
+    fig_bvalue.add_hline(y=1.0, line_dash="dash", line_color="gray",
+                         annotation_text="b = 1 (tectonic)")
+
+    fig_bvalue.update_layout(
+        title="Gutenberg-Richter b-value Drift (rolling 200 events)",
+        xaxis_title="Time (min)",
+        yaxis=dict(title="b-value"),
+        yaxis2=dict(
+            title="Mc",
+            overlaying='y',
+            side='right'
+        ),
+        height=300
+    )
+    return fig_bvalue
+
+
+# ==================== FRACTURE FIGURES ====================
+CAMERA_EYES = {
+    "Standard": dict(x=1.5, y=1.5, z=1),
+    "Top Down": dict(x=0, y=0, z=2.5),
+    "Side View": dict(x=0, y=2.5, z=0),
+    "Isometric": dict(x=1.25, y=1.25, z=1.25)
+}
+WIDTH_EXAGGERATION = 10  # main fracture width on the 3D scene's offset axis
+
+
+def fracture_geometry_figure(frac_half_length, frac_width, proppant_conc, n_points=50):
+    """Width, proppant and stress-shadow profiles along the fracture half-length"""
+    fig_geo = go.Figure()
+
+    # Create realistic fracture profile
+    x_profile = np.linspace(0, frac_half_length, n_points)
+    width_profile = frac_width * (1 - (x_profile/frac_half_length)**2)**0.5
+
+    # Main fracture body
+    fig_geo.add_trace(go.Scatter(
+        x=x_profile,
+        y=width_profile/12,  # Convert inches to feet
+        name='Fracture Width',
+        fill='tozeroy',
+        fillcolor='rgba(0, 100, 255, 0.3)',
+        line=dict(color='#0064FF', width=3),
+        mode='lines'
+    ))
+
+    # Add proppant distribution
+    proppant_profile = width_profile * (proppant_conc/2) * (1 - x_profile/frac_half_length)
+    fig_geo.add_trace(go.Scatter(
+        x=x_profile,
+        y=proppant_profile/24,
+        name='Proppant Concentration',
+        line=dict(color='#FF4500', width=2, dash='dash'),
+        fill='tozeroy',
+        fillcolor='rgba(255, 69, 0, 0.2)',
+        mode='lines'
+    ))
+
+    # Stress shadow effect
+    stress_shadow = 0.3 * frac_width/12 * np.exp(-x_profile/(frac_half_length*0.3))
+    fig_geo.add_trace(go.Scatter(
+        x=x_profile,
+        y=-stress_shadow,
+        name='Stress Shadow',
+        line=dict(color='#8B0000', width=2, dash='dot'),
+        fill='tozeroy',
+        fillcolor='rgba(139, 0, 0, 0.1)',
+        mode='lines'
+    ))
+
+    fig_geo.update_layout(
+        title={
+            'text': f"FRACTURE GEOMETRY PROFILE - Half Length: {frac_half_length:.0f} ft",
+            'font': {'size': 16, 'color': '#2C3E50'}
+        },
+        xaxis_title="Distance from Wellbore (ft)",
+        yaxis_title="Width (ft)",
+        height=350,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        ),
+        plot_bgcolor='rgba(240, 240, 240, 0.8)',
+        paper_bgcolor='white'
+    )
+    return fig_geo
+
+
+def fracture_network_figure(frac_half_length, frac_height, frac_width, dfn=None, connected=None,
+                            proppant_map=None, camera_eye=None, n_points=50):
+    """3D scene of the main fracture, natural fractures (``dfn``) and proppant (``proppant_map``).
+
+    ``connected`` colours the natural fractures linked to the main fracture;
+    ``dfn`` and ``proppant_map`` are left out of the scene when None.
+    """
+    # Main fracture plane
+    x_main = np.linspace(-frac_half_length, frac_half_length, n_points)
+    z_main = np.linspace(-frac_height/2, frac_height/2, n_points)
+    X_main, Z_main = np.meshgrid(x_main, z_main)
+
+    # Realistic fracture width profile (elliptical with stress shadows), in inches; drawn in
+    # feet like the other axes, exaggerated so that it shows next to the natural fractures
+    width_main = frac_width * np.sqrt(1 - (X_main/frac_half_length)**2 - (Z_main/frac_height)**2)
+    Y_main = width_main / 12 * WIDTH_EXAGGERATION
+
+    # Create 3D visualization
+    fig_3d = go.Figure()
+
+    # Main hydraulic fracture
+    fig_3d.add_trace(go.Surface(
+        x=X_main,
+        y=Y_main,
+        z=Z_main,
+        colorscale=[
+            [0, 'rgba(0, 100, 255, 0.1)'],
+            [0.5, 'rgba(0, 100, 255, 0.5)'],
+            [1, 'rgba(0, 100, 255, 0.8)']
+        ],
+        opacity=0.9,
+        contours={
+            "z": {"show": True, "usecolormap": True, "highlightcolor": "white"},
+            "x": {"show": True, "highlightcolor": "white"}
+        },
+        name=f'Main Fracture (width ×{WIDTH_EXAGGERATION})',
+        showscale=False,
+        customdata=width_main,
+        hovertemplate='<b>Main Fracture</b><br>Width: %{customdata:.3f} in<extra></extra>'
+    ))
+
+    # Natural fractures merged into a single mesh trace
+    if dfn is not None:
+        fig_3d.add_trace(go.Mesh3d(
+            **dfn_mesh(dfn, values=connected),
+            intensitymode='vertex',
+            cmin=0,
+            cmax=1,
+            colorscale=[
+                [0, 'rgb(160, 160, 160)'],
+                [1, 'rgb(255, 69, 0)']
+            ],
+            opacity=0.3,
+            flatshading=True,
+            showscale=False,
+            showlegend=True,
+            name=f'Natural Fractures ({len(dfn):,})',
+            hovertemplate='<b>Natural Fracture</b><br>Connected: %{intensity:.0f}<extra></extra>'
+        ))
+
+    # Add wellbore
+    wellbore_depth = np.linspace(5000 - frac_height/2, 5000 + frac_height/2, 100)
+    fig_3d.add_trace(go.Scatter3d(
+        x=np.zeros(100),
+        y=np.zeros(100),
+        z=wellbore_depth - 5000,  # Center at 0
+        mode='lines',
+        line=dict(color='black', width=6),
+        name='Wellbore',
+        hovertemplate='<b>Wellbore</b><extra></extra>'
+    ))
+
+    # Add proppant distribution (binned areal concentration, both wings)
+    if proppant_map is not None:
+        prop_z, prop_x = np.nonzero(proppant_map['concentration'])
+        prop_conc = proppant_map['concentration'][prop_z, prop_x]
+
+        fig_3d.add_trace(go.Scatter3d(
+            x=np.concatenate([proppant_map['x'][prop_x], -proppant_map['x'][prop_x]]),
+            y=np.zeros(2 * len(prop_x)),
+            z=np.concatenate([proppant_map['z'][prop_z], proppant_map['z'][prop_z]]),
+            mode='markers',
+            marker=dict(
+                size=4,
+                symbol='square',
+                color=np.concatenate([prop_conc, prop_conc]),
+                colorscale='YlOrBr',
+                opacity=0.7
+            ),
+            name='Proppant',
+            hovertemplate='<b>Proppant</b><br>%{marker.color:.2f} lb/ft²<extra></extra>'
+        ))
+
+    fig_3d.update_layout(
+        title={
+            'text': "3D FRACTURE NETWORK SIMULATION",
+            'font': {'size': 18, 'color': '#2C3E50', 'family': 'Arial'}
+        },
+        scene=dict(
+            xaxis=dict(
+                title='Distance from Well (ft)',
+                gridcolor='rgba(200,200,200,0.5)',
+                backgroundcolor='rgba(240, 240, 240, 0.8)'
+            ),
+            yaxis=dict(
+                title='Offset Normal to Fracture (ft)',
+                gridcolor='rgba(200,200,200,0.5)',
+                backgroundcolor='rgba(240, 240, 240, 0.8)'
+            ),
+            zaxis=dict(
+                title='Depth (ft)',
+                gridcolor='rgba(200,200,200,0.5)',
+                backgroundcolor='rgba(240, 240, 240, 0.8)'
+            ),
+            aspectratio=dict(x=2, y=0.3, z=1),
+            camera=dict(
+                eye=camera_eye or CAMERA_EYES['Standard'],
+                up=dict(x=0, y=0, z=1)
+            )
+        ),
+        height=700,
+        margin=dict(l=0, r=0, t=40, b=0),
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
+        )
+    )
+    return fig_3d
+
+
+# ==================== RISK FIGURES ====================
+def risk_timeline_figure(time, risk_series, first_trigger):
+    """Risk scores over the treatment with first-trigger markers"""
+    fig_risk_timeline = go.Figure()
+
+    for key, label, color in [
+        ('closure', 'Early Closure', '#ef4444'),
+        ('screenout', 'Screenout', '#f97316'),
+        ('height_growth', 'Height Growth', '#3b82f6')
+    ]:
+        fig_risk_timeline.add_trace(go.Scatter(
+            x=time,
+            y=risk_series[key],
+            name=label,
+            line=dict(color=color, width=2, shape='hv'),
+            mode='lines'
+        ))
+
+    for key, label, color in [
+        ('closure', 'Closure', '#ef4444'),
+        ('screenout', 'Screenout', '#f97316'),
+        ('height_growth', 'Height', '#3b82f6')
+    ]:
+        trigger_time = first_trigger[key]
+        if np.isfinite(trigger_time):
+            fig_risk_timeline.add_vline(
+                x=trigger_time,
+                line_dash="dot",
+                line_color=color,
+                annotation_text=f"{label} @ {trigger_time:.1f} min"
+            )
+
+    fig_risk_timeline.update_layout(
+        title="<b>RISK SCORE TIMELINE</b>",
+        xaxis_title="Treatment Time (minutes)",
+        yaxis=dict(title="Risk Score (%)", range=[0, 100]),
+        height=350,
+        hovermode='x unified',
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig_risk_timeline
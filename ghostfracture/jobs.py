@@ -0,0 +1,151 @@
+"""Background analysis jobs.
+
+``JobRunner`` executes long analyses on a thread pool. Every job gets an
+ID, reports progress and can be cancelled between steps. Jobs are keyed by
+a hash of the function, its code version (including the current risk
+rules) and its parameters, so an identical request from any session
+attaches to the running job or reuses the finished result instead of
+computing it again.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ghostfracture.diskcache import code_version
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+def params_key(func, params):
+    """Stable hash of a job function, its code version and its parameters"""
+    payload = json.dumps([func.__module__, func.__qualname__, code_version(func), params], sort_keys=True,
+                         default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Job:
+    """State of one submitted job"""
+
+    def __init__(self, key, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.params = params
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.submitted
+
+    def report(self, fraction, message=""):
+        """Progress callback handed to the job function; raises once cancelled"""
+        if self._cancel.is_set():
+            raise JobCancelled
+        self.progress = float(fraction)
+        self.message = message
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == QUEUED:
+            self.status, self.message = CANCELLED, "Cancelled"
+            self.finished = time.time()
+
+
+class JobRunner:
+    """Thread-pool job runner with parameter-hash result reuse"""
+
+    def __init__(self, max_workers=2, max_jobs=256):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ghostfracture-job")
+        self._jobs = OrderedDict()
+        self._by_key = {}
+        self._lock = threading.Lock()
+        self.reused = 0
+
+    def submit(self, func, **params):
+        """Run ``func(**params, progress=...)`` in the background and return its Job.
+
+        An active or finished job with the same parameters is returned
+        as-is; failed and cancelled jobs are resubmitted.
+        """
+        key = params_key(func, params)
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing is not None and existing.status in (QUEUED, RUNNING, DONE):
+                self.reused += 1
+                self._jobs.move_to_end(existing.id)
+                return existing
+            job = Job(key, params)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            self._evict()
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _evict(self):
+        while len(self._jobs) > self.max_jobs:
+            for job_id, job in self._jobs.items():
+                if not job.active:
+                    del self._jobs[job_id]
+                    if self._by_key.get(job.key) == job_id:
+                        del self._by_key[job.key]
+                    break
+            else:
+                return
+
+    def _run(self, job, func):
+        if job.status == CANCELLED:
+            return
+        job.status = RUNNING
+        try:
+            job.result = func(**job.params, progress=job.report)
+            job.status, job.message = DONE, "Complete"
+        except JobCancelled:
+            job.status, job.message = CANCELLED, "Cancelled"
+        except Exception as exc:
+            job.status, job.error, job.message = FAILED, exc, f"Failed: {exc}"
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self):
+        """Number of remembered jobs per status, plus parameter-hash reuses"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        counts = {status: statuses.count(status) for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+        return {**counts, 'reused': self.reused}
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,298 @@
+"""Process-wide runtime metrics in the Prometheus text exposition format.
+
+A ``Registry`` holds counters, gauges and histograms (optionally labelled)
+plus collector callbacks evaluated at scrape time for values that live
+elsewhere (cache sizes, job queues, stream lag). ``MetricsServer`` serves
+``GET /metrics`` from a daemon thread. The dashboard reads the same
+objects for its support panel, so the numbers on screen are the scraped ones.
+"""
+import bisect
+import math
+import os
+import resource
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROCESS_START = time.time()
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def inc(self, value=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, value=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with ``quantile`` estimates for the dashboard"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def _merged(self, labels):
+        """Bucket counts and sum over every label set matching ``labels``"""
+        counts, total = [0] * (len(self.buckets) + 1), 0.0
+        with self._lock:
+            for key, (key_counts, key_total) in self._values.items():
+                if all(key[self.labelnames.index(k)] == str(v) for k, v in labels.items()):
+                    counts = [a + b for a, b in zip(counts, key_counts)]
+                    total += key_total
+        return counts, total
+
+    def count(self, **labels):
+        return sum(self._merged(labels)[0])
+
+    def mean(self, **labels):
+        counts, total = self._merged(labels)
+        return total / sum(counts) if sum(counts) else math.nan
+
+    def quantile(self, q, **labels):
+        """Linear interpolation within buckets, as PromQL's histogram_quantile"""
+        counts, _ = self._merged(labels)
+        n = sum(counts)
+        if not n:
+            return math.nan
+        rank, seen, lower = q * n, 0, 0.0
+        for upper, count in zip(self.buckets + (math.inf,), counts):
+            if seen + count >= rank and count:
+                if math.isinf(upper):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return lower
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for upper, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _labels(self.labelnames + ("le",), key + (_number(float(upper)),))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class _Collected(_Metric):
+    """Metric whose samples come from a callback at scrape time"""
+
+    def __init__(self, name, help, kind, func, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.func = func
+
+    def values(self):
+        """{label values tuple: value}; a plain number means no labels"""
+        value = self.func()
+        return value if isinstance(value, dict) else {(): value}
+
+    def samples(self):
+        return [f"{self.name}{_labels(self.labelnames, key if isinstance(key, tuple) else (key,))} {_number(v)}"
+                for key, v in self.values().items() if v is not None]
+
+
+class Registry:
+    """Named metrics rendered together in the text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collect(self, name, help, func, kind="gauge", labelnames=()):
+        """Register ``func()`` as a gauge/counter read at scrape time"""
+        return self._add(_Collected(name, help, kind, func, labelnames))
+
+    def get(self, name):
+        return self._metrics[name]
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception as exc:  # a failing collector must not break the scrape
+                lines.append(f"# {metric.name} collection failed: {_escape(exc)}")
+                continue
+            lines.extend(metric.header() + samples)
+        return "\n".join(lines) + "\n"
+
+
+class ActivityWindow:
+    """Distinct keys (e.g. session IDs) seen within the last ``window`` seconds"""
+
+    def __init__(self, window=300.0):
+        self.window = window
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def touch(self, key):
+        with self._lock:
+            self._seen[key] = time.monotonic()
+
+    def active(self):
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            self._seen = {key: seen for key, seen in self._seen.items() if seen >= cutoff}
+            return len(self._seen)
+
+
+# ==================== PROCESS METRICS ====================
+def resident_memory_bytes():
+    """Current RSS (Linux /proc), else the peak RSS reported by getrusage"""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def add_process_metrics(registry):
+    registry.collect("process_resident_memory_bytes", "Resident memory size in bytes.", resident_memory_bytes)
+    registry.collect("process_cpu_seconds_total", "Total user and system CPU time in seconds.",
+                     lambda: sum(os.times()[:2]), kind="counter")
+    registry.collect("process_start_time_seconds", "Start time of the process since the Unix epoch.",
+                     lambda: PROCESS_START)
+    registry.collect("process_uptime_seconds", "Seconds since the process started.",
+                     lambda: time.time() - PROCESS_START)
+    return registry
+
+
+# ==================== HTTP ====================
+class MetricsServer:
+    """Serves ``GET /metrics`` for one registry on a daemon thread"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9464):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ghostfracture-metrics",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
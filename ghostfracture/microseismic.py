@@ -0,0 +1,56 @@
+"""Synthetic microseismic event catalogs for a fracturing stage."""
+import numpy as np
+import pandas as pd
+
+CATALOG_COLUMNS = ['Time (min)', 'X', 'Y', 'Z', 'Magnitude', 'Stage']
+
+
+def generate_event_catalog(time, microseismic_rate, frac_half_length, frac_height,
+                           stress_shadow_index, stage=1, n_events=None, b_value=1.0,
+                           mc=-1.8, seed=None):
+    """Generate a located, magnitude-tagged event catalog for one stage.
+
+    Event times follow the simulated microseismic rate, the cloud grows away
+    from the wellbore with the square root of treatment time, and magnitudes
+    follow Gutenberg-Richter with a logistic detection roll-off around ``mc``.
+    ``n_events`` overrides the detected event count (default: integrated rate).
+    Coordinates use the 3D view convention: X along the fracture, Y normal to
+    it and Z depth relative to the perforations (all in ft).
+    """
+    rng = np.random.default_rng(seed)
+    time = np.asarray(time, dtype=float)
+    rate = np.clip(np.asarray(microseismic_rate, dtype=float), 0, None)
+
+    # Expected event count is the integrated rate (events/min over minutes)
+    if n_events is None:
+        n_events = int(rng.poisson(np.trapezoid(rate, time)))
+    if n_events == 0:
+        return pd.DataFrame(columns=CATALOG_COLUMNS)
+
+    # Gutenberg-Richter magnitudes thinned by a detection curve centred on Mc;
+    # oversample so roughly n_events survive detection
+    m_min = mc - 0.6
+    n_candidates = int(n_events * 10 ** (b_value * (mc - m_min)) * 1.2) + 10
+    magnitude = m_min + rng.exponential(np.log10(np.e) / b_value, n_candidates)
+    detected = rng.uniform(size=n_candidates) < 1 / (1 + np.exp(-(magnitude - mc) / 0.15))
+    magnitude = magnitude[detected][:n_events]
+    n_events = len(magnitude)
+
+    # Inverse-CDF sampling of event times from the rate curve
+    cum = np.concatenate([[0.0], np.cumsum(0.5 * (rate[1:] + rate[:-1]) * np.diff(time))])
+    t = np.sort(np.interp(rng.uniform(0, cum[-1], n_events), cum, time))
+
+    # Cloud grows with sqrt(t); stress shadowing widens the stimulated zone
+    growth = np.sqrt(np.clip(t / max(time[-1], 1e-9), 0.05, 1.0))
+    x = frac_half_length * growth * rng.uniform(-1, 1, n_events)
+    y = rng.normal(0, 15 + 60 * stress_shadow_index, n_events) * growth
+    z = np.clip(rng.normal(0, frac_height / 4, n_events), -0.6 * frac_height, 0.6 * frac_height)
+
+    return pd.DataFrame({
+        'Time (min)': t,
+        'X': x,
+        'Y': y,
+        'Z': z,
+        'Magnitude': magnitude,
+        'Stage': np.full(n_events, stage, dtype=int)
+    })
@@ -0,0 +1,48 @@
+"""FracGuard risk rules evaluated over whole treatment series.
+
+The rules themselves are declared in fracguard_rules.toml and compiled by
+``ghostfracture.rules``; this module wires the dashboard's simulation
+outputs into them. Series may carry leading batch axes (stages, wells ×
+stages) with time on the last axis; scalar design parameters broadcast,
+per-stage parameters are given as arrays of the batch shape.
+"""
+import numpy as np
+
+from ghostfracture.rules import load_rules
+
+
+def risk_timeline(net_pressure, microseismic_rate, pressure_slope, sigma_hmin,
+                  stress_contrast, proppant_loading, rules=None):
+    """Risk scores (0-100) at every time step, keyed by rule name.
+
+    With the default rules the keys are 'closure', 'height_growth' and
+    'screenout'; each array is shaped like ``net_pressure``.
+    """
+    rules = rules or load_rules()
+    return rules.evaluate(
+        series={
+            'net_pressure': net_pressure,
+            'microseismic_rate': microseismic_rate,
+            'pressure_slope': pressure_slope
+        },
+        parameters={
+            'sigma_hmin': sigma_hmin,
+            'stress_contrast': stress_contrast,
+            'proppant_loading': proppant_loading
+        }
+    )
+
+
+def first_trigger(time, triggered):
+    """Time of the first True along the last axis (NaN if never triggered)"""
+    triggered = np.asarray(triggered, dtype=bool)
+    time = np.broadcast_to(np.asarray(time, dtype=float), triggered.shape)
+    idx = np.argmax(triggered, axis=-1)
+    first = np.take_along_axis(time, idx[..., None], axis=-1)[..., 0]
+    return np.where(triggered.any(axis=-1), first, np.nan)[()]
+
+
+def risk_triggers(time, timeline, rules=None):
+    """First-trigger time of every rule's alarm state (NaN if never)"""
+    rules = rules or load_rules()
+    return {name: first_trigger(time, alarm) for name, alarm in rules.triggered(timeline).items()}
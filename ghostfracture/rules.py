@@ -0,0 +1,225 @@
+"""Declarative risk-rule engine.
+
+Rules live in a TOML file (see fracguard_rules.toml) and are compiled once
+into restricted Python expressions over NumPy arrays. Evaluation is then a
+handful of array operations regardless of whether the inputs hold one
+stage, a pad of stages or thousands of wells × stages, because series keep
+time on the last axis and per-stage parameters broadcast against them.
+"""
+import ast
+import logging
+import os
+
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "fracguard_rules.toml")
+LOW = "low"  # level of a score that meets none of its risk's level conditions
+
+logger = logging.getLogger(__name__)
+
+_FUNCTIONS = {
+    'initial': lambda x: np.asarray(x)[..., :1],
+    'minimum': np.minimum,
+    'maximum': np.maximum,
+    'clip': np.clip,
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'log10': np.log10,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.Compare,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.Call, ast.Name, ast.Load,
+    ast.Constant,
+)
+
+
+class RuleError(ValueError):
+    """Raised when a rule file or expression is invalid"""
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite boolean logic into element-wise NumPy operators"""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.Call(func=ast.Name(id='_logical_not', ctx=ast.Load()),
+                            args=[node.operand], keywords=[])
+        return node
+
+    def visit_Compare(self, node):
+        # a < b < c  ->  (a < b) & (b < c)
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        operands = [node.left] + node.comparators
+        parts = [ast.Compare(left=operands[k], ops=[op], comparators=[operands[k + 1]])
+                 for k, op in enumerate(node.ops)]
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+def compile_expression(source, names):
+    """Compile a rule expression into a code object over the given names"""
+    try:
+        tree = ast.parse(str(source), mode='eval')
+    except SyntaxError as exc:
+        raise RuleError(f"Invalid rule expression {source!r}: {exc.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleError(f"Unsupported syntax {type(node).__name__} in {source!r}")
+        if isinstance(node, ast.Name) and node.id not in names and node.id not in _FUNCTIONS:
+            raise RuleError(f"Unknown name {node.id!r} in {source!r}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name)
+                                               and node.func.id in _FUNCTIONS):
+            raise RuleError(f"Only {sorted(_FUNCTIONS)} may be called in {source!r}")
+    tree = ast.fix_missing_locations(_Vectorize().visit(tree))
+    return compile(tree, f"<rule {source}>", 'eval')
+
+
+def _evaluate(code, namespace):
+    return eval(code, {'__builtins__': {}, '_logical_not': np.logical_not}, namespace)
+
+
+class RuleSet:
+    """A compiled set of risk rules"""
+
+    def __init__(self, spec, source="<rules>"):
+        self.source = source
+        self.series = list(spec.get('series', []))
+        self.parameters = list(spec.get('parameters', []))
+        names = set(self.series) | set(self.parameters)
+        self.risks = []
+        for risk in spec.get('risk', []):
+            if 'name' not in risk:
+                raise RuleError(f"{source}: every [[risk]] needs a name")
+            if any('when' not in case or 'score' not in case for case in risk.get('cases', [])):
+                raise RuleError(f"{source}: every case of {risk['name']!r} needs 'when' and 'score'")
+            self.risks.append({
+                'name': risk['name'],
+                'label': risk.get('label', risk['name']),
+                'cases': [(compile_expression(case['when'], names),
+                           compile_expression(case['score'], names))
+                          for case in risk.get('cases', [])],
+                'default': compile_expression(risk.get('default', '0'), names),
+                'cap': risk.get('cap'),
+                'trigger': (compile_expression(risk['trigger'], {'score'})
+                            if 'trigger' in risk else None),
+                'levels': [(level, compile_expression(when, {'score'}))
+                           for level, when in dict(risk.get('levels', {})).items()]
+            })
+
+    @classmethod
+    def from_file(cls, path):
+        try:
+            with open(path, 'rb') as fh:
+                spec = tomllib.load(fh)
+        except tomllib.TOMLDecodeError as exc:
+            raise RuleError(f"{path}: {exc}") from None
+        return cls(spec, source=path)
+
+    @property
+    def names(self):
+        return [risk['name'] for risk in self.risks]
+
+    def _namespace(self, series, parameters):
+        namespace = dict(_FUNCTIONS)
+        missing = [n for n in self.series + self.parameters if n not in series and n not in parameters]
+        if missing:
+            raise RuleError(f"Missing rule inputs: {missing}")
+        for name in self.series:
+            namespace[name] = np.asarray(series[name], dtype=float)
+        for name in self.parameters:
+            value = np.asarray(parameters[name], dtype=float)
+            namespace[name] = value[..., None] if value.ndim else value
+        return namespace
+
+    def evaluate(self, series, parameters):
+        """Score series for every risk: {name: array shaped like the series}.
+
+        ``series`` maps series names to arrays (..., time); ``parameters``
+        maps parameter names to scalars or arrays of the batch shape.
+        """
+        namespace = self._namespace(series, parameters)
+        shape = np.broadcast_shapes(*(np.shape(namespace[n]) for n in self.series + self.parameters))
+        scores = {}
+        for risk in self.risks:
+            conditions = [np.broadcast_to(_evaluate(when, namespace), shape) for when, _ in risk['cases']]
+            choices = [np.broadcast_to(_evaluate(score, namespace), shape) for _, score in risk['cases']]
+            default = np.broadcast_to(_evaluate(risk['default'], namespace), shape)
+            score = np.select(conditions, choices, default=default).astype(float)
+            if risk['cap'] is not None:
+                score = np.minimum(score, risk['cap'])
+            scores[risk['name']] = score
+        return scores
+
+    def triggered(self, scores):
+        """Boolean alarm series for every risk that declares a trigger"""
+        alarms = {}
+        for risk in self.risks:
+            if risk['trigger'] is not None:
+                namespace = dict(_FUNCTIONS, score=scores[risk['name']])
+                alarms[risk['name']] = np.asarray(_evaluate(risk['trigger'], namespace), dtype=bool)
+        return alarms
+
+    def level(self, name, score):
+        """Level name ('high', 'medium', ... or 'low') of a risk's score; arrays give arrays"""
+        risk = self.risks[self.names.index(name)]
+        namespace = dict(_FUNCTIONS, score=np.asarray(score, dtype=float))
+        if not risk['levels']:
+            return np.full(np.shape(score), LOW)[()]
+        conditions = [np.asarray(_evaluate(when, namespace), dtype=bool) for _, when in risk['levels']]
+        return np.select(conditions, [level for level, _ in risk['levels']], default=LOW)[()]
+
+
+_cache = {}  # path -> (mtime, last RuleSet that compiled, error of the current file or None)
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """Compiled rules for ``path``, recompiled whenever the file changes.
+
+    The file's modification time is checked on every call, so edits are
+    picked up on the next rerun without restarting the server. If an edit
+    breaks the file, the last good rules stay in use and ``rules_error``
+    reports the problem until the file is fixed.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError as exc:
+        mtime, error = None, exc
+    cached = _cache.get(path)
+    if cached is None or cached[0] != mtime:
+        try:
+            if mtime is None:
+                raise error
+            cached = (mtime, RuleSet.from_file(path), None)
+        except Exception as exc:
+            if cached is None:
+                raise
+            logger.error("Keeping the last good rules; %s failed to load: %s", path, exc)
+            cached = (mtime, cached[1], exc)
+        _cache[path] = cached
+    return cached[1]
+
+
+def rules_error(path=DEFAULT_RULES_PATH):
+    """Why the current rule file is not in use (None while it loads cleanly)"""
+    cached = _cache.get(path)
+    return cached[2] if cached is not None else None
@@ -0,0 +1,142 @@
+"""Streaming Gutenberg-Richter statistics for microseismic catalogs.
+
+Magnitudes are kept as fixed-width histograms per stage, so the magnitude of
+completeness (maximum curvature) and the Aki-Utsu maximum-likelihood b-value
+are computed from O(bins) sums rather than by refitting the catalog.
+"""
+import numpy as np
+import pandas as pd
+
+LOG10_E = np.log10(np.e)
+
+
+def gr_from_histogram(counts, centers, dm, mc_correction=0.2, min_events=50):
+    """b-value, Mc and event count above Mc from magnitude histograms.
+
+    ``counts`` may be one histogram (bins,) or a stack of them (rows, bins);
+    all rows are evaluated at once. Mc is the maximum-curvature bin plus
+    ``mc_correction``; rows with fewer than ``min_events`` events above Mc
+    get a NaN b-value.
+    """
+    counts = np.atleast_2d(counts).astype(float)
+    shift = int(round(mc_correction / dm))
+    mc_idx = np.minimum(np.argmax(counts, axis=1) + shift, counts.shape[1] - 1)
+    mc = centers[mc_idx]
+
+    above = np.arange(counts.shape[1])[None, :] >= mc_idx[:, None]
+    n = (counts * above).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_m = (counts * above * centers[None, :]).sum(axis=1) / n
+        b = LOG10_E / (mean_m - (mc - dm / 2))
+    b[n < min_events] = np.nan
+    return b, mc, n
+
+
+class GutenbergRichterTracker:
+    """Per-stage magnitude histograms with a rolling b-value/Mc series.
+
+    Every event updates a sliding window of the last ``window`` events; the
+    window histogram after each event is a difference of cumulative bin
+    counts, so a batch of n events costs O(n * bins) and never touches
+    earlier events beyond the window tail.
+    """
+
+    def __init__(self, window=200, dm=0.1, m_range=(-4.0, 4.0), mc_correction=0.2,
+                 min_events=50, chunk_size=4096):
+        self.window = int(window)
+        self.dm = float(dm)
+        self.edges = np.arange(m_range[0], m_range[1] + dm / 2, dm)
+        self.centers = self.edges[:-1] + dm / 2
+        self.mc_correction = mc_correction
+        self.min_events = min_events
+        self.chunk_size = chunk_size
+        self._stages = {}
+
+    def _state(self, stage):
+        if stage not in self._stages:
+            self._stages[stage] = {
+                'hist': np.zeros(len(self.centers), dtype=np.int64),
+                'tail': np.empty(0, dtype=np.int64),
+                'time': [], 'b': [], 'mc': [], 'n': []
+            }
+        return self._stages[stage]
+
+    def _bin(self, magnitudes):
+        idx = np.floor((np.asarray(magnitudes, dtype=float) - self.edges[0]) / self.dm)
+        return np.clip(idx, 0, len(self.centers) - 1).astype(np.int64)
+
+    def add_events(self, stage, times, magnitudes):
+        """Add time-ordered events and extend the stage's rolling series"""
+        times = np.asarray(times, dtype=float)
+        bins = self._bin(magnitudes)
+        state = self._state(stage)
+        state['hist'] += np.bincount(bins, minlength=len(self.centers))
+
+        for start in range(0, len(bins), self.chunk_size):
+            chunk = bins[start:start + self.chunk_size]
+            seq = np.concatenate([state['tail'], chunk])
+            onehot = np.zeros((len(seq) + 1, len(self.centers)), dtype=np.int32)
+            onehot[np.arange(1, len(seq) + 1), seq] = 1
+            cum = np.cumsum(onehot, axis=0)
+
+            # Window histogram ending at each new event
+            end = np.arange(len(state['tail']) + 1, len(seq) + 1)
+            windows = cum[end] - cum[np.maximum(end - self.window, 0)]
+            b, mc, n = gr_from_histogram(windows, self.centers, self.dm,
+                                         self.mc_correction, self.min_events)
+
+            state['time'].append(times[start:start + len(chunk)])
+            state['b'].append(b)
+            state['mc'].append(mc)
+            state['n'].append(n)
+            state['tail'] = seq[-self.window:]
+
+    def add_catalog(self, catalog):
+        """Add a catalog with 'Time (min)', 'Magnitude' and 'Stage' columns"""
+        for stage, events in catalog.sort_values('Time (min)').groupby('Stage'):
+            self.add_events(stage, events['Time (min)'].to_numpy(), events['Magnitude'].to_numpy())
+
+    def stages(self):
+        return sorted(self._stages)
+
+    def histogram(self, stage):
+        """Whole-catalog magnitude histogram of a stage (bin centres, counts)"""
+        state = self._stages.get(stage)
+        return self.centers, (state['hist'].copy() if state is not None
+                              else np.zeros(len(self.centers), dtype=np.int64))
+
+    def catalog_estimate(self, stage):
+        """(b-value, Mc, events above Mc) over every event seen for a stage; NaNs without events"""
+        state = self._stages.get(stage)
+        if state is None or not state['hist'].any():
+            return np.nan, np.nan, 0
+        b, mc, n = gr_from_histogram(state['hist'], self.centers, self.dm,
+                                     self.mc_correction, self.min_events)
+        return float(b[0]), float(mc[0]), int(n[0])
+
+    def history(self, stage):
+        """Rolling b-value and Mc after every event of a stage"""
+        state = self._stages.get(stage)
+        if state is None or not state['time']:
+            return pd.DataFrame(columns=['Time (min)', 'b-value', 'Mc', 'Events ≥ Mc'])
+        return pd.DataFrame({
+            'Time (min)': np.concatenate(state['time']),
+            'b-value': np.concatenate(state['b']),
+            'Mc': np.concatenate(state['mc']),
+            'Events ≥ Mc': np.concatenate(state['n']).astype(int)
+        })
+
+    def summary(self):
+        """Per-stage table of catalog b-value, Mc and the latest rolling b"""
+        rows = []
+        for stage in self.stages():
+            b, mc, n = self.catalog_estimate(stage)
+            state = self._stages[stage]
+            rows.append({
+                'Stage': stage,
+                'Events': int(state['hist'].sum()),
+                'Mc': mc,
+                'b-value': b,
+                'Rolling b-value': float(state['b'][-1][-1]) if state['b'] else np.nan
+            })
+        return pd.DataFrame(rows)
@@ -0,0 +1,354 @@
+"""Local HTTP batch service for petrophysics, geomechanics and stage simulation.
+
+    python -m ghostfracture serve --port 8765 --workers 4
+
+    POST /v1/petrophysics   curves RHOB, NPHI, LLD, GR -> PHID, PHIND, SW, SH, VSH, PHIE, PERM
+    POST /v1/geomechanics   curves Depth, DT, RHOB [, DTS] -> EDYN, PRDYN, BI, OBG, PPG, FG
+    POST /v1/simulate       stage parameter sets -> geometry and end-of-stage risk
+    GET  /v1/health         worker count and coalescing counters
+
+Bodies are either JSON or a NumPy ``.npz`` archive (``Content-Type:
+application/x-npz``); the response uses the request's format.
+
+* Log endpoints take one array per curve: 1-D for a single well, 2-D
+  (wells x samples) for a batch. JSON: ``{"curves": {"GR": [...], ...}}``.
+* ``/v1/simulate`` takes one 1-D array per stage input (length = number of
+  stages; omitted inputs use the dashboard defaults), or JSON
+  ``{"stages": [{...}, ...]}``. Results come back as one array per column
+  (npz) or ``{"results": [{...}, ...]}``.
+
+Work runs on a process pool in chunks. Requests are coalesced per item
+(stage parameter set or well): an item already being computed or recently
+finished, by this or any concurrent request, is not computed again.
+"""
+import hashlib
+import inspect
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ghostfracture.simulation import DEFAULT_STAGE_PARAMETERS, flatten_summary, stage_summary
+
+NPZ_TYPE = "application/x-npz"
+PETROPHYSICAL_OUTPUTS = ['PHID', 'PHIND', 'SW', 'SH', 'VSH', 'PHIE', 'PERM']
+GEOMECHANICAL_OUTPUTS = ['EDYN', 'PRDYN', 'BI', 'OBG', 'PPG', 'FG']
+STAGE_INPUTS = list(inspect.signature(stage_summary).parameters)
+MAX_BODY_BYTES = 512 * 1024 * 1024
+
+
+class RequestError(ValueError):
+    """Malformed request; reported to the client as HTTP 400"""
+
+
+# ==================== WORKER FUNCTIONS ====================
+# Module-level so the process pool can pickle them; each takes and returns a list.
+def _stage_batch(runs):
+    return [flatten_summary(stage_summary(**run)) for run in runs]
+
+
+def _log_batch(kind, wells):
+    import pandas as pd
+    from ghostfracture.welllogs import calculate_geomechanical_properties, calculate_petrophysical_properties
+
+    calculate, outputs = {
+        'petrophysics': (calculate_petrophysical_properties, PETROPHYSICAL_OUTPUTS),
+        'geomechanics': (calculate_geomechanical_properties, GEOMECHANICAL_OUTPUTS),
+    }[kind]
+    results = []
+    for curves in wells:
+        df = calculate(pd.DataFrame(curves))
+        results.append({name: df[name].to_numpy() for name in outputs})
+    return results
+
+
+def _petrophysics_batch(wells):
+    return _log_batch('petrophysics', wells)
+
+
+def _geomechanics_batch(wells):
+    return _log_batch('geomechanics', wells)
+
+
+# ==================== COALESCING ====================
+class Coalescer:
+    """Runs batch functions on a pool, computing each distinct item once.
+
+    ``evaluate(func, items, keys)`` returns ``func``'s result for every
+    item. Items whose key is already in flight or among the ``max_results``
+    most recent results share that future; the rest are sent to the pool
+    in chunks of ``chunk_size``. Failed items are not remembered.
+    """
+
+    def __init__(self, executor, chunk_size=256, max_results=100_000):
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.max_results = max_results
+        self.computed = 0
+        self.coalesced = 0
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def evaluate(self, func, items, keys):
+        futures = {}
+        todo = []
+        with self._lock:
+            for key, item in zip(keys, items):
+                key = (func.__name__, key)
+                if key in futures:
+                    self.coalesced += 1
+                    continue
+                future = self._futures.get(key)
+                if future is None:
+                    future = self._futures[key] = Future()
+                    todo.append((key, item, future))
+                else:
+                    self._futures.move_to_end(key)
+                    self.coalesced += 1
+                futures[key] = future
+            self.computed += len(todo)
+            while len(self._futures) > self.max_results:
+                self._futures.popitem(last=False)
+        for start in range(0, len(todo), self.chunk_size):
+            chunk = todo[start:start + self.chunk_size]
+            try:
+                batch = self.executor.submit(func, [item for _, item, _ in chunk])
+            except Exception as exc:  # broken or shut-down pool: fail every item not yet submitted
+                self._fail(todo[start:], exc)
+                break
+            batch.add_done_callback(lambda batch, chunk=chunk: self._fan_out(batch, chunk))
+        return [futures[(func.__name__, key)].result() for key in keys]
+
+    def _fail(self, chunk, error):
+        """Forget the chunk's keys and pass ``error`` to everyone waiting on them"""
+        with self._lock:
+            for key, _, future in chunk:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+        for _, _, future in chunk:
+            future.set_exception(error)
+
+    def _fan_out(self, batch, chunk):
+        error = batch.exception()
+        if error is not None:
+            self._fail(chunk, error)
+            return
+        for (_, _, future), result in zip(chunk, batch.result()):
+            future.set_result(result)
+
+    def stats(self):
+        return {'computed': self.computed, 'coalesced': self.coalesced, 'remembered': len(self._futures)}
+
+
+# ==================== PAYLOADS ====================
+def decode_body(body, content_type):
+    """Request body as a dict of arrays (npz) or parsed JSON"""
+    try:
+        if content_type == NPZ_TYPE:
+            with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+                return {name: archive[name] for name in archive.files}
+        return json.loads(body or b"{}")
+    except Exception as exc:
+        raise RequestError(f"Could not decode request body: {exc}") from exc
+
+
+def encode_npz(arrays):
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json_safe(value):
+    """``value`` with NaN and infinite floats (also inside arrays and nested containers) as None"""
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind != 'f':
+            return value.tolist()
+        return np.where(np.isfinite(value), value, None).tolist()
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    return value
+
+
+def _stage_value(name, value):
+    """One stage input cast to its canonical type, so equal runs share a coalescing key"""
+    from ghostfracture.proppant import FLUID_PROPERTIES, PROPPANT_PROPERTIES
+
+    choices = {'fluid_type': FLUID_PROPERTIES, 'proppant_type': PROPPANT_PROPERTIES}
+    if name in choices:
+        if value not in choices[name]:
+            raise RequestError(f"Unknown {name} {value!r}; expected one of {list(choices[name])}")
+        return value
+    if name == 'well_id':
+        if not isinstance(value, str):
+            raise RequestError(f"well_id must be a string, got {value!r}")
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} must be a number, got {value!r}") from None
+    if name == 'stage_num':
+        if not number.is_integer():
+            raise RequestError(f"stage_num must be an integer, got {value!r}")
+        return int(number)
+    return number
+
+
+def stage_runs(payload):
+    """Stage parameter dicts from a decoded /v1/simulate payload, with canonical value types"""
+    if not isinstance(payload, dict):
+        raise RequestError("Request body must be an object of stage input arrays or {\"stages\": [...]}")
+    if 'stages' in payload:
+        runs = payload['stages']
+        if not isinstance(runs, list) or not all(isinstance(run, dict) for run in runs):
+            raise RequestError("'stages' must be a list of parameter objects")
+    else:
+        columns = {name: np.asarray(values).ravel().tolist() for name, values in payload.items()}
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise RequestError(f"Stage input arrays differ in length: {sorted(lengths)}")
+        n = lengths.pop() if lengths else 0
+        runs = [{name: values[i] for name, values in columns.items()} for i in range(n)]
+    defaults = dict(DEFAULT_STAGE_PARAMETERS, well_id="Berkine-12")
+    for run in runs:
+        unknown = set(run) - set(STAGE_INPUTS)
+        if unknown:
+            raise RequestError(f"Unknown stage inputs {sorted(unknown)}; expected {STAGE_INPUTS}")
+    return [{name: _stage_value(name, value) for name, value in {**defaults, **run}.items()} for run in runs]
+
+
+def log_wells(payload):
+    """Per-well curve dicts from a decoded log payload, and whether it was batched"""
+    curves = payload.get('curves', payload) if isinstance(payload, dict) else None
+    if not curves:
+        raise RequestError("No curves in request")
+    curves = {name: np.asarray(values, dtype=float) for name, values in curves.items()}
+    shapes = {values.shape for values in curves.values()}
+    if len(shapes) > 1 or len(shapes.pop()) not in (1, 2):
+        raise RequestError("Curves must all be 1-D (one well) or 2-D (wells x samples) with one shape")
+    batched = next(iter(curves.values())).ndim == 2
+    if not batched:
+        return [curves], False
+    n_wells = next(iter(curves.values())).shape[0]
+    return [{name: values[i] for name, values in curves.items()} for i in range(n_wells)], True
+
+
+def _well_key(curves):
+    digest = hashlib.sha256()
+    for name in sorted(curves):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(curves[name]).tobytes())
+    return digest.hexdigest()
+
+
+# ==================== HTTP ====================
+class BatchHandler(BaseHTTPRequestHandler):
+    """Routes /v1/* requests to the server's coalescer"""
+
+    server_version = "GhostFracture/1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(_json_safe(payload), default=_json_default, allow_nan=False)
+        self._send(status, body.encode(), "application/json")
+
+    def do_GET(self):
+        if self.path.rstrip('/') != "/v1/health":
+            return self._send_json(404, {'error': f"Unknown path {self.path}"})
+        self._send_json(200, {'status': "ok", 'workers': self.server.workers, **self.server.coalescer.stats()})
+
+    def do_POST(self):
+        routes = {
+            "/v1/simulate": self._simulate,
+            "/v1/petrophysics": lambda payload, npz: self._logs(_petrophysics_batch, payload, npz),
+            "/v1/geomechanics": lambda payload, npz: self._logs(_geomechanics_batch, payload, npz),
+        }
+        route = routes.get(self.path.rstrip('/'))
+        if route is None:
+            return self._send_json(404, {'error': f"Unknown path {self.path}"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            return self._send_json(413, {'error': f"Body larger than {MAX_BODY_BYTES} bytes"})
+        npz = self.headers.get("Content-Type", "").split(';')[0].strip() == NPZ_TYPE
+        try:
+            payload = decode_body(self.rfile.read(length), NPZ_TYPE if npz else "application/json")
+            route(payload, npz)
+        except KeyError as exc:
+            self._send_json(400, {'error': f"Missing curve or input {exc}"})
+        except (RequestError, TypeError, ValueError) as exc:
+            self._send_json(400, {'error': str(exc)})
+        except Exception as exc:
+            self._send_json(500, {'error': f"{type(exc).__name__}: {exc}"})
+
+    def _simulate(self, payload, npz):
+        runs = stage_runs(payload)
+        keys = [tuple(sorted(run.items())) for run in runs]
+        rows = self.server.coalescer.evaluate(_stage_batch, runs, keys)
+        if not npz:
+            return self._send_json(200, {'results': rows})
+        columns = {name: np.array([row[name] for row in rows]) for name in (rows[0] if rows else {})}
+        self._send(200, encode_npz(columns), NPZ_TYPE)
+
+    def _logs(self, func, payload, npz):
+        wells, batched = log_wells(payload)
+        results = self.server.coalescer.evaluate(func, wells, [_well_key(curves) for curves in wells])
+        outputs = {name: np.stack([result[name] for result in results]) if batched else results[0][name]
+                   for name in results[0]}
+        if npz:
+            self._send(200, encode_npz(outputs), NPZ_TYPE)
+        else:
+            self._send_json(200, {'curves': outputs})
+
+
+class BatchServer(ThreadingHTTPServer):
+    """HTTP server owning the worker pool and coalescer"""
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, chunk_size=256, verbose=False):
+        super().__init__(address, BatchHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.verbose = verbose
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.coalescer = Coalescer(self.executor, chunk_size=chunk_size)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def serve(host="127.0.0.1", port=8765, workers=None, chunk_size=256, verbose=False):
+    """Run the batch service until interrupted"""
+    with BatchServer((host, port), workers=workers, chunk_size=chunk_size, verbose=verbose) as server:
+        print(f"GhostFracture batch service on http://{host}:{server.server_address[1]} "
+              f"({server.workers} workers)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,250 @@
+"""Depth resampling and splicing of multiple logging runs onto one grid.
+
+A well is usually logged in several runs with different tools and sample
+rates (0.5 ft, 0.1 ft, 6 in) that overlap in depth. A ``Splicer`` merges
+them onto a common regular grid. Each run is fed as depth-sorted chunks
+(``feed``), so files larger than memory can be streamed. Curves are linearly
+interpolated onto the grid with vectorized NumPy (all curves of a chunk at
+once).
+
+* Nulls (NaN or the LAS null value -999.25) are never interpolated across.
+  Neither are depth gaps wider than the run's ``max_gap``.
+* Where runs overlap, each grid sample takes the preferred run that has a
+  value there. Runs with a lower ``priority`` are preferred. The default
+  priority is the sample step, so finer runs win. Ties go to the run added
+  last, usually the most recent.
+* ``sources`` records which run supplied every sample of every curve.
+
+``splice(runs)`` does all of this for in-memory runs (WellLogs or
+DataFrames with a ``Depth`` curve) and ``splice_csv(paths)`` for CSV files.
+"""
+import math
+
+import numpy as np
+
+from ghostfracture.welllogs import WellLog
+
+LAS_NULL = -999.25
+CHUNK_SIZE = 1_000_000
+
+
+def regular_grid(top, base, step):
+    """Depths ``top, top + step, ...`` up to ``base``, free of accumulated rounding"""
+    return top + step * np.arange(grid_size(top, base, step))
+
+
+def grid_size(top, base, step):
+    return int(math.floor((base - top) / step + 1e-9)) + 1
+
+
+class Splicer:
+    """Accumulates logging runs, chunk by chunk, into one spliced WellLog on a regular grid"""
+
+    def __init__(self, top, base, step=0.5):
+        if step <= 0 or base < top:
+            raise ValueError(f"invalid grid {top}-{base} ft at {step} ft")
+        self.top = top
+        self.step = step
+        self.log = WellLog(grid_size(top, base, step), ['Depth'])
+        self.log['Depth'] = regular_grid(top, base, step)
+        self.sources = {}  # curve -> int8 run index per grid sample, -1 = no data
+        self.runs = []
+
+    def add_run(self, name, curves, step=None, priority=None, max_gap=None, null=LAS_NULL):
+        """Register a run and return its index for ``feed``.
+
+        ``step`` is the run's sample interval. It is estimated from the
+        first chunk when omitted. ``priority`` defaults to the step.
+        ``max_gap`` defaults to three samples (at least one grid step).
+        """
+        if len(self.runs) == np.iinfo(np.int8).max:
+            raise ValueError("too many runs")
+        curves = [curve for curve in curves if curve != 'Depth']
+        for curve in curves:
+            if curve not in self.log:
+                self.log[curve] = np.nan
+                self.sources[curve] = np.full(len(self.log), -1, dtype=np.int8)
+        self.runs.append({'name': name, 'curves': curves, 'step': step, 'priority': priority,
+                          'max_gap': max_gap, 'null': null, 'next': 0, 'carry': None})
+        return len(self.runs) - 1
+
+    def _rank(self, index):
+        run = self.runs[index]
+        priority = run['priority'] if run['priority'] is not None else run['step']
+        return (math.inf if priority is None else priority, -index)  # step unknown: nothing fed yet
+
+    def _beats(self, index):
+        """Lookup table: does run ``index`` replace a sample from run i (-1 = empty)?"""
+        rank = self._rank(index)
+        return np.array([rank < self._rank(other) for other in range(len(self.runs))] + [True])
+
+    def feed(self, index, depth, values):
+        """Add the next depth-sorted chunk of run ``index``.
+
+        ``values`` maps the run's curves to arrays, or is a
+        (curves x samples) array in the run's curve order.
+        """
+        run = self.runs[index]
+        depth = np.asarray(depth, dtype=np.float64)
+        if isinstance(values, np.ndarray):
+            values = values.astype(np.float32, copy=True).reshape(len(run['curves']), -1)
+        else:
+            values = np.array([np.asarray(values[curve], dtype=np.float32) for curve in run['curves']])
+        if run['null'] is not None:
+            values[values == run['null']] = np.nan
+        if len(depth) and np.any(np.diff(depth) <= 0):
+            raise ValueError(f"run {run['name']!r}: depths must increase within and across chunks")
+        if run['carry'] is not None:  # last sample of the previous chunk, to interpolate across the boundary
+            if len(depth) and depth[0] <= run['carry'][0]:
+                raise ValueError(f"run {run['name']!r}: depths must increase within and across chunks")
+            depth = np.concatenate([[run['carry'][0]], depth])
+            values = np.concatenate([run['carry'][1][:, None], values], axis=1)
+        if len(depth) < 2:  # a lone sample is interpolated with the next chunk
+            run['carry'] = (depth[0], values[:, 0].copy()) if len(depth) else run['carry']
+            return
+        run['carry'] = (depth[-1], values[:, -1].copy())
+        if run['step'] is None:
+            run['step'] = float(np.median(np.diff(depth)))
+        max_gap = run['max_gap'] if run['max_gap'] is not None else max(3 * run['step'], self.step)
+
+        # Grid samples inside this chunk that earlier chunks have not written
+        first = max(run['next'], math.ceil((depth[0] - self.top) / self.step - 1e-9), 0)
+        last = min(math.floor((depth[-1] - self.top) / self.step + 1e-9), len(self.log) - 1)
+        if last < first:
+            return
+        run['next'] = last + 1
+        grid = self.top + self.step * np.arange(first, last + 1)
+
+        # Vectorized linear interpolation of all curves. Nulls propagate to their neighbours; exact
+        # hits read one sample only, so a null next to them does not spread.
+        right = np.clip(np.searchsorted(depth, grid, side='right'), 1, len(depth) - 1)
+        left = right - 1
+        span = depth[right] - depth[left]
+        weight = (grid - depth[left]) / span
+        on_left, on_right = weight == 0, weight == 1
+        right[on_left] = left[on_left]
+        left[on_right] = right[on_right]
+        lower = values.take(left, axis=1)
+        resampled = values.take(right, axis=1)
+        resampled -= lower
+        resampled *= weight.astype(np.float32)
+        resampled += lower
+        gaps = (span > max_gap) & ~on_left & ~on_right
+        if gaps.any():
+            resampled[:, gaps] = np.nan
+
+        # Keep, per sample, the preferred run that has a value
+        beats = self._beats(index)
+        window = slice(first, last + 1)
+        for curve, row in zip(run['curves'], resampled):
+            sources = self.sources[curve][window]
+            take = beats[sources]
+            take &= ~np.isnan(row)
+            np.copyto(self.log[curve][window], row, where=take)
+            np.copyto(sources, index, where=take)
+
+    def result(self):
+        """The spliced WellLog (Depth first, NaN where no run has data) and the per-curve sources"""
+        return self.log, self.sources
+
+    def summary(self):
+        """Rows of samples contributed by each run to each curve"""
+        rows = []
+        for curve, sources in self.sources.items():
+            counts = np.bincount(sources.astype(np.int16) + 1, minlength=len(self.runs) + 1)
+            for index, name in [(i, run['name']) for i, run in enumerate(self.runs)] + [(-1, "(none)")]:
+                if counts[index + 1]:
+                    covered = self.log['Depth'][sources == index]
+                    rows.append({'Curve': curve, 'Run': name, 'Samples': int(counts[index + 1]),
+                                 'Share': round(float(counts[index + 1] / len(sources)), 4),
+                                 'Top (ft)': round(float(covered[0]), 2), 'Base (ft)': round(float(covered[-1]), 2)})
+        return rows
+
+
+def _run_arrays(run):
+    """Depth and (curves x samples) array of a WellLog or DataFrame run, sorted by depth"""
+    if isinstance(run, WellLog):
+        curves = [curve for curve in run.columns if curve != 'Depth']
+        depth = np.asarray(run['Depth'], dtype=np.float64)
+        values = np.array([run[curve] for curve in curves])
+    else:
+        curves = [curve for curve in run.columns if curve != 'Depth']
+        depth = run['Depth'].to_numpy(dtype=np.float64)
+        values = run[curves].to_numpy(dtype=np.float32).T
+    if len(depth) > 1 and depth[-1] < depth[0]:  # logged upwards
+        depth, values = depth[::-1], values[:, ::-1]
+    return curves, depth, values
+
+
+def splice(runs, step=0.5, top=None, base=None, priorities=None, chunk_size=CHUNK_SIZE):
+    """Splice in-memory runs onto a regular grid; returns the ``Splicer``.
+
+    ``runs`` maps run names to WellLogs or DataFrames (or is a list of
+    them). The grid spans all runs unless ``top``/``base`` are given.
+    ``priorities`` optionally maps run names to priorities.
+    """
+    if not isinstance(runs, dict):
+        runs = {f"Run {i + 1}": run for i, run in enumerate(runs)}
+    arrays = {name: _run_arrays(run) for name, run in runs.items()}
+    top = min(depth[0] for _, depth, _ in arrays.values()) if top is None else top
+    base = max(depth[-1] for _, depth, _ in arrays.values()) if base is None else base
+    splicer = Splicer(top, base, step)
+    for name, (curves, depth, values) in arrays.items():
+        run_step = float(np.median(np.diff(depth))) if len(depth) > 1 else None
+        index = splicer.add_run(name, curves, run_step, priority=(priorities or {}).get(name))
+        for start in range(0, len(depth), chunk_size):
+            splicer.feed(index, depth[start:start + chunk_size], values[:, start:start + chunk_size])
+    return splicer
+
+
+def splice_csv(paths, step=0.5, top=None, base=None, priorities=None, chunk_size=CHUNK_SIZE):
+    """Splice runs stored as CSV files (a ``Depth`` column plus curves), streamed in chunks.
+
+    Runs are named after their file names. Without ``top``/``base``, only the
+    depth columns are read first to find the grid's extent.
+    """
+    import os
+
+    import pandas as pd
+
+    if top is None or base is None:
+        extents = []
+        for path in paths:
+            depth = pd.read_csv(path, usecols=['Depth'])['Depth']
+            extents.append((depth.min(), depth.max()))
+        top = min(low for low, _ in extents) if top is None else top
+        base = max(high for _, high in extents) if base is None else base
+    splicer = Splicer(top, base, step)
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        index = None
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            if index is None:
+                index = splicer.add_run(name, list(chunk.columns), priority=(priorities or {}).get(name))
+            curves = splicer.runs[index]['curves']
+            splicer.feed(index, chunk['Depth'].to_numpy(), chunk[curves].to_numpy(dtype=np.float32).T)
+    return splicer
+
+
+def logging_runs(well_id="Berkine-12", steps=(0.5, 0.1, 0.5), overlap=0.1, rng=None):
+    """Synthetic overlapping runs of a well, one per sample step, from top to bottom.
+
+    Consecutive runs overlap by ``overlap`` of the well's interval. Each
+    run is a DataFrame from ``generate_well_log`` cut to its interval, with
+    float64 depths so that fine steps stay exact.
+    """
+    from ghostfracture.welllogs import generate_well_log
+    from ghostfracture.wells import WELL_PROFILES
+
+    rng = np.random.default_rng() if rng is None else rng
+    top, base = WELL_PROFILES[well_id]['depth']
+    length = (base - top) / len(steps)
+    runs = {}
+    for i, step in enumerate(steps):
+        run_top = max(top, top + i * length - overlap * (base - top) / 2)
+        run_base = min(base, top + (i + 1) * length + overlap * (base - top) / 2)
+        full = generate_well_log(well_id, grid_size(top, base, step), rng).to_frame()
+        full['Depth'] = regular_grid(top, base, step)
+        keep = full['Depth'].between(run_top, run_base)
+        runs[f"Run {i + 1} ({step:g} ft)"] = full[keep].reset_index(drop=True)
+    return runs
@@ -0,0 +1,136 @@
+"""Stimulated reservoir volume (SRV) from microseismic event clouds.
+
+The primary estimate is voxel occupancy: events are binned onto a fixed grid
+and the SRV is the number of occupied voxels times the voxel volume. Voxel
+keys are packed into a single int64 so each stage keeps only a sorted key
+array and a count array, which lets new events be merged incrementally
+without revisiting earlier ones.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.spatial import ConvexHull, QhullError
+except ImportError:  # scipy is optional; hull volumes are then unavailable
+    ConvexHull = None
+
+_AXIS_BITS = 21
+_AXIS_OFFSET = 1 << (_AXIS_BITS - 1)
+_AXIS_MASK = (1 << _AXIS_BITS) - 1
+
+
+def _voxel_keys(x, y, z, origin, voxel_size):
+    """Pack integer voxel indices of each point into one int64 key"""
+    pts = np.column_stack([x, y, z]).astype(float)
+    idx = np.floor((pts - origin) / voxel_size).astype(np.int64) + _AXIS_OFFSET
+    idx = np.clip(idx, 0, _AXIS_MASK)
+    return (idx[:, 0] << (2 * _AXIS_BITS)) | (idx[:, 1] << _AXIS_BITS) | idx[:, 2]
+
+
+def _unpack_keys(keys):
+    """Inverse of ``_voxel_keys``: int64 keys back to (n, 3) voxel indices"""
+    ix = (keys >> (2 * _AXIS_BITS)) & _AXIS_MASK
+    iy = (keys >> _AXIS_BITS) & _AXIS_MASK
+    iz = keys & _AXIS_MASK
+    return np.column_stack([ix, iy, iz]) - _AXIS_OFFSET
+
+
+class VoxelSRV:
+    """Incremental per-stage SRV estimator based on voxel occupancy.
+
+    ``add_events`` costs O(batch log batch + occupied) per call, independent
+    of how many events the stage has already seen. A voxel counts towards the
+    SRV once it holds at least ``min_events`` events.
+    """
+
+    def __init__(self, voxel_size=25.0, min_events=1, origin=(0.0, 0.0, 0.0)):
+        self.voxel_size = float(voxel_size)
+        self.min_events = int(min_events)
+        self.origin = np.asarray(origin, dtype=float)
+        self._keys = {}
+        self._counts = {}
+        self._n_events = {}
+
+    def add_events(self, stage, x, y, z):
+        """Merge a batch of event locations into the stage's occupancy grid"""
+        x = np.asarray(x, dtype=float)
+        if x.size == 0:
+            return
+        new_keys, new_counts = np.unique(
+            _voxel_keys(x, y, z, self.origin, self.voxel_size), return_counts=True
+        )
+        keys = self._keys.get(stage, np.empty(0, dtype=np.int64))
+        counts = self._counts.get(stage, np.empty(0, dtype=np.int64))
+
+        # Existing voxels get their counts bumped in place; new ones are inserted
+        pos = np.searchsorted(keys, new_keys)
+        found = pos < len(keys)
+        found[found] = keys[pos[found]] == new_keys[found]
+        counts[pos[found]] += new_counts[found]
+        keys = np.insert(keys, pos[~found], new_keys[~found])
+        counts = np.insert(counts, pos[~found], new_counts[~found])
+
+        self._keys[stage] = keys
+        self._counts[stage] = counts
+        self._n_events[stage] = self._n_events.get(stage, 0) + x.size
+
+    def add_catalog(self, catalog):
+        """Add every event of a catalog (columns X, Y, Z, Stage)"""
+        for stage, events in catalog.groupby('Stage'):
+            self.add_events(stage, events['X'].to_numpy(), events['Y'].to_numpy(),
+                            events['Z'].to_numpy())
+
+    def stages(self):
+        return sorted(self._keys)
+
+    def event_count(self, stage):
+        return self._n_events.get(stage, 0)
+
+    def occupied_voxels(self, stage):
+        """Number of voxels at or above the ``min_events`` threshold"""
+        counts = self._counts.get(stage)
+        return 0 if counts is None else int((counts >= self.min_events).sum())
+
+    def volume(self, stage=None):
+        """SRV in ft³ for one stage, or the sum over all stages"""
+        if stage is None:
+            return sum(self.volume(s) for s in self.stages())
+        return self.occupied_voxels(stage) * self.voxel_size ** 3
+
+    def voxel_centers(self, stage):
+        """Centres of the occupied voxels (n, 3), e.g. for rendering the SRV"""
+        keys = self._keys.get(stage, np.empty(0, dtype=np.int64))
+        keys = keys[self._counts[stage] >= self.min_events] if len(keys) else keys
+        return self.origin + (_unpack_keys(keys) + 0.5) * self.voxel_size
+
+    def summary(self):
+        """Per-stage table of event count, occupied voxels and SRV"""
+        return pd.DataFrame({
+            'Stage': self.stages(),
+            'Events': [self.event_count(s) for s in self.stages()],
+            'Voxels': [self.occupied_voxels(s) for s in self.stages()],
+            'SRV (ft³)': [self.volume(s) for s in self.stages()]
+        })
+
+
+def convex_hull_volume(x, y, z):
+    """Convex hull volume of an event cloud in ft³ (NaN without scipy)"""
+    if ConvexHull is None or len(x) < 4:
+        return float('nan')
+    try:
+        return float(ConvexHull(np.column_stack([x, y, z])).volume)
+    except QhullError:  # coplanar or otherwise degenerate clouds
+        return 0.0
+
+
+def stage_srv(catalog, voxel_size=25.0, min_events=1, hull=False):
+    """Per-stage SRV table for a whole catalog, optionally with hull volumes"""
+    engine = VoxelSRV(voxel_size=voxel_size, min_events=min_events)
+    engine.add_catalog(catalog)
+    table = engine.summary()
+    if hull:
+        table['Hull SRV (ft³)'] = [
+            convex_hull_volume(ev['X'], ev['Y'], ev['Z'])
+            for _, ev in catalog.groupby('Stage')
+        ]
+    return table
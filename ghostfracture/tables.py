@@ -0,0 +1,90 @@
+"""Risk Factor Summary tables rendered to HTML in one vectorized pass."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from ghostfracture.rules import load_rules
+
+RISK_FACTORS = ['Early Closure', 'Screenout', 'Height Growth', 'Fracture Efficiency', 'Asymmetry']
+RISK_IMPACTS = ['High', 'Critical', 'Moderate', 'Moderate', 'Low']
+
+# Mitigation priority per rule level (see `levels` in fracguard_rules.toml) and for unmatched scores
+CLOSURE_PRIORITY = ({'high': 'Immediate', 'medium': 'High'}, 'Monitor')
+SCREENOUT_PRIORITY = ({'high': 'Immediate', 'elevated': 'High', 'medium': 'High'}, 'Monitor')
+HEIGHT_PRIORITY = ({'high': 'High', 'medium': 'Medium'}, 'Low')
+
+
+def _priority(levels, priority):
+    mapping, default = priority
+    return np.select([levels == level for level in mapping], list(mapping.values()), default)
+
+
+def risk_summary_frame(closure_score, screenout_prob, height_score, efficiency, index=None, rules=None):
+    """Summary rows for one or many stages (five risk factors per stage).
+
+    Scores may be scalars or equal-length arrays (e.g. a fleet of wells ×
+    stages); ``index`` is an optional DataFrame of identifying columns
+    (Well, Stage, ...) with one row per entry, prepended to its rows.
+    Priorities follow the rule levels of ``rules`` (default: the current
+    rule file).
+    """
+    rules = rules or load_rules()
+    closure = np.atleast_1d(np.asarray(closure_score, dtype=float))
+    screenout = np.atleast_1d(np.asarray(screenout_prob, dtype=float))
+    height = np.atleast_1d(np.asarray(height_score, dtype=float))
+    eff = np.atleast_1d(np.asarray(efficiency, dtype=float))
+    n = len(closure)
+
+    probability = np.column_stack([
+        closure.astype(int), screenout.astype(int), height.astype(int),
+        100 - eff.astype(int), np.full(n, 30)
+    ])
+    priority = np.column_stack([
+        _priority(rules.level('closure', closure), CLOSURE_PRIORITY),
+        _priority(rules.level('screenout', screenout), SCREENOUT_PRIORITY),
+        _priority(rules.level('height_growth', height), HEIGHT_PRIORITY),
+        np.select([eff < 50, eff < 70], ['High', 'Medium'], 'Monitor'),
+        np.full(n, 'Low')
+    ])
+
+    frame = pd.DataFrame({
+        'Risk Factor': np.tile(RISK_FACTORS, n),
+        'Probability': pd.Series(probability.ravel()).astype(str) + '%',
+        'Impact': np.tile(RISK_IMPACTS, n),
+        'Mitigation Priority': priority.ravel()
+    })
+    if index is not None:
+        ids = index.loc[index.index.repeat(len(RISK_FACTORS))].reset_index(drop=True)
+        frame = pd.concat([ids, frame], axis=1)
+    return frame
+
+
+def render_risk_table(frame, priority_column='Mitigation Priority'):
+    """HTML markup for a summary frame, built column-wise rather than per cell"""
+    header = "".join(f"<th>{col}</th>" for col in frame.columns)
+    cells = []
+    for col in frame.columns:
+        values = frame[col].astype(str)
+        if col == priority_column:
+            cells.append("<td><span class='priority-badge priority-" + values.str.lower()
+                         + "'>" + values + "</span></td>")
+        else:
+            cells.append("<td>" + values + "</td>")
+    rows = "<tr>" + cells[0]
+    for column_cells in cells[1:]:
+        rows = rows + column_cells
+    rows = rows + "</tr>"
+    return ("<table class='risk-summary-table'><thead><tr>" + header
+            + "</tr></thead><tbody>" + "".join(rows) + "</tbody></table>")
+
+
+def risk_summary_html(closure_score, screenout_prob, height_score, efficiency, rules=None):
+    """Memoized single-stage Risk Factor Summary markup, per rule set so rule edits show at once"""
+    return _risk_summary_html(closure_score, screenout_prob, height_score, efficiency, rules or load_rules())
+
+
+@lru_cache(maxsize=1024)
+def _risk_summary_html(closure_score, screenout_prob, height_score, efficiency, rules):
+    return render_risk_table(risk_summary_frame(closure_score, screenout_prob, height_score, efficiency,
+                                                rules=rules))
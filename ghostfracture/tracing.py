@@ -0,0 +1,302 @@
+"""Lightweight span, counter and payload instrumentation for dashboard reruns.
+
+A ``Tracer`` keeps the last ``max_runs`` reruns. Each rerun holds its
+timed spans plus counters such as cache calls/misses and bytes sent per
+element type. The module-level helpers act on the tracer activated for the
+current thread (the session's script thread) and do nothing when none is
+active, so instrumented code runs unchanged elsewhere.
+
+``section(name)`` ends the previous section at the same nesting level, so
+a long script can be split into timed sections without re-indenting it;
+``end_section()`` ends it without starting another.
+``chrome_trace()`` exports everything in the Chrome trace-event format
+(chrome://tracing, https://ui.perfetto.dev).
+
+Cache calls and misses are also summed over all sessions of the process
+(``cache_totals()``), for the metrics endpoint.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+_ACTIVE = contextvars.ContextVar("ghostfracture_tracer", default=None)
+_CACHE_TOTALS = Counter()
+_CACHE_LOCK = threading.Lock()
+# Streamlit versions [low, high) whose private ScriptRunContext._enqueue count_payload wraps
+PAYLOAD_HOOK_VERSIONS = ((1, 0), (2, 0))
+
+
+class Run:
+    """Spans and counters of one rerun"""
+
+    def __init__(self, number, label):
+        self.number = number
+        self.label = label
+        self.start = time.perf_counter()
+        self.wall_start = time.time()
+        self.end = None
+        self.complete = None  # False when a new run started before this one ended
+        self.spans = []  # (name, start, end, depth)
+        self.counters = Counter()
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Tracer:
+    """Per-session recorder of reruns; ``on_end(run)`` is called for every completed run"""
+
+    def __init__(self, max_runs=50, on_end=None):
+        self.runs = deque(maxlen=max_runs)
+        self.on_end = on_end
+        self._stack = []  # open spans: [name, start, open section or None, depth]
+        self._root_section = None
+        self._count = 0
+        self.begin_run("startup")
+
+    @property
+    def current(self):
+        return self.runs[-1]
+
+    def begin_run(self, label="rerun"):
+        """Close the current run (as interrupted if still open) and start recording a new one"""
+        if self.runs:
+            self.end_run(complete=False)
+        self._count += 1
+        self.runs.append(Run(self._count, label))
+        self._stack = []
+        self._root_section = None
+
+    def end_run(self, complete=True):
+        self._close_section(None, 0)
+        run = self.runs[-1] if self.runs else None
+        if run is None or run.end is not None:
+            return
+        run.end = time.perf_counter()
+        run.complete = complete
+        if complete and self.on_end is not None:
+            self.on_end(run)
+
+    def _record(self, name, start, depth):
+        self.current.spans.append((name, start, time.perf_counter(), depth))
+
+    def _level(self):
+        """Depth of a section opened now, and the open-section slot it would replace"""
+        return (self._stack[-1][3] + 1, self._stack[-1]) if self._stack else (0, None)
+
+    def _close_section(self, frame, depth):
+        section = frame[2] if frame is not None else self._root_section
+        if section is None:
+            return
+        self._record(section[0], section[1], depth)
+        if frame is None:
+            self._root_section = None
+        else:
+            frame[2] = None
+
+    def end_section(self):
+        depth, frame = self._level()
+        self._close_section(frame, depth)
+
+    def section(self, name):
+        self.end_section()
+        depth, frame = self._level()
+        if frame is None:
+            self._root_section = (name, time.perf_counter())
+        else:
+            frame[2] = (name, time.perf_counter())
+
+    @contextmanager
+    def span(self, name):
+        depth, parent = self._level()
+        if (parent[2] if parent is not None else self._root_section) is not None:
+            depth += 1  # inside the open section
+        frame = [name, time.perf_counter(), None, depth]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._close_section(frame, depth + 1)
+            self._stack.remove(frame)
+            self._record(name, frame[1], depth)
+
+    def count(self, name, value=1):
+        self.current.counters[name] += value
+
+    # ==================== REPORTING ====================
+    def section_times(self, run=None):
+        """{(depth, span name): total seconds} for one run (default: the last finished one)"""
+        run = run or self.last_finished()
+        totals = {}
+        for name, start, end, depth in run.spans if run else ():
+            totals[(depth, name)] = totals.get((depth, name), 0.0) + end - start
+        return totals
+
+    def last_finished(self):
+        for run in reversed(self.runs):
+            if run.end is not None:
+                return run
+        return None
+
+    def totals(self, prefix=""):
+        """Counters summed over all recorded runs"""
+        counters = Counter()
+        for run in self.runs:
+            counters.update({k: v for k, v in run.counters.items() if k.startswith(prefix)})
+        return counters
+
+    def chrome_trace(self):
+        """All recorded runs as a Chrome trace-event document"""
+        events = []
+        pid = os.getpid()
+        for run in self.runs:
+            offset = run.wall_start - run.start
+            events.append({'name': f"run {run.number}: {run.label}", 'ph': "X", 'pid': pid, 'tid': 0,
+                           'ts': (run.start + offset) * 1e6, 'dur': run.duration * 1e6,
+                           'args': dict(run.counters)})
+            for name, start, end, depth in run.spans:
+                events.append({'name': name, 'ph': "X", 'pid': pid, 'tid': 0,
+                               'ts': (start + offset) * 1e6, 'dur': (end - start) * 1e6,
+                               'args': {'depth': depth, 'run': run.number}})
+            for name, value in run.counters.items():
+                events.append({'name': name, 'ph': "C", 'pid': pid, 'tid': 0,
+                               'ts': ((run.end or run.start) + offset) * 1e6, 'args': {'value': value}})
+        return {'traceEvents': events, 'displayTimeUnit': "ms"}
+
+
+# ==================== ACTIVE-TRACER HELPERS ====================
+def activate(tracer):
+    """Route the helpers below to ``tracer`` in the current thread"""
+    _ACTIVE.set(tracer)
+
+
+@contextmanager
+def span(name):
+    tracer = _ACTIVE.get()
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name):
+        yield
+
+
+def section(name):
+    tracer = _ACTIVE.get()
+    if tracer is not None:
+        tracer.section(name)
+
+
+def end_section():
+    tracer = _ACTIVE.get()
+    if tracer is not None:
+        tracer.end_section()
+
+
+def count(name, value=1):
+    tracer = _ACTIVE.get()
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def _count_cache(name, value=1):
+    with _CACHE_LOCK:
+        _CACHE_TOTALS[name] += value
+    count(name, value)
+
+
+def cache_totals():
+    """Cache calls/misses counters summed over every session of the process"""
+    with _CACHE_LOCK:
+        return Counter(_CACHE_TOTALS)
+
+
+def traced(name):
+    """Decorator timing every call of a function as a span"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def counted_cache(name, cache):
+    """Apply a caching decorator (e.g. ``st.cache_data``) and count its calls and misses.
+
+    The function is timed as span ``name``; ``cache.<name>.calls`` counts
+    every call and ``cache.<name>.misses`` the calls the cache had to compute.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _count_cache(f"cache.{name}.misses")
+            return func(*args, **kwargs)
+
+        cached = cache(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _count_cache(f"cache.{name}.calls")
+            with span(name):
+                return cached(*args, **kwargs)
+
+        wrapper.clear = getattr(cached, 'clear', None)
+        return wrapper
+    return decorate
+
+
+def _streamlit_version():
+    import streamlit
+    return tuple(int(part) for part in streamlit.__version__.split('.')[:2] if part.isdigit())
+
+
+def count_payload(ctx, tracer):
+    """Count bytes sent to the browser per element type in ``tracer``.
+
+    ``ctx`` is the session's Streamlit ScriptRunContext; its message queue
+    is wrapped once. Messages the browser already has cached are counted
+    at the size of the reference actually sent. Streamlit has no public
+    hook for outgoing messages, so this wraps the private
+    ``ScriptRunContext._enqueue``, which is only done on the Streamlit
+    versions in ``PAYLOAD_HOOK_VERSIONS``. Returns whether bytes are counted.
+    """
+    enqueue = getattr(ctx, '_enqueue', None)
+    if getattr(enqueue, '_ghostfracture_tracer', None) is tracer:
+        return True
+    low, high = PAYLOAD_HOOK_VERSIONS
+    if not callable(enqueue) or not low <= _streamlit_version() < high:
+        return False
+
+    def counting_enqueue(msg):
+        kind = msg.WhichOneof('type')
+        if kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            kind = msg.delta.new_element.WhichOneof('type')
+        tracer.count(f"bytes.{kind}", msg.ByteSize())
+        enqueue(msg)
+
+    counting_enqueue._ghostfracture_tracer = tracer
+    ctx._enqueue = counting_enqueue
+    return True
+
+
+def cache_table(totals):
+    """Rows of calls, hits, misses and hit ratio per counted cache.
+
+    ``totals`` is a Tracer (its recorded runs) or a counter such as ``cache_totals()``.
+    """
+    if isinstance(totals, Tracer):
+        totals = totals.totals("cache.")
+    rows = []
+    for key in sorted(totals):
+        if key.endswith(".calls"):
+            name = key[len("cache."):-len(".calls")]
+            calls, misses = totals[key], totals.get(f"cache.{name}.misses", 0)
+            rows.append({'Cache': name, 'Calls': calls, 'Hits': calls - misses, 'Misses': misses,
+                         'Hit Ratio': (calls - misses) / calls if calls else float('nan')})
+    return rows
@@ -0,0 +1,280 @@
+"""Well-log loading, petrophysics and geomechanics (no Streamlit dependency).
+
+Logs are held in a ``WellLog``: one float32 array of curves x samples with
+room reserved for the derived curves, so the property calculations write
+their outputs into place. The calculations also accept a DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+from ghostfracture.wells import WELL_PROFILES, WELLS
+
+LOG_COLUMNS = [
+    'Depth', 'CALI', 'SP', 'GR', 'ILD', 'LLD', 'LLS', 'MSFL',
+    'DT', 'RHOB', 'NPHI', 'PEF', 'DRHO', 'RHOZ', 'DTC', 'DTS'
+]
+PETROPHYSICAL_CURVES = ['PHID', 'PHIND', 'SW', 'SH', 'VSH', 'PHIE', 'PERM']
+GEOMECHANICAL_CURVES = ['EDYN', 'PRDYN', 'BI', 'OBG', 'PPG', 'FG']
+# Formations from top to bottom with the fraction of the logged interval at their base
+FORMATIONS = [
+    ('Shale', 0.15), ('Sandstone_1', 0.30), ('Limestone', 0.45), ('Sandstone_2', 0.60), ('Shale_2', 0.70),
+    ('Dolomite', 0.75), ('Sandstone_3', 0.82), ('Shale_3', 0.87), ('Reservoir', 0.95), ('Caprock', 1.0)
+]
+
+
+# ==================== CONTAINER ====================
+class WellLog:
+    """Curves of one well stored as rows of a single float32 array.
+
+    ``index`` maps curve names to rows of ``data``. Assigning a new curve
+    fills the next spare row (the array only grows when ``capacity`` is
+    exhausted); ``log[name]`` and ``to_frame()`` are views, not copies.
+    """
+
+    dtype = np.float32
+
+    def __init__(self, n_samples, names=(), capacity=None):
+        self.data = np.zeros((max(capacity or 0, len(names)), n_samples), dtype=self.dtype)
+        self.index = {name: row for row, name in enumerate(names)}
+
+    @classmethod
+    def from_array(cls, data, names):
+        """WellLog over an existing (curves x samples) array, without copying"""
+        log = cls.__new__(cls)
+        log.data = data
+        log.index = {name: row for row, name in enumerate(names)}
+        return log
+
+    @classmethod
+    def from_frame(cls, df, capacity=None):
+        log = cls(len(df), df.columns, capacity)
+        log.values[:] = df.to_numpy(dtype=cls.dtype).T
+        return log
+
+    @property
+    def columns(self):
+        return list(self.index)
+
+    @property
+    def values(self):
+        """(curves x samples) view of the filled rows"""
+        return self.data[:len(self.index)]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        return self.data[self.index[name]]
+
+    def __setitem__(self, name, values):
+        row = self.index.get(name)
+        if row is None:
+            row = len(self.index)
+            if row == len(self.data):
+                grown = np.zeros((max(2 * row, 1), len(self)), dtype=self.dtype)
+                grown[:row] = self.data
+                self.data = grown
+            self.index[name] = row
+        self.data[row] = values
+
+    def to_frame(self):
+        """DataFrame sharing this log's memory (pandas copies on write)"""
+        return pd.DataFrame(self.values.T, columns=self.columns, copy=False)
+
+
+# ==================== DATA PROCESSING ====================
+def process_well_log_data(well_id="Berkine-12", n_points=1450, rng=None):
+    """Well log suite for a well ID as a DataFrame (see ``generate_well_log``)"""
+    return generate_well_log(well_id, n_points, rng).to_frame()
+
+
+def formation_intervals(depth_min, depth_max):
+    """{formation: (top, bottom)} of the synthetic formations over a logged interval"""
+    depth_range = depth_max - depth_min
+    intervals = {}
+    top = depth_min
+    for formation, base in FORMATIONS:
+        bottom = depth_max if base == 1.0 else depth_min + depth_range*base
+        intervals[formation] = (top, bottom)
+        top = bottom
+    return intervals
+
+
+def generate_well_log(well_id="Berkine-12", n_points=1450, rng=None):
+    """Well log suite for a well ID, built formation by formation.
+
+    ``rng`` is a NumPy Generator; the global NumPy random state is used
+    when it is omitted. The WellLog has room for the derived curves.
+    """
+    if well_id not in WELL_PROFILES:
+        raise ValueError(f"Unknown well {well_id!r}; expected one of {WELLS}")
+    rng = np.random if rng is None else rng
+    profile = WELL_PROFILES[well_id]
+    shale_gr_mean = profile['shale_gr_mean']
+    sandstone_gr_mean = profile['sandstone_gr_mean']
+    reservoir_phi_mean = profile['reservoir_phi_mean']
+    shale_res_mean = profile['shale_res_mean']
+    sand_res_mean = profile['sand_res_mean']
+    depth = np.linspace(*profile['depth'], n_points)
+
+    # Define formation boundaries based on depth range
+    formations = formation_intervals(depth.min(), depth.max())
+
+    # Initialize arrays
+    data = WellLog(n_points, LOG_COLUMNS,
+                   capacity=len(LOG_COLUMNS) + len(PETROPHYSICAL_CURVES) + len(GEOMECHANICAL_CURVES))
+    data['Depth'] = depth
+
+    # Fill data based on formations with well-specific characteristics
+    for formation, (top, bottom) in formations.items():
+        mask = (depth >= top) & (depth <= bottom)
+
+        if 'Shale' in formation:
+            data['GR'][mask] = rng.normal(shale_gr_mean, 15, mask.sum())  # High GR
+            data['ILD'][mask] = rng.lognormal(np.log(shale_res_mean), 0.3, mask.sum())  # Low resistivity
+            data['RHOB'][mask] = rng.normal(2.5, 0.1, mask.sum())  # Medium density
+            data['NPHI'][mask] = rng.normal(0.18, 0.03, mask.sum())  # Low-mid porosity
+            data['DT'][mask] = rng.normal(85, 5, mask.sum())  # High DT
+
+        elif 'Sandstone' in formation:
+            data['GR'][mask] = rng.normal(sandstone_gr_mean, 10, mask.sum())  # Low GR
+            data['ILD'][mask] = rng.lognormal(np.log(sand_res_mean), 0.5, mask.sum())  # High resistivity
+            data['RHOB'][mask] = rng.normal(2.3, 0.08, mask.sum())  # Low density
+            data['NPHI'][mask] = rng.normal(0.22, 0.05, mask.sum())  # High porosity
+            data['DT'][mask] = rng.normal(70, 4, mask.sum())  # Low DT
+
+        elif 'Limestone' in formation or 'Dolomite' in formation:
+            data['GR'][mask] = rng.normal(25, 8, mask.sum())  # Very low GR
+            data['ILD'][mask] = rng.lognormal(1.5, 0.4, mask.sum())  # Medium resistivity
+            data['RHOB'][mask] = rng.normal(2.7, 0.1, mask.sum())  # High density
+            data['NPHI'][mask] = rng.normal(0.05, 0.02, mask.sum())  # Very low porosity
+            data['DT'][mask] = rng.normal(50, 4, mask.sum())  # Very low DT
+
+        elif 'Reservoir' in formation:
+            data['GR'][mask] = rng.normal(sandstone_gr_mean - 5, 5, mask.sum())  # Very low GR
+            data['ILD'][mask] = rng.lognormal(np.log(sand_res_mean * 1.5), 0.3, mask.sum())  # Very high resistivity
+            data['RHOB'][mask] = rng.normal(2.25, 0.05, mask.sum())  # Low density
+            data['NPHI'][mask] = rng.normal(reservoir_phi_mean, 0.04, mask.sum())  # High porosity
+            data['DT'][mask] = rng.normal(65, 3, mask.sum())  # Low DT
+
+        elif 'Caprock' in formation:
+            data['GR'][mask] = rng.normal(45, 10, mask.sum())  # Medium GR
+            data['ILD'][mask] = rng.lognormal(0.8, 0.2, mask.sum())  # Low resistivity
+            data['RHOB'][mask] = rng.normal(2.6, 0.1, mask.sum())  # High density
+            data['NPHI'][mask] = rng.normal(0.08, 0.03, mask.sum())  # Low porosity
+            data['DT'][mask] = rng.normal(80, 6, mask.sum())  # High DT
+
+    # Add correlations and trends
+    data['LLD'] = data['ILD'] * 1.1
+    data['LLS'] = data['ILD'] * 0.9
+    data['MSFL'] = data['ILD'] * 0.7
+    data['CALI'] = 8.5 + 0.1 * np.sin(depth/50)
+    data['SP'] = -100 + 50 * np.sin(depth/100)
+    data['PEF'] = rng.normal(3.5, 0.5, n_points)
+    data['DRHO'] = rng.normal(0.05, 0.02, n_points)
+    data['RHOZ'] = data['RHOB'] + 0.1 * rng.standard_normal(n_points)
+    data['DTC'] = data['DT'] * 1.1
+    data['DTS'] = data['DT'] * 1.8
+
+    # Ensure positive values
+    curves = data.values[1:]  # Skip depth row
+    np.abs(curves, out=curves)
+    return data
+
+
+# ==================== PETROPHYSICAL CALCULATIONS ====================
+def calculate_petrophysical_properties(df):
+    """Calculate petrophysical properties from log data (DataFrame or WellLog, extended in place)"""
+
+    # Calculate porosity from density (using RHOB)
+    matrix_density = 2.65  # g/cc for sandstone matrix
+    fluid_density = 1.0    # g/cc for brine
+    df['PHID'] = np.clip((matrix_density - df['RHOB']) / (matrix_density - fluid_density), 0, 0.35)
+
+    # Calculate porosity from neutron-density crossplot (simplified)
+    df['PHIND'] = ((df['NPHI']**2 + df['PHID']**2) / 2)**0.5
+
+    # Calculate water saturation using Archie's equation
+    a, m, n = 1.0, 2.0, 2.0  # Archie parameters
+    rw = 0.05  # Formation water resistivity (ohm-m)
+
+    # Use LLD for deep resistivity
+    df['SW'] = np.clip(((a * rw) / (df['LLD'] * df['PHIND']**m))**(1/n), 0.2, 1.0)
+
+    # Calculate hydrocarbon saturation
+    df['SH'] = 1 - df['SW']
+
+    # Calculate Vshale from GR
+    gr_min, gr_max = np.nanquantile(df['GR'], [0.05, 0.95])
+    df['VSH'] = np.clip((df['GR'] - gr_min) / (gr_max - gr_min), 0, 1)
+
+    # Calculate effective porosity
+    df['PHIE'] = df['PHIND'] * (1 - df['VSH'])
+
+    # Calculate permeability using Timur's equation
+    df['PERM'] = np.clip(0.136 * (df['PHIE']**4.4) / (df['SW']**2), 0.01, 5000)
+
+    return df
+
+
+# ==================== GEOMECHANICAL CALCULATIONS ====================
+def calculate_geomechanical_properties(df):
+    """Calculate geomechanical properties from log data (DataFrame or WellLog, extended in place)"""
+
+    # Calculate dynamic elastic properties from sonic logs
+    # Convert DT to velocity (ft/s)
+    vp = 1e6 / df['DT']
+    vs = 1e6 / df['DTS'] if 'DTS' in df.columns else vp / 1.7
+
+    # Calculate dynamic Young's Modulus (Mpsi)
+    df['EDYN'] = np.clip((df['RHOB'] * (vs**2) * (3 * vp**2 - 4 * vs**2) / (vp**2 - vs**2)) / 1e6, 1, 10)
+
+    # Calculate dynamic Poisson's Ratio
+    df['PRDYN'] = np.clip((vp**2 - 2 * vs**2) / (2 * (vp**2 - vs**2)), 0.1, 0.4)
+
+    # Calculate brittleness index (Rickman method)
+    e_min, e_max = np.nanmin(df['EDYN']), np.nanmax(df['EDYN'])
+    pr_min, pr_max = np.nanmin(df['PRDYN']), np.nanmax(df['PRDYN'])
+    normalized_E = (df['EDYN'] - e_min) / (e_max - e_min + 1e-5)
+    normalized_PR = (df['PRDYN'] - pr_min) / (pr_max - pr_min + 1e-5)
+    df['BI'] = (normalized_E + (1 - normalized_PR)) / 2
+
+    # Calculate pressure gradients (simplified)
+    df['OBG'] = 1.0 + (df['Depth'] - np.nanmin(df['Depth'])) * 0.0005
+    df['PPG'] = np.clip(0.45 + 0.00015 * (df['Depth'] - np.nanmean(df['Depth'])), 0.43, 0.85)
+    df['FG'] = df['PPG'] + (df['OBG'] - df['PPG']) * 0.4
+
+    return df
+
+
+def load_well_log(well_id, rng=None):
+    """Well logs with petrophysical and geomechanical properties as a float32 WellLog"""
+    log = generate_well_log(well_id, rng=rng)
+    calculate_petrophysical_properties(log)
+    return calculate_geomechanical_properties(log)
+
+
+def load_well(well_id, rng=None):
+    """Well logs with petrophysical and geomechanical properties (a DataFrame view of ``load_well_log``)"""
+    return load_well_log(well_id, rng=rng).to_frame()
+
+
+def memory_report(well_ids=WELLS, rng_seed=0):
+    """Per-well bytes of the processed logs: float64 DataFrame columns vs. the float32 WellLog"""
+    rows = []
+    for well_id in well_ids:
+        log = load_well_log(well_id, rng=np.random.default_rng(rng_seed))
+        frame64 = log.to_frame().astype(np.float64)
+        before = int(frame64.memory_usage(deep=True).sum())
+        rows.append({'Well': well_id, 'Curves': len(log.index), 'Samples': len(log),
+                     'float64 DataFrame (KB)': round(before / 1024, 1),
+                     'WellLog (KB)': round(log.nbytes / 1024, 1),
+                     'Ratio': round(log.nbytes / before, 3)})
+    return rows
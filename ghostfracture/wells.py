@@ -0,0 +1,27 @@
+"""Well catalog and per-stage seeding, kept free of heavy imports."""
+import zlib
+
+# Depth range (ft) and formation characteristics of every well
+WELL_PROFILES = {
+    # Sandstone dominant (Berkine Basin)
+    "Berkine-12": {'depth': (195, 919.5), 'shale_gr_mean': 90, 'sandstone_gr_mean': 35,
+                   'reservoir_phi_mean': 0.25, 'shale_res_mean': 1.0, 'sand_res_mean': 15.0},
+    # Carbonate dominant (sandstone_gr_mean is actually limestone)
+    "Ahnet-01": {'depth': (2100, 3200), 'shale_gr_mean': 80, 'sandstone_gr_mean': 25,
+                 'reservoir_phi_mean': 0.15, 'shale_res_mean': 1.5, 'sand_res_mean': 8.0},
+    # Mixed lithology
+    "Ghadames-07": {'depth': (1800, 2800), 'shale_gr_mean': 95, 'sandstone_gr_mean': 40,
+                    'reservoir_phi_mean': 0.20, 'shale_res_mean': 2.0, 'sand_res_mean': 12.0},
+    # Cambrian sandstone
+    "Hassi-Messaoud-05": {'depth': (2500, 3500), 'shale_gr_mean': 85, 'sandstone_gr_mean': 30,
+                          'reservoir_phi_mean': 0.22, 'shale_res_mean': 1.2, 'sand_res_mean': 20.0},
+    # Devonian sandstone
+    "In-Amenas-03": {'depth': (2300, 3100), 'shale_gr_mean': 88, 'sandstone_gr_mean': 32,
+                     'reservoir_phi_mean': 0.18, 'shale_res_mean': 1.8, 'sand_res_mean': 18.0},
+}
+WELLS = list(WELL_PROFILES)
+
+
+def stage_seed(well_id, stage):
+    """Stable RNG seed for a well/stage pair so reruns see the same event cloud"""
+    return zlib.crc32(f"{well_id}:{stage}".encode())
@@ -0,0 +1,122 @@
+"""Processed well logs shared read-only by every session and process.
+
+``WellStore.get(well_id)`` returns a read-only ``WellLog`` whose array is a
+memory map of ``<directory>/<well>-<version>.npy``. The first process that
+asks for a well computes it and publishes the file atomically. Every other
+dashboard session, job thread, CLI run or worker process pointing at the
+same directory maps the same pages. Memory therefore grows with the number
+of wells, not wells x sessions.
+
+The directory defaults to ``/dev/shm`` (RAM-backed shared memory) where
+available and can be set with GHOSTFRACTURE_WELLSTORE_DIR. The version is
+the code digest of the loader, so a code change publishes fresh files.
+Logs are generated with the well's own seed (``stage_seed(well_id, 0)``), so
+processes racing to publish a well write identical data.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+
+from ghostfracture.diskcache import code_version
+from ghostfracture.welllogs import WellLog, load_well_log
+from ghostfracture.wells import stage_seed
+
+# <well>-<version>.npy/.json and their temp files <well>-<version>.npy.XXXXXXXX.tmp
+STORE_FILE = re.compile(r"^.+-(?P<version>[0-9a-f]{16})\.(npy|json)(\.[^.]+\.tmp)?$")
+
+
+def default_directory():
+    base = "/dev/shm" if os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+    return os.environ.get("GHOSTFRACTURE_WELLSTORE_DIR", os.path.join(base, "ghostfracture-wells"))
+
+
+class WellStore:
+    """Directory of memory-mapped processed well logs, one pair of files per well"""
+
+    def __init__(self, directory=None, loader=load_well_log):
+        self.directory = directory or default_directory()
+        self.loader = loader
+        self.version = code_version(loader)[:16]
+        self.hits = 0
+        self.mapped = 0
+        self.published = 0
+        self._logs = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, well_id, suffix):
+        return os.path.join(self.directory, f"{well_id}-{self.version}{suffix}")
+
+    def get(self, well_id):
+        """Read-only WellLog of a well, mapped from the store (published first if missing)"""
+        with self._lock:
+            log = self._logs.get(well_id)
+            if log is not None:
+                self.hits += 1
+                return log
+            log = self._map(well_id)
+            if log is None:
+                self._publish(well_id)
+                log = self._map(well_id)
+            self._logs[well_id] = log
+            return log
+
+    def frame(self, well_id):
+        """Read-only DataFrame view of a well (pandas copies on write)"""
+        return self.get(well_id).to_frame()
+
+    def _map(self, well_id):
+        try:
+            with open(self._path(well_id, ".json")) as fh:
+                columns = json.load(fh)['columns']
+            data = np.load(self._path(well_id, ".npy"), mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        self.mapped += 1
+        return WellLog.from_array(data, columns)
+
+    def _publish(self, well_id):
+        log = self.loader(well_id, rng=np.random.default_rng(stage_seed(well_id, 0)))
+        # Array first, then the column list: a reader that finds the .json finds a complete .npy
+        self._write(self._path(well_id, ".npy"), lambda fh: np.save(fh, log.values))
+        self._write(self._path(well_id, ".json"),
+                    lambda fh: fh.write(json.dumps({'columns': log.columns}).encode()))
+        self.published += 1
+
+    def _write(self, path, write):
+        # Named after the target, so prune() by another process leaves this version's temp files alone
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                write(fh)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def prune(self):
+        """Delete files of other code versions (processes still mapping them keep their pages).
+
+        Only names the store itself writes are touched, so other files in a
+        shared GHOSTFRACTURE_WELLSTORE_DIR are left alone.
+        """
+        removed = 0
+        for name in os.listdir(self.directory):
+            match = STORE_FILE.match(name)
+            if match and match.group('version') != self.version:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def stats(self):
+        with self._lock:
+            logs = list(self._logs.values())
+        return {'wells': len(logs), 'bytes': sum(log.values.nbytes for log in logs), 'hits': self.hits,
+                'mapped': self.mapped, 'published': self.published, 'directory': self.directory}
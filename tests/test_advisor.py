@@ -0,0 +1,137 @@
+"""FracAdvisor catalog lookups against the per-rerun action list they replaced."""
+import numpy as np
+import pytest
+
+from ghostfracture.advisor import (PRIORITY_ORDER, actions_by_priority, recommended_actions, risk_state,
+                                   stages_with_actions)
+
+
+def baseline_actions(closure_score, screenout_prob, height_score, efficiency, v):
+    """The dashboard's action list as built before ghostfracture.advisor.
+
+    Includes the two fixes made with the catalog: the screenout CRITICAL tag
+    carries its emoji, and every title is formatted.
+    """
+    closure_risk = "HIGH" if closure_score >= 85 else "Medium" if closure_score >= 60 else "Low"
+    height_growth_risk = "HIGH" if height_score >= 80 else "Medium" if height_score >= 45 else "Low"
+    actions = []
+    if closure_risk == "HIGH":
+        actions.extend([
+            {"Action": " **Immediate pump rate reduction by 20-25%**", "Priority": "🚨 CRITICAL",
+             "Physics Basis": f"Net pressure increase of {v['pressure_increase']:.0f} psi exceeds safe window",
+             "Expected Impact": "Reduce closure stress by 15-20%"},
+            {"Action": " **Switch to high-efficiency fluid system**", "Priority": "🔴 HIGH",
+             "Physics Basis": f"Current fluid viscosity ({v['fluid_viscosity']} cP) inadequate for stress conditions",
+             "Expected Impact": "Improve fracture width maintenance by 30%"},
+            {"Action": " **Shorten stage duration by 15 minutes**", "Priority": "🟡 MEDIUM",
+             "Physics Basis": "Extended exposure increases closure risk in high-stress environments",
+             "Expected Impact": "Reduce closure probability by 25%"}
+        ])
+    if screenout_prob > 60:
+        actions.extend([
+            {"Action": f" **Reduce proppant concentration from {v['proppant_conc']} to "
+                       f"{max(0.5, v['proppant_conc'] * 0.7):.1f} lb/ft²**", "Priority": "🚨 CRITICAL",
+             "Physics Basis": f"Screenout probability {screenout_prob:.0f}% exceeds operational limits",
+             "Expected Impact": "Lower bridging risk by 40%"},
+            {"Action": " **Implement 5-10 bpm flush every 15 minutes**", "Priority": "🔴 HIGH",
+             "Physics Basis": f"Proppant loading factor {v['proppant_loading']:.2f} indicates transport issues",
+             "Expected Impact": "Clear near-wellbore accumulation"},
+            {"Action": " **Increase perforation cluster spacing by 10-15%**", "Priority": "🟡 MEDIUM",
+             "Physics Basis": f"Current spacing ({v['cluster_spacing']} ft) may cause proppant banking",
+             "Expected Impact": "Improve distribution efficiency"}
+        ])
+    if height_growth_risk == "HIGH":
+        actions.extend([
+            {"Action": f" **Deploy particulate diverter at {int(v['frac_height'] * 0.7)} ft depth**",
+             "Priority": "🔴 HIGH",
+             "Physics Basis": f"Low stress contrast ({v['stress_contrast']} psi) enables vertical migration",
+             "Expected Impact": "Contain height growth within target zone"},
+            {"Action": " **Reduce injection rate by 15% while maintaining pressure**", "Priority": "🔴 HIGH",
+             "Physics Basis": f"Height-to-length ratio {v['frac_height'] / v['frac_half_length']:.2f} "
+                              "exceeds optimal 0.3-0.5 range",
+             "Expected Impact": "Limit vertical propagation"},
+            {"Action": " **Implement rate-controlled zonal isolation**", "Priority": "🟡 MEDIUM",
+             "Physics Basis": "Geomechanical analysis shows weak barrier at 5050 ft",
+             "Expected Impact": "Focus energy on lateral growth"}
+        ])
+    if efficiency < 70:
+        actions.extend([
+            {"Action": " **Increase cluster efficiency with engineered perforations**", "Priority": "🟡 MEDIUM",
+             "Physics Basis": f"Current efficiency {efficiency:.0f}% below target 80% threshold",
+             "Expected Impact": "Improve cluster contribution by 25%"},
+            {"Action": " **Optimize fluid pulse sequencing**", "Priority": "🟢 LOW",
+             "Physics Basis": f"Fluid energy distribution coefficient "
+                              f"{v['pump_rate'] / (v['fluid_viscosity'] + 1):.1f} suboptimal",
+             "Expected Impact": "Enhance fracture network connectivity"},
+            {"Action": " **Implement variable rate schedule**", "Priority": "🟡 MEDIUM",
+             "Physics Basis": "Constant rate injection reduces complexity generation",
+             "Expected Impact": "Increase SRV by 15-20%"}
+        ])
+    actions.extend([
+        {"Action": " **Real-time pressure transient analysis every 5 minutes**", "Priority": "🟢 LOW",
+         "Physics Basis": "Continuous monitoring detects early trend deviations",
+         "Expected Impact": "Enable proactive adjustments"},
+        {"Action": " **Maintain 10-15% rate variability**", "Priority": "🟡 MEDIUM",
+         "Physics Basis": "Prevents screenout while maximizing growth",
+         "Expected Impact": "Balance risk and performance"},
+        {"Action": " **Microseismic-derived geometry calibration**", "Priority": "🟢 LOW",
+         "Physics Basis": f"Current event density {v['event_density']:.1f}/min provides validation",
+         "Expected Impact": "Improve model accuracy by 15%"}
+    ])
+    return sorted(actions, key=lambda action: -PRIORITY_ORDER[action["Priority"]])
+
+
+def random_stages(seed, n):
+    """Dashboard-typed scores around every threshold, with live values for the templates"""
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        values = {
+            'pressure_increase': rng.uniform(-200, 400), 'fluid_viscosity': float(rng.choice([1.0, 5.0, 50.0])),
+            'proppant_conc': round(float(rng.uniform(0.5, 8)), 1), 'proppant_loading': rng.uniform(0.2, 12),
+            'cluster_spacing': int(rng.integers(15, 60)), 'stress_contrast': int(rng.integers(500, 3000)),
+            'frac_height': rng.uniform(50, 500), 'frac_half_length': rng.uniform(100, 600),
+            'pump_rate': int(rng.integers(40, 140)), 'event_density': rng.uniform(5, 60)
+        }
+        scores = (int(rng.choice([25, 60, 84, 85])), float(rng.choice([40.0, 60.0, 60.5, rng.uniform(0, 95)])),
+                  int(rng.choice([20, 45, 79, 80])), float(rng.choice([69.9, 70.0, rng.uniform(30, 95)])))
+        yield scores, values
+
+
+def context(scores, v):
+    """The template values app.py passes to the advisor"""
+    return {
+        'pressure_increase': v['pressure_increase'], 'fluid_viscosity': v['fluid_viscosity'],
+        'screenout_prob': scores[1], 'proppant_conc': v['proppant_conc'],
+        'reduced_proppant_conc': max(0.5, v['proppant_conc'] * 0.7), 'proppant_loading': v['proppant_loading'],
+        'cluster_spacing': v['cluster_spacing'], 'diverter_depth': int(v['frac_height'] * 0.7),
+        'stress_contrast': v['stress_contrast'], 'height_length_ratio': v['frac_height'] / v['frac_half_length'],
+        'efficiency': scores[3], 'fluid_energy': v['pump_rate'] / (v['fluid_viscosity'] + 1),
+        'event_density': v['event_density']
+    }
+
+
+def _shown(actions):
+    return [(a["Action"], a["Priority"], a["Physics Basis"], a["Expected Impact"]) for a in actions]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 42])
+def test_actions_match_baseline(seed):
+    for scores, values in random_stages(seed, 300):
+        state = risk_state(*scores)
+        expected = baseline_actions(*scores, values)
+        assert _shown(recommended_actions(state, context(scores, values))) == _shown(expected), scores
+        grouped = actions_by_priority(state, context(scores, values))
+        for priority, tier in grouped.items():
+            assert _shown(tier) == _shown([a for a in expected if a["Priority"] == priority])
+
+
+def test_fleet_lookup_matches_per_stage_actions():
+    stages = list(random_stages(7, 500))
+    states = risk_state(*map(np.array, zip(*[scores for scores, _ in stages])))
+    for risk, priority in [("closure", "🚨 CRITICAL"), ("screenout", None), ("height_growth", "🔴 HIGH"),
+                           (None, "🚨 CRITICAL"), ("best_practice", None)]:
+        mask = stages_with_actions(states, risk=risk, priority=priority)
+        for (scores, values), state, hit in zip(stages, states, mask):
+            actions = recommended_actions(state, context(scores, values))
+            assert hit == any((risk is None or a["Risk"] == risk) and (priority is None or a["Priority"] == priority)
+                              for a in actions), (risk, priority, scores)
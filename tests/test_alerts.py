@@ -0,0 +1,122 @@
+"""AlertMonitor debounce, cooldown, stream expiry and sink delivery."""
+import asyncio
+import time
+
+import numpy as np
+
+from ghostfracture.alerts import AlertMonitor, CallbackSink, LocalWebhookReceiver, MemorySink, WebhookSink
+
+TIME = np.arange(10, dtype=float)
+
+
+def screenout_stream(alarm_samples):
+    """A stage whose screenout rule (loading 7, slope > 15) alarms on its last ``alarm_samples`` samples"""
+    slope = np.where(np.arange(len(TIME)) >= len(TIME) - alarm_samples, 20.0, 0.0)
+    return {
+        'time': TIME,
+        'series': {'net_pressure': np.full(len(TIME), 1000.0), 'microseismic_rate': np.full(len(TIME), 50.0),
+                   'pressure_slope': slope},
+        'parameters': {'sigma_hmin': 4742, 'stress_contrast': 2433, 'proppant_loading': 7.0}
+    }
+
+
+def fired(alerts):
+    return [(tuple(alert['stream']), alert['risk']) for alert in alerts]
+
+
+def test_alarm_confirmed_after_debounce_samples():
+    monitor = AlertMonitor([MemorySink()], debounce=3)
+    monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(2))
+    assert fired(monitor.evaluate(now=time.monotonic())[0]) == []
+
+    monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(3))
+    alerts, _ = monitor.evaluate(now=time.monotonic())
+    assert fired(alerts) == [(('s1', 'Berkine-12', 17), 'screenout')]
+    assert alerts[0]['onset_time'] == TIME[-3]
+
+
+def test_cooldown_and_rearm():
+    monitor = AlertMonitor([MemorySink()], debounce=3, cooldown=300.0)
+    key = ('s1', 'Berkine-12', 17)
+    now = time.monotonic()
+    monitor.update(key, **screenout_stream(5))
+    assert len(monitor.evaluate(now=now)[0]) == 1
+    assert monitor.evaluate(now=now + 10)[0] == []  # still alarming, within the cooldown
+    assert len(monitor.evaluate(now=now + 301)[0]) == 1  # cooldown over
+
+    monitor.update(key, **screenout_stream(0))  # alarm clears and re-arms
+    assert monitor.evaluate(now=now + 302)[0] == []
+    monitor.update(key, **screenout_stream(5))
+    assert len(monitor.evaluate(now=now + 303)[0]) == 1
+
+
+def test_streams_are_independent_per_session():
+    monitor = AlertMonitor([MemorySink()], debounce=3)
+    monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(5))
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(0))
+    assert fired(monitor.evaluate(now=time.monotonic())[0]) == [(('s1', 'Berkine-12', 17), 'screenout')]
+
+
+def test_sessions_sharing_a_stage_are_notified_once():
+    monitor = AlertMonitor([MemorySink()], debounce=3, cooldown=300.0)
+    now = time.monotonic()
+    monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(5), group=('Berkine-12', 17))
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(4), group=('Berkine-12', 17))
+    assert fired(monitor.evaluate(now=now)[0]) == [(('Berkine-12', 17), 'screenout')]
+
+    # One session clearing does not re-arm the stage while another still alarms
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(0), group=('Berkine-12', 17))
+    assert monitor.evaluate(now=now + 1)[0] == []
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(5), group=('Berkine-12', 17))
+    assert monitor.evaluate(now=now + 2)[0] == []
+
+    monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(0), group=('Berkine-12', 17))
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(0), group=('Berkine-12', 17))
+    assert monitor.evaluate(now=now + 3)[0] == []
+    monitor.update(('s2', 'Berkine-12', 17), **screenout_stream(5), group=('Berkine-12', 17))
+    assert len(monitor.evaluate(now=now + 4)[0]) == 1
+
+
+def test_stale_streams_expire_with_their_alarm_state():
+    monitor = AlertMonitor([MemorySink()], debounce=3, stream_ttl=60.0)
+    key = ('s1', 'Berkine-12', 17)
+    monitor.update(key, **screenout_stream(5))
+    now = time.monotonic()
+    assert len(monitor.evaluate(now=now)[0]) == 1
+    assert any(armed[0] == key for armed in monitor._armed)
+
+    assert monitor.evaluate(now=now + 61)[0] == []
+    assert key not in monitor._streams and key not in monitor.ingest_lag
+    assert not any(armed[0] == key for armed in monitor._armed)
+
+
+def test_delivery_counts_only_alerts_that_reached_a_sink():
+    received = []
+
+    def failing(alert):
+        raise ConnectionError("sink down")
+
+    monitor = AlertMonitor([CallbackSink(failing)])
+    asyncio.run(monitor._deliver({'risk': 'screenout'}, time.monotonic()))
+    assert (monitor.delivered, monitor.failures, monitor.latency_stats()['count']) == (0, 1, 0)
+
+    monitor.sinks.append(CallbackSink(received.append))
+    asyncio.run(monitor._deliver({'risk': 'screenout'}, time.monotonic()))
+    assert (monitor.delivered, monitor.failures, monitor.latency_stats()['count']) == (1, 2, 1)
+    assert received == [{'risk': 'screenout'}]
+
+
+def test_running_monitor_posts_to_webhook():
+    receiver = LocalWebhookReceiver().start()
+    monitor = AlertMonitor([WebhookSink(receiver.url)], interval=0.05, debounce=3).start()
+    try:
+        monitor.update(('s1', 'Berkine-12', 17), **screenout_stream(5))
+        monitor.raise_alert({'risk': 'manual', 'label': 'Manual Emergency Alert'})
+        deadline = time.monotonic() + 5
+        while len(receiver.received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        monitor.stop()
+        receiver.stop()
+    assert sorted(alert['risk'] for alert in receiver.received) == ['manual', 'screenout']
+    assert monitor.delivered == 2 and monitor.failures == 0
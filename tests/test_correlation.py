@@ -0,0 +1,73 @@
+"""Banded DTW and formation top propagation."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ghostfracture.correlation import banded_dtw, correlate_wells
+
+
+def brute_force_dtw(reference, target, rows, width):
+    """Full-matrix DTW restricted to |i - j| <= width, with backtracking"""
+    n = reference.shape[1]
+    cost = ((target[:, None, :] - reference[:, :, None]) ** 2).sum(axis=0)  # [i, j]
+    total = np.full((n, n), np.inf)
+    for i in range(n):
+        for j in range(max(i - width, 0), min(i + width, n - 1) + 1):
+            if i == j == 0:
+                total[i, j] = cost[i, j]
+                continue
+            up = total[i - 1, j] if i else np.inf
+            left = total[i, j - 1] if j else np.inf
+            diagonal = total[i - 1, j - 1] if i and j else np.inf
+            total[i, j] = cost[i, j] + min(up, left, diagonal)
+
+    # Walk back choosing predecessors in the same order of preference; the path enters a row at its smallest j
+    entries = {}
+    i = j = n - 1
+    while True:
+        entries[i] = j
+        if i == j == 0:
+            break
+        candidates = [(i - 1, j), (i, j - 1), (i - 1, j - 1)]
+        steps = [total[a, b] if a >= 0 and b >= 0 else np.inf for a, b in candidates]
+        i, j = candidates[int(np.argmin(steps))]
+    return [entries[row] for row in rows], total[-1, -1] / n
+
+
+@pytest.mark.parametrize('band', [0.05, 0.1, 0.3])
+def test_banded_dtw_matches_brute_force(band):
+    rng = np.random.default_rng(0)
+    n = 60
+    reference = rng.normal(size=(2, n))
+    targets = np.stack([np.roll(reference, shift, axis=1) + 0.3 * rng.normal(size=(2, n)) for shift in (0, 2, -3)])
+    rows = [0, 7, 20, 33, 59]
+    width = max(int(np.ceil(band * n)), 1)
+
+    entries, costs = banded_dtw(reference, targets, rows, band)
+    for well, target in enumerate(targets):
+        expected_entries, expected_cost = brute_force_dtw(reference, target, rows, width)
+        np.testing.assert_array_equal(entries[well], expected_entries)
+        assert costs[well] == pytest.approx(expected_cost)
+
+
+def test_correlate_wells_recovers_shifted_tops():
+    rng = np.random.default_rng(0)
+    depth = np.linspace(0, 1000, 2001)
+    walks = np.cumsum(rng.normal(size=(2, len(depth))), axis=1)
+    gr, ild = (np.convolve(walk, np.ones(9) / 9, 'same') for walk in walks)
+    type_log = pd.DataFrame({'Depth': depth, 'GR': 60 + gr, 'ILD': 10 ** (1 + 0.05 * ild)})
+    tops = {'A': 200.0, 'B': 500.0, 'C': 800.0}
+
+    # The target is the type well 5000 ft deeper, with its middle section stretched by up to 30 ft
+    def warp(d):
+        return 5000 + d + 30 * np.sin(np.pi * d / 1000)
+
+    target_depth = np.linspace(warp(0), warp(1000), 2001)
+    source_depth = np.interp(target_depth, warp(depth), depth)
+    target_log = pd.DataFrame({'Depth': target_depth,
+                               'GR': np.interp(source_depth, depth, type_log['GR']),
+                               'ILD': np.interp(source_depth, depth, type_log['ILD'])})
+
+    result = correlate_wells(type_log, {'W1': target_log}, tops=tops)['W1']
+    for formation, top in tops.items():
+        assert result['tops'][formation] == pytest.approx(warp(top), abs=3.0)
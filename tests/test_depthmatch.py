@@ -0,0 +1,23 @@
+"""Depth shift estimation between log runs."""
+import warnings
+
+import numpy as np
+import pytest
+
+from ghostfracture.depthmatch import estimate_shift
+
+
+@pytest.mark.parametrize('true_shift', [-4.3, 0.0, 3.2])
+def test_recovers_constant_shift_across_null_gaps_without_warnings(true_shift):
+    rng = np.random.default_rng(0)
+    depth = np.arange(0, 2000, 0.5)
+    reference = np.cumsum(rng.normal(size=len(depth)))
+    target = np.interp(depth - true_shift, depth, reference)
+    target[1000:1600] = np.nan  # windows without data correlate at -inf
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        shift = estimate_shift(depth, reference, target)
+    assert not shift.accepted.all()
+    shifts = shift.shifts[shift.accepted]
+    assert np.median(shifts) == pytest.approx(true_shift, abs=0.1)
+    assert np.abs(shifts - true_shift).max() < 0.5  # one sample, at windows next to the gap
@@ -0,0 +1,57 @@
+"""DiskCache keys, rule-file versioning and temp-file handling."""
+import os
+import pickle
+
+import pytest
+
+from ghostfracture import diskcache
+from ghostfracture.diskcache import DiskCache, rules_version
+from ghostfracture.jobs import params_key
+
+
+def edit_rules(directory, text):
+    path = directory / "fracguard_rules.toml"
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # coarse-mtime file systems
+
+
+def test_rule_edits_change_memoize_and_job_keys(tmp_path, monkeypatch):
+    rules_dir = tmp_path / "package"
+    rules_dir.mkdir()
+    monkeypatch.setattr(diskcache, 'PACKAGE_DIR', str(rules_dir))
+    edit_rules(rules_dir, "# v1\n")
+    cache = DiskCache(str(tmp_path / "cache"))
+    calls = []
+
+    @cache.memoize
+    def scores(x):
+        calls.append(x)
+        return x * 2
+
+    first_version, first_job = rules_version(), params_key(scores, {'x': 1})
+    assert scores(1) == 2 and scores(1) == 2 and calls == [1]
+
+    edit_rules(rules_dir, "# v2, closure threshold changed\n")
+    assert rules_version() != first_version
+    assert params_key(scores, {'x': 1}) != first_job
+    assert scores(1) == 2 and calls == [1, 1]
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    with pytest.raises((AttributeError, pickle.PicklingError)):
+        cache.set(DiskCache.make_key('unpicklable'), lambda: None)
+    assert [name for _, _, files in os.walk(tmp_path) for name in files] == []
+    assert cache.size == 0
+
+
+def test_stale_temp_files_are_swept_at_start(tmp_path):
+    (tmp_path / "ab").mkdir()
+    stale, fresh = tmp_path / "ab" / "tmp1.tmp", tmp_path / "ab" / "tmp2.tmp"
+    stale.write_bytes(b"x" * 100)
+    fresh.write_bytes(b"x" * 100)
+    old = os.stat(stale).st_mtime - diskcache.STALE_TMP_SECONDS - 60
+    os.utime(stale, (old, old))
+    cache = DiskCache(str(tmp_path))
+    assert cache.swept == 1 and not stale.exists() and fresh.exists()
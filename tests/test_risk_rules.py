@@ -0,0 +1,109 @@
+"""The declarative FracGuard rules against the hard-coded rules they replaced."""
+import numpy as np
+import pytest
+
+from ghostfracture.risk import first_trigger, risk_timeline, risk_triggers
+from ghostfracture.simulation import simulate_treatment
+
+
+def _per_series(value):
+    value = np.asarray(value, dtype=float)
+    return value[..., None] if value.ndim else value
+
+
+def baseline_timeline(net_pressure, microseismic_rate, pressure_slope, sigma_hmin, stress_contrast,
+                      proppant_loading):
+    """Risk scores as computed before the rules moved to fracguard_rules.toml"""
+    sigma_hmin, stress_contrast, proppant_loading = map(_per_series, (sigma_hmin, stress_contrast,
+                                                                      proppant_loading))
+    pressure_rise = net_pressure - net_pressure[..., :1]
+    closure_score = np.select(
+        [(pressure_rise > 150) & (microseismic_rate < microseismic_rate[..., :1] * 0.5), pressure_rise > 80],
+        [85, 60], default=25)
+    height_score = np.select(
+        [(stress_contrast < 1200) & (net_pressure > sigma_hmin * 1.15),
+         np.broadcast_to(stress_contrast < 1800, net_pressure.shape)],
+        [80, 45], default=20)
+    loading = np.broadcast_to(proppant_loading, net_pressure.shape)
+    screenout_prob = np.select(
+        [(loading > 6) & (pressure_slope > 15), loading > 4],
+        [70 + (loading - 6) * 8, 40 + (loading - 4) * 10], default=loading * 5)
+    return {'closure': closure_score.astype(float), 'height_growth': height_score.astype(float),
+            'screenout': np.minimum(95, screenout_prob)}
+
+
+BASELINE_TRIGGERS = {'closure': lambda s: s >= 85, 'height_growth': lambda s: s >= 80,
+                     'screenout': lambda s: s > 70}
+
+
+def random_stages(seed, n_stages):
+    """Treatment series of ``n_stages`` stages with designs spread across every rule threshold"""
+    rng = np.random.default_rng(seed)
+    design = {
+        'pump_rate': rng.uniform(40, 140, n_stages),
+        'proppant_conc': rng.uniform(0.5, 8.0, n_stages),
+        'sigma_hmin': rng.uniform(2500, 6000, n_stages),
+        'stress_contrast': rng.uniform(500, 3000, n_stages),
+        'cluster_spacing': rng.uniform(15, 60, n_stages),
+        'young_modulus': rng.uniform(2, 12, n_stages),
+        'pressure_offset': rng.uniform(0, 7000, n_stages),  # lifts net pressure across sigma_hmin * 1.15
+    }
+    sims = [simulate_treatment(design['pump_rate'][i], "Slickwater", 5.0, design['proppant_conc'][i],
+                               design['sigma_hmin'][i] + 2000, design['sigma_hmin'][i],
+                               design['stress_contrast'][i], design['young_modulus'][i], 0.25,
+                               design['cluster_spacing'][i], rng=np.random.default_rng(seed + i))
+            for i in range(n_stages)]
+    return {
+        'time': sims[0]['time'],
+        'net_pressure': np.stack([sim['net_pressure'] for sim in sims]) + design['pressure_offset'][:, None],
+        'microseismic_rate': np.stack([sim['microseismic_rate'] for sim in sims]),
+        'pressure_slope': np.stack([sim['pressure_slope'] for sim in sims]),
+        'sigma_hmin': design['sigma_hmin'],
+        'stress_contrast': design['stress_contrast'],
+        'proppant_loading': np.array([sim['proppant_loading'] for sim in sims]),
+    }
+
+
+def _inputs(stages):
+    return (stages['net_pressure'], stages['microseismic_rate'], stages['pressure_slope'],
+            stages['sigma_hmin'], stages['stress_contrast'], stages['proppant_loading'])
+
+
+@pytest.mark.parametrize('seed', [0, 1, 42, 2024])
+def test_batched_scores_match_baseline(seed):
+    stages = random_stages(seed, 200)
+    expected = baseline_timeline(*_inputs(stages))
+    scores = risk_timeline(*_inputs(stages))
+    assert set(scores) == set(expected)
+    for name in expected:
+        np.testing.assert_allclose(scores[name], expected[name], err_msg=name)
+
+
+@pytest.mark.parametrize('seed', [3, 7])
+def test_single_stage_scores_match_baseline(seed):
+    stages = random_stages(seed, 20)
+    for i in range(20):
+        inputs = [value[i] for value in _inputs(stages)]
+        expected = baseline_timeline(*inputs)
+        scores = risk_timeline(*inputs)
+        for name in expected:
+            assert scores[name].shape == stages['time'].shape
+            np.testing.assert_allclose(scores[name], expected[name], err_msg=f"{name}, stage {i}")
+
+
+def test_every_case_is_exercised():
+    stages = random_stages(0, 200)
+    scores = baseline_timeline(*_inputs(stages))
+    assert {85.0, 60.0, 25.0} <= set(np.unique(scores['closure']))
+    assert {80.0, 45.0, 20.0} <= set(np.unique(scores['height_growth']))
+    assert (scores['screenout'] > 70).any() and (scores['screenout'] <= 40).any()
+
+
+@pytest.mark.parametrize('seed', [0, 42])
+def test_trigger_times_match_baseline(seed):
+    stages = random_stages(seed, 200)
+    expected = baseline_timeline(*_inputs(stages))
+    triggers = risk_triggers(stages['time'], risk_timeline(*_inputs(stages)))
+    for name, rule in BASELINE_TRIGGERS.items():
+        np.testing.assert_array_equal(triggers[name], first_trigger(stages['time'], rule(expected[name])),
+                                      err_msg=name)
@@ -0,0 +1,61 @@
+"""Rule file reloading and rule-derived risk levels."""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from ghostfracture.advisor import CLOSURE_HIGH, SCREENOUT_HIGH, risk_state
+from ghostfracture.rules import DEFAULT_RULES_PATH, RuleError, load_rules, rules_error
+from ghostfracture.tables import risk_summary_frame, risk_summary_html
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "fracguard_rules.toml"
+    shutil.copy(DEFAULT_RULES_PATH, path)
+    return path
+
+
+def rewrite(path, text):
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000, mtime + 1_000_000))  # a new mtime even on coarse clocks
+
+
+def test_broken_edit_keeps_last_good_rules(rules_file):
+    good = load_rules(str(rules_file))
+    assert rules_error(str(rules_file)) is None
+
+    rewrite(rules_file, rules_file.read_text().replace('trigger = "score >= 85"', 'trigger = "score >>= 85"'))
+    assert load_rules(str(rules_file)) is good
+    assert isinstance(rules_error(str(rules_file)), RuleError)
+
+    rewrite(rules_file, rules_file.read_text().replace('"score >>= 85"', '"score >= 90"'))
+    fixed = load_rules(str(rules_file))
+    assert fixed is not good and rules_error(str(rules_file)) is None
+
+
+def test_broken_file_without_good_rules_raises(tmp_path):
+    path = tmp_path / "broken.toml"
+    path.write_text("[[risk]\n")
+    with pytest.raises(RuleError):
+        load_rules(str(path))
+
+
+def test_levels_follow_the_rule_file(rules_file):
+    default = load_rules(str(rules_file))
+    assert list(default.level('closure', np.array([59, 60, 84, 85]))) == ['low', 'medium', 'medium', 'high']
+
+    rewrite(rules_file, rules_file.read_text()
+            .replace('levels = { high = "score >= 85", medium = "score >= 60" }',
+                     'levels = { high = "score >= 60", medium = "score >= 40" }')
+            .replace('elevated = "score > 60"', 'elevated = "score > 50"'))
+    edited = load_rules(str(rules_file))
+    assert list(edited.level('closure', np.array([39, 40, 60, 85]))) == ['low', 'medium', 'high', 'high']
+
+    frame = risk_summary_frame(60, 55, 20, 80, rules=edited)
+    assert frame['Mitigation Priority'].tolist()[:2] == ['Immediate', 'High']
+    assert risk_summary_html(60, 55, 20, 80, rules=edited) != risk_summary_html(60, 55, 20, 80, rules=default)
+    assert risk_state(60, 55, 20, 80, rules=edited) == CLOSURE_HIGH | SCREENOUT_HIGH
+    assert risk_state(60, 55, 20, 80, rules=default) == 0
@@ -0,0 +1,23 @@
+"""Streaming Gutenberg-Richter statistics."""
+import numpy as np
+
+from ghostfracture.seismicity import GutenbergRichterTracker
+
+
+def test_unseen_stages_are_not_created_by_lookups():
+    tracker = GutenbergRichterTracker()
+    b, mc, n = tracker.catalog_estimate(3)
+    assert np.isnan(b) and np.isnan(mc) and n == 0
+    assert tracker.history(3).empty
+    assert not tracker.histogram(3)[1].any()
+    assert tracker.stages() == [] and tracker.summary().empty
+
+
+def test_catalog_estimate_recovers_b_value():
+    rng = np.random.default_rng(0)
+    magnitudes = -1.5 + rng.exponential(np.log10(np.e) / 1.2, 5000)
+    tracker = GutenbergRichterTracker()
+    tracker.add_events(1, np.arange(len(magnitudes), dtype=float), magnitudes)
+    b, mc, n = tracker.catalog_estimate(1)
+    assert abs(b - 1.2) < 0.1 and mc < -1.2 and n > 1000
+    assert tracker.stages() == [1] and len(tracker.history(1)) == len(magnitudes)
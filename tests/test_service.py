@@ -0,0 +1,115 @@
+"""Batch service payload handling and HTTP error reporting."""
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from ghostfracture.service import NPZ_TYPE, BatchServer, RequestError, _json_default, _json_safe, stage_runs
+
+
+def test_json_safe_converts_non_finite_floats_to_null():
+    payload = {'curves': {'SW': np.array([[0.2, np.nan], [np.inf, 0.4]], dtype=np.float32)},
+               'results': [{'b-value': float('nan'), 'Events': np.int64(3)}, {'Mc': np.float64(-np.inf)}]}
+    assert _json_safe(payload) == {'curves': {'SW': [[pytest.approx(0.2), None], [None, pytest.approx(0.4)]]},
+                                   'results': [{'b-value': None, 'Events': 3}, {'Mc': None}]}
+    json.dumps(_json_safe(payload), default=_json_default, allow_nan=False)
+
+
+def test_stage_runs_canonical_types_share_one_key():
+    from_json = stage_runs({'stages': [{'stage_num': 17, 'pump_rate': 80}]})
+    from_npz = stage_runs({'stage_num': np.array([17.0]), 'pump_rate': np.array([80.0])})
+    assert from_json == from_npz
+    assert type(from_json[0]['stage_num']) is int and type(from_json[0]['pump_rate']) is float
+    assert tuple(sorted(from_json[0].items())) == tuple(sorted(from_npz[0].items()))
+
+
+@pytest.mark.parametrize('payload', [
+    [1, 2],
+    {'stages': [1, 2]},
+    {'stages': {'stage_num': 3}},
+    {'stages': [{'fluid_type': "Foam"}]},
+    {'stages': [{'proppant_type': "Glass"}]},
+    {'stages': [{'stage_num': 2.5}]},
+    {'stages': [{'pump_rate': "fast"}]},
+    {'stages': [{'flow': 1}]},
+    {'pump_rate': [80, 90], 'stage_num': [1]},
+])
+def test_stage_runs_rejects_malformed_payloads(payload):
+    with pytest.raises(RequestError):
+        stage_runs(payload)
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = BatchServer(('127.0.0.1', 0), workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'{"stages": [1, 2]}', b'{"stages": [{"fluid_type": "Foam"}]}'])
+def test_simulate_reports_bad_requests_as_400(server, body):
+    status, content = post(f"{server}/v1/simulate", body)
+    assert status == 400
+    assert 'error' in json.loads(content)
+
+
+def test_simulate_json_and_npz_requests_are_coalesced(server):
+    status, content = post(f"{server}/v1/simulate", json.dumps({'stages': [{'stage_num': 5}]}).encode())
+    assert status == 200
+    row = json.loads(content)['results'][0]
+
+    buffer = io.BytesIO()
+    np.savez(buffer, stage_num=np.array([5.0]))
+    status, content = post(f"{server}/v1/simulate", buffer.getvalue(), NPZ_TYPE)
+    assert status == 200
+    with np.load(io.BytesIO(content)) as archive:
+        assert archive['Net Pressure (psi)'][0] == pytest.approx(row['Net Pressure (psi)'])
+
+    with urllib.request.urlopen(f"{server}/v1/health", timeout=10) as response:
+        health = json.loads(response.read())
+    assert health['computed'] == 1 and health['coalesced'] >= 1
+
+
+def test_log_results_with_nulls_are_valid_json(server):
+    curves = {'RHOB': [2.45, 2.3, np.nan], 'NPHI': [0.15, 0.2, 0.1], 'LLD': [20.0, 5.0, 10.0],
+              'GR': [40.0, 90.0, 60.0]}
+    status, content = post(f"{server}/v1/petrophysics", json.dumps({'curves': curves}).replace('NaN', 'null').encode())
+    assert status == 200
+    text = content.decode()
+    assert 'NaN' not in text and 'Infinity' not in text
+    assert None in json.loads(text)['curves']['PHID']
+
+
+def test_failed_submit_releases_waiting_keys():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ghostfracture.service import Coalescer
+
+    def double(items):
+        return [item * 2 for item in items]
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    coalescer = Coalescer(executor, chunk_size=2)
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        coalescer.evaluate(double, [1, 2, 3], ['a', 'b', 'c'])
+    assert coalescer.stats()['remembered'] == 0
+
+    coalescer.executor = ThreadPoolExecutor(max_workers=1)  # pool replaced: the same keys compute again
+    assert coalescer.evaluate(double, [1, 2, 3], ['a', 'b', 'c']) == [2, 4, 6]
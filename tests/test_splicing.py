@@ -0,0 +1,93 @@
+"""Splicing of logging runs onto a regular depth grid."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ghostfracture.splicing import LAS_NULL, Splicer, splice
+
+
+def run_frame(depth, **curves):
+    return pd.DataFrame({'Depth': np.asarray(depth, dtype=float), **curves})
+
+
+def spliced(splicer, curve):
+    log, sources = splicer.result()
+    return np.asarray(log['Depth']), np.asarray(log[curve]), sources[curve]
+
+
+def test_chunk_size_does_not_change_the_result():
+    rng = np.random.default_rng(0)
+    coarse = run_frame(np.arange(0, 60, 0.5), GR=rng.uniform(20, 120, 120), RHOB=rng.uniform(2.2, 2.7, 120))
+    fine = run_frame(np.arange(40, 100, 0.1), GR=rng.uniform(20, 120, 600))
+    fine.loc[100:130, 'GR'] = LAS_NULL
+    runs = {'coarse': coarse, 'fine': fine}
+
+    expected = splice(runs, step=0.25)
+    for chunk_size in (1, 2, 7, 64):
+        result = splice(runs, step=0.25, chunk_size=chunk_size)
+        for curve in ('GR', 'RHOB'):
+            np.testing.assert_array_equal(result.result()[0][curve], expected.result()[0][curve])
+            np.testing.assert_array_equal(result.sources[curve], expected.sources[curve])
+
+
+def test_nulls_are_not_interpolated_across():
+    values = np.arange(11.0)
+    values[5] = LAS_NULL
+    depth, gr, sources = spliced(splice([run_frame(np.arange(11.0), GR=values)], step=0.5), 'GR')
+
+    hole = (depth > 4) & (depth < 6)
+    assert np.isnan(gr[hole]).all() and (sources[hole] == -1).all()
+    np.testing.assert_allclose(gr[~hole], depth[~hole])  # exact hits next to the null keep their value
+
+
+def test_gaps_wider_than_max_gap_are_not_interpolated_across():
+    run_depth = np.array([0, 1, 2, 3, 10, 11, 12], dtype=float)
+    depth, gr, _ = spliced(splice([run_frame(run_depth, GR=run_depth)], step=0.5), 'GR')
+    gap = (depth > 3) & (depth < 10)
+    assert np.isnan(gr[gap]).all()
+    np.testing.assert_allclose(gr[~gap], depth[~gap])
+
+    splicer = Splicer(0, 12, step=0.5)
+    index = splicer.add_run('run', ['GR'], max_gap=10)
+    splicer.feed(index, run_depth, {'GR': run_depth})
+    depth, gr, _ = spliced(splicer, 'GR')
+    np.testing.assert_allclose(gr, depth)
+
+
+def test_finer_runs_win_overlaps_unless_priorities_say_otherwise():
+    runs = {'coarse': run_frame(np.arange(0, 21.0), GR=np.full(21, 1.0)),
+            'fine': run_frame(np.arange(10, 30.5, 0.5), GR=np.full(41, 2.0))}
+
+    depth, gr, sources = spliced(splice(runs, step=0.5), 'GR')
+    overlap = (depth >= 10) & (depth <= 20)
+    assert (gr[overlap] == 2.0).all() and (sources[overlap] == 1).all()
+    assert (gr[depth < 10] == 1.0).all() and (gr[depth > 20] == 2.0).all()
+
+    depth, gr, sources = spliced(splice(runs, step=0.5, priorities={'coarse': 0}), 'GR')
+    assert (gr[overlap] == 1.0).all() and (sources[overlap] == 0).all()
+
+
+def test_equal_priorities_go_to_the_run_added_last():
+    runs = {'first': run_frame(np.arange(0, 11.0), GR=np.full(11, 1.0)),
+            'second': run_frame(np.arange(5, 16.0), GR=np.full(11, 2.0))}
+    depth, gr, _ = spliced(splice(runs, step=0.5), 'GR')
+    assert (gr[(depth >= 5) & (depth <= 15)] == 2.0).all()
+
+
+def test_uplogged_runs_match_downlogged_runs():
+    rng = np.random.default_rng(1)
+    down = run_frame(np.arange(0, 50, 0.5), GR=rng.uniform(20, 120, 100))
+    up = down.iloc[::-1].reset_index(drop=True)
+    np.testing.assert_array_equal(splice([up], step=0.25).result()[0]['GR'],
+                                  splice([down], step=0.25).result()[0]['GR'])
+
+
+def test_feed_rejects_depths_that_do_not_increase():
+    splicer = Splicer(0, 10, step=0.5)
+    index = splicer.add_run('run', ['GR'])
+    with pytest.raises(ValueError, match="depths must increase"):
+        splicer.feed(index, [0.0, 1.0, 1.0, 2.0], {'GR': np.zeros(4)})
+
+    splicer.feed(index, [0.0, 1.0, 2.0], {'GR': np.zeros(3)})
+    with pytest.raises(ValueError, match="depths must increase"):
+        splicer.feed(index, [2.0, 3.0], {'GR': np.zeros(2)})
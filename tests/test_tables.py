@@ -0,0 +1,68 @@
+"""Vectorized Risk Factor Summary markup against the per-row loop it replaced."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ghostfracture.tables import render_risk_table, risk_summary_frame, risk_summary_html
+
+
+def baseline_html(closure_score, screenout_prob, height_score, efficiency):
+    """The dashboard's table as built before ghostfracture.tables"""
+    closure_risk = "HIGH" if closure_score >= 85 else "Medium" if closure_score >= 60 else "Low"
+    height_growth_risk = "HIGH" if height_score >= 80 else "Medium" if height_score >= 45 else "Low"
+    summary_data = pd.DataFrame({
+        'Risk Factor': ['Early Closure', 'Screenout', 'Height Growth', 'Fracture Efficiency', 'Asymmetry'],
+        'Probability': [f"{closure_score}%", f"{int(screenout_prob)}%", f"{height_score}%",
+                        f"{100-int(efficiency)}%", "30%"],
+        'Impact': ['High', 'Critical', 'Moderate', 'Moderate', 'Low'],
+        'Mitigation Priority': [
+            'Immediate' if closure_risk == "HIGH" else 'High' if closure_risk == "Medium" else 'Monitor',
+            'Immediate' if screenout_prob > 70 else 'High' if screenout_prob > 40 else 'Monitor',
+            'High' if height_growth_risk == "HIGH" else 'Medium' if height_growth_risk == "Medium" else 'Low',
+            'High' if efficiency < 50 else 'Medium' if efficiency < 70 else 'Monitor',
+            'Low'
+        ]
+    })
+    table_html = "<table class='risk-summary-table'><thead><tr>"
+    for col in summary_data.columns:
+        table_html += f"<th>{col}</th>"
+    table_html += "</tr></thead><tbody>"
+    for _, row in summary_data.iterrows():
+        table_html += "<tr>"
+        for i, value in enumerate(row):
+            if i == 3:
+                table_html += f"<td><span class='priority-badge priority-{value.lower()}'>{value}</span></td>"
+            else:
+                table_html += f"<td>{value}</td>"
+        table_html += "</tr>"
+    table_html += "</tbody></table>"
+    return table_html
+
+
+def random_scores(seed, n):
+    """Dashboard-typed scores (int closure/height, float screenout/efficiency) around every threshold"""
+    rng = np.random.default_rng(seed)
+    closure = rng.choice([25, 59, 60, 61, 84, 85, 86, 100], n)
+    height = rng.choice([20, 44, 45, 46, 79, 80, 81], n)
+    screenout = np.concatenate([[40.0, 70.0, 40.5, 70.5, 95.0], rng.uniform(0, 95, n - 5)])
+    efficiency = np.concatenate([[50.0, 70.0, 49.9, 69.9, 30.0], rng.uniform(30, 95, n - 5)])
+    return [(int(c), float(s), int(h), float(e)) for c, s, h, e in zip(closure, screenout, height, efficiency)]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 42])
+def test_single_stage_html_matches_baseline(seed):
+    for scores in random_scores(seed, 300):
+        assert risk_summary_html(*scores) == baseline_html(*scores), scores
+
+
+def test_fleet_frame_matches_per_stage_tables():
+    scores = random_scores(7, 50)
+    closure, screenout, height, efficiency = map(np.array, zip(*scores))
+    index = pd.DataFrame({'Well': ['Berkine-12'] * 50, 'Stage': np.arange(1, 51)})
+    frame = risk_summary_frame(closure, screenout, height, efficiency, index=index)
+    assert len(frame) == 5 * 50
+    assert list(frame.columns[:2]) == ['Well', 'Stage']
+    for stage, stage_scores in enumerate(scores):
+        rows = frame.iloc[5 * stage:5 * stage + 5].drop(columns=['Well', 'Stage']).reset_index(drop=True)
+        assert render_risk_table(rows) == baseline_html(*stage_scores)
+        assert (frame['Stage'].iloc[5 * stage:5 * stage + 5] == stage + 1).all()
@@ -0,0 +1,37 @@
+"""Payload counting on the Streamlit message queue."""
+from types import SimpleNamespace
+
+import pytest
+
+from ghostfracture import tracing
+from ghostfracture.tracing import Tracer, count_payload
+
+ForwardMsg = pytest.importorskip("streamlit.proto.ForwardMsg_pb2").ForwardMsg
+
+
+def markdown_message(body):
+    msg = ForwardMsg()
+    msg.delta.new_element.markdown.body = body
+    return msg
+
+
+def test_counts_bytes_per_element_and_wraps_once():
+    sent = []
+    ctx = SimpleNamespace(_enqueue=sent.append)
+    tracer = Tracer()
+    tracer.begin_run()
+    assert count_payload(ctx, tracer) and count_payload(ctx, tracer)
+
+    msg = markdown_message("hello")
+    ctx._enqueue(msg)
+    assert sent == [msg]
+    assert tracer.current.counters == {'bytes.markdown': msg.ByteSize()}
+
+
+def test_leaves_unsupported_streamlit_versions_alone(monkeypatch):
+    monkeypatch.setattr(tracing, 'PAYLOAD_HOOK_VERSIONS', ((0, 1), (0, 2)))
+    ctx = SimpleNamespace(_enqueue=[].append)
+    enqueue = ctx._enqueue
+    assert not count_payload(ctx, Tracer())
+    assert ctx._enqueue == enqueue
+    assert not count_payload(None, Tracer())
@@ -0,0 +1,56 @@
+"""WellStore publishing and pruning."""
+import os
+
+import numpy as np
+
+from ghostfracture.welllogs import WellLog
+from ghostfracture.wellstore import WellStore
+
+
+def small_log(well_id, rng):
+    log = WellLog(50, ['Depth', 'GR'])
+    log['Depth'] = np.arange(50.0)
+    log['GR'] = rng.uniform(20, 120, 50)
+    return log
+
+
+def test_get_publishes_once_and_maps_read_only(tmp_path):
+    store = WellStore(str(tmp_path), loader=small_log)
+    log = store.get('Berkine-12')
+    assert store.published == 1 and store.get('Berkine-12') is log
+    assert not log.values.flags.writeable
+
+    other = WellStore(str(tmp_path), loader=small_log)
+    np.testing.assert_array_equal(other.get('Berkine-12').values, log.values)
+    assert other.published == 0 and other.mapped == 1
+
+
+def test_prune_keeps_current_version_and_its_temp_files(tmp_path):
+    store = WellStore(str(tmp_path), loader=small_log)
+    store.get('Berkine-12')
+    in_flight = store._path('Berkine-13', ".npy") + ".abc123.tmp"
+    stale = ['Berkine-12-0123456789abcdef.npy', 'Berkine-12-0123456789abcdef.json',
+             'Berkine-12-0123456789abcdef.npy.abc123.tmp']
+    unrelated = ['survey.npy', 'config.json', 'tmpxyz.tmp', 'run-2024.npy', 'notes-0123456789abcdef.txt']
+    for name in stale + unrelated:
+        (tmp_path / name).write_bytes(b"")
+    open(in_flight, 'wb').close()
+
+    assert store.prune() == len(stale)
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(store._path('Berkine-12', ".npy")),
+                                                   os.path.basename(store._path('Berkine-12', ".json")),
+                                                   os.path.basename(in_flight)] + unrelated)
+
+
+def test_temp_files_carry_the_version(tmp_path, monkeypatch):
+    store = WellStore(str(tmp_path), loader=small_log)
+    seen = []
+    replace = os.replace
+
+    def record(src, dst):
+        seen.append(os.path.basename(src))
+        replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', record)
+    store.get('Berkine-12')
+    assert len(seen) == 2 and all(f"-{store.version}." in name and name.endswith(".tmp") for name in seen)